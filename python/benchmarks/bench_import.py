@@ -0,0 +1,62 @@
+"""Measure how long `import evalis` takes in a fresh interpreter.
+
+Each run starts a new Python process, so nothing is already imported. The
+parser (ANTLR) is only loaded on the first parse, which is reported separately.
+
+Run from the python/ directory:
+
+    python benchmarks/bench_import.py [runs]
+"""
+
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+SNIPPETS = {
+    "import evalis": "import evalis",
+    "+ evaluate_ast": (
+        "import evalis\n"
+        "from evalis.types import LiteralNode\n"
+        "evalis.evaluate_ast(LiteralNode(1))"
+    ),
+    "+ parse (native)": (
+        "import evalis\n"
+        "evalis.parse_ast('a', evalis.ParserOptions(should_use_native_parser=True))"
+    ),
+    "+ parse (antlr)": "import evalis\nevalis.parse_ast('a')",
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+exec(compile({snippet!r}, "<bench>", "exec"))
+print(time.perf_counter() - start)
+"""
+
+
+def measure(snippet, runs):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    times = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(snippet=snippet)],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=env,
+        ).stdout
+        times.append(float(output))
+    return min(times)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    for label, snippet in SNIPPETS.items():
+        print(f"{label:<20}{measure(snippet, runs) * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
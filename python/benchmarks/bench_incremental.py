@@ -0,0 +1,47 @@
+"""Compare updating an IncrementalEvaluation with evaluating from scratch.
+
+Run from the python/ directory:
+
+    python benchmarks/bench_incremental.py [condition_count]
+"""
+
+import sys
+import timeit
+
+from evalis.eval import Evaluator
+from evalis.evalis import evaluate_incremental, parse_ast
+from evalis.types import ParseResultSuccess
+
+NUMBER = 200
+
+
+def bench(label, fn):
+    seconds = min(timeit.repeat(fn, number=NUMBER, repeat=3)) / NUMBER
+    print(f"  {label:<24}{seconds * 1e6:>12.1f} us")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    expression = " or ".join(
+        f"(entity.f{i} > {i} and entity.g{i} != 'x')" for i in range(count)
+    )
+    entity = {f"f{i}": 0 for i in range(count)} | {f"g{i}": "y" for i in range(count)}
+    context = {"entity": entity}
+    result = parse_ast(expression)
+    assert isinstance(result, ParseResultSuccess), result.errors
+    node = result.ast
+    evaluator = Evaluator()
+    evaluation = evaluate_incremental(node, context)
+
+    updates = iter(range(10**9))
+
+    def update():
+        evaluation.update(("entity", f"f{count // 2}"), next(updates) % 2)
+
+    print(f"{count} conditions, one field changed per evaluation")
+    bench("evaluate", lambda: evaluator.evaluate(node, context))
+    bench("incremental update", update)
+
+
+if __name__ == "__main__":
+    main()
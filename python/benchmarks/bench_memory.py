@@ -0,0 +1,68 @@
+"""Measure the memory held by many parsed rules, with and without interning.
+
+Run from the python/ directory:
+
+    python benchmarks/bench_memory.py [rule_count]
+"""
+
+import gc
+import random
+import sys
+import tracemalloc
+
+from evalis.cache import configure_parse_cache
+from evalis.evalis import parse_ast
+from evalis.intern import NodeInterner
+from evalis.types import ParseResultSuccess, ParserOptions
+
+FIELDS = ["user.tier", "user.age", "order.total", "order.customer.country", "score"]
+VALUES = ['"gold"', '"silver"', '"US"', "100", "18", "0.5", "true"]
+OPS = ["==", "!=", ">", "<", ">="]
+
+
+def make_rules(count):
+    rng = random.Random(0)
+    rules = []
+    for _ in range(count):
+        conditions = [
+            f"{rng.choice(FIELDS)} {rng.choice(OPS)} {rng.choice(VALUES)}"
+            for _ in range(rng.randint(2, 4))
+        ]
+        rules.append(" and ".join(conditions))
+    return rules
+
+
+def measure(label, rules, intern):
+    options = ParserOptions(should_use_native_parser=True)
+    gc.collect()
+    tracemalloc.start()
+
+    interner = NodeInterner() if intern else None
+    asts = []
+    for rule in rules:
+        result = parse_ast(rule, options)
+        assert isinstance(result, ParseResultSuccess)
+        asts.append(result.ast if interner is None else interner.intern(result.ast))
+
+    # Only the ASTs are kept, the interner is dropped after loading
+    interner = None
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<12}{size / len(rules):>10.0f} bytes/rule")
+    return asts
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    configure_parse_cache(max_entries=0)
+    rules = make_rules(count)
+
+    print(f"{count} rules")
+    measure("plain", rules, intern=False)
+    measure("interned", rules, intern=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Time `+` and comparisons on each operand type, and compiled expressions with
+and without type hints.
+
+Run from the python/ directory:
+
+    python benchmarks/bench_operators.py
+
+Run it on two commits to compare operator changes against the code before them.
+"""
+
+import timeit
+
+from evalis.analysis import EACH
+from evalis.compiler import compile_ast
+from evalis.evalis import parse_ast
+from evalis.ops import op_add, op_gt, op_lte
+from evalis.types import ParseResultSuccess
+
+# (label, op, left, right): the first ones take the int/float/str fast paths,
+# the rest the general coercion rules
+OPERATIONS = [
+    ("int + int", op_add, 3, 4),
+    ("float + int", op_add, 2.5, 4),
+    ("str + str", op_add, "a", "b"),
+    ("int > int", op_gt, 3, 4),
+    ("float <= float", op_lte, 2.5, 4.5),
+    ("str > str", op_gt, "a", "b"),
+    ("str + int", op_add, "a", 1),
+    ("bool + int", op_add, True, 1),
+    ("null > int", op_gt, None, 1),
+]
+
+EXPRESSIONS = [
+    (
+        "a.x * 2 + a.y > limit and a.x + 1 <= a.y",
+        {"a": {"x": 3, "y": 10.5}, "limit": 5},
+        {"a.x": int, "a.y": float, "limit": int},
+    ),
+    (
+        "[i.price + shipping > budget for i in items]",
+        {
+            "items": [{"price": float(p)} for p in range(100)],
+            "shipping": 4.5,
+            "budget": 50,
+        },
+        {("items", EACH, "price"): float, "shipping": float, "budget": int},
+    ),
+]
+
+NUMBER = 20_000
+
+
+def bench(label, fn, number=NUMBER):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"  {label:<24}{seconds * 1e9:>12.1f} ns")
+
+
+def main():
+    print("operators")
+    for label, op, left, right in OPERATIONS:
+        bench(label, lambda: op(left, right), NUMBER * 10)
+
+    for expression, context, type_hints in EXPRESSIONS:
+        result = parse_ast(expression)
+        assert isinstance(result, ParseResultSuccess)
+        print(expression)
+
+        compiled = compile_ast(result.ast)
+        hinted = compile_ast(result.ast, type_hints=type_hints)
+        assert compiled(context) == hinted(context)
+        bench("compiled", lambda: compiled(context), NUMBER // 10)
+        bench("compiled with hints", lambda: hinted(context), NUMBER // 10)
+
+
+if __name__ == "__main__":
+    main()
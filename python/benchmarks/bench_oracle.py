@@ -0,0 +1,206 @@
+"""Run the shared benchmark corpus (test-oracle/benchmarks.yml).
+
+For every case this reports parse time (ANTLR and native parser), evaluation
+time (Evaluator and compiled) and the peak bytes allocated while parsing and
+evaluating once. Times are the best per-call average over several repeats.
+
+Run from the python/ directory:
+
+    python benchmarks/bench_oracle.py [--filter TEXT] [--json OUT]
+    python benchmarks/bench_oracle.py --compare BASELINE.json [--max-regression 0.2]
+
+--json writes the results so later runs (e.g. the next release) can be
+compared against them with --compare. With --max-regression, the run fails if
+any time got slower than the baseline by more than that fraction.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from evalis.cache import configure_parse_cache
+from evalis.compiler import compile_ast
+from evalis.constants import EXPRESSION_VERSION, __version__
+from evalis.eval import Evaluator
+from evalis.evalis import parse_ast
+from evalis.types import ParseResultSuccess, ParserOptions
+
+BENCHMARKS_YML = (
+    Path(__file__).resolve().parent.parent.parent / "test-oracle" / "benchmarks.yml"
+)
+
+ANTLR = ParserOptions()
+NATIVE = ParserOptions(should_use_native_parser=True)
+
+TIME_METRICS = ("parse_antlr_s", "parse_native_s", "eval_s", "eval_compiled_s")
+
+
+# region: corpus --------------------------------------------------------------
+def expand(value: Any) -> Any:
+    """Expand the generator directives described in benchmarks.yml."""
+    if isinstance(value, list):
+        return [expand(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    value = {key: expand(item) for key, item in value.items()}
+
+    if "$range" in value:
+        return list(range(value["$range"]))
+    if "$repeat" in value:
+        return [value["$repeat"] for _ in range(value["count"])]
+    if "$join" in value:
+        return value.get("sep", "").join(_flatten(value["$join"]))
+    if "$nest" in value:
+        nested = value["leaf"]
+        for _ in range(value["depth"]):
+            nested = {value["$nest"]: nested}
+        return nested
+    if "$object" in value:
+        return {f"{value['$object']}{i}": value["value"] for i in range(value["count"])}
+
+    return value
+
+
+def _flatten(items):
+    for item in items:
+        if isinstance(item, list):
+            yield from _flatten(item)
+        else:
+            yield item
+
+
+def load_cases(path=BENCHMARKS_YML):
+    with path.open("r", encoding="utf-8") as f:
+        return [expand(case) for case in yaml.safe_load(f)]
+
+
+# region: measuring -----------------------------------------------------------
+def best_time(fn, repeat):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def peak_bytes(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def parse(expression, options):
+    result = parse_ast(expression, options)
+    assert isinstance(result, ParseResultSuccess), result.errors
+    return result.ast
+
+
+def run_case(case, repeat):
+    expression = case["expr"]
+    context = case.get("context", {})
+    ast = parse(expression, NATIVE)
+    evaluator = Evaluator()
+    compiled = compile_ast(ast)
+
+    if "expected" in case:
+        for actual in (evaluator.evaluate(ast, context), compiled(context)):
+            if actual != case["expected"]:
+                raise AssertionError(f"{case['name']}: unexpected result {actual!r}")
+
+    return {
+        "name": case["name"],
+        "parse_antlr_s": best_time(lambda: parse(expression, ANTLR), repeat),
+        "parse_native_s": best_time(lambda: parse(expression, NATIVE), repeat),
+        "eval_s": best_time(lambda: evaluator.evaluate(ast, context), repeat),
+        "eval_compiled_s": best_time(lambda: compiled(context), repeat),
+        "parse_peak_bytes": peak_bytes(lambda: parse(expression, ANTLR)),
+        "eval_peak_bytes": peak_bytes(lambda: evaluator.evaluate(ast, context)),
+    }
+
+
+# region: reporting -----------------------------------------------------------
+def print_results(results, baseline=None):
+    header = f"{'case':<32}" + "".join(f"{m[:-2]:>18}" for m in TIME_METRICS)
+    print(header + f"{'eval peak (B)':>16}")
+
+    for result in results:
+        base = baseline.get(result["name"]) if baseline else None
+        cells = []
+        for metric in TIME_METRICS:
+            cell = f"{result[metric] * 1e6:.1f}us"
+            if base is not None:
+                cell += f" {result[metric] / base[metric]:.2f}x"
+            cells.append(f"{cell:>18}")
+        cells.append(f"{result['eval_peak_bytes']:>16}")
+        print(f"{result['name']:<32}" + "".join(cells))
+
+
+def find_regressions(results, baseline, max_regression):
+    regressions = []
+    for result in results:
+        base = baseline.get(result["name"])
+        if base is None:
+            continue
+        for metric in TIME_METRICS:
+            ratio = result[metric] / base[metric]
+            if ratio > 1 + max_regression:
+                regressions.append(f"{result['name']} {metric}: {ratio:.2f}x")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    parser.add_argument("--filter", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    parser.add_argument("--compare", type=Path, help="results of an earlier run")
+    parser.add_argument("--max-regression", type=float)
+    args = parser.parse_args()
+
+    configure_parse_cache(max_entries=0)
+    # Deeply nested expressions recurse once per level in the parsers
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10_000))
+
+    cases = load_cases()
+    if args.filter:
+        cases = [case for case in cases if args.filter in case["name"]]
+
+    results = [run_case(case, args.repeat) for case in cases]
+
+    baseline = None
+    if args.compare:
+        with args.compare.open("r", encoding="utf-8") as f:
+            baseline = {result["name"]: result for result in json.load(f)["cases"]}
+
+    print_results(results, baseline)
+
+    if args.json:
+        report = {
+            "evalis_version": __version__,
+            "expression_version": EXPRESSION_VERSION,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "cases": results,
+        }
+        with args.json.open("w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is not None and args.max_regression is not None:
+        regressions = find_regressions(results, baseline, args.max_regression)
+        if regressions:
+            print("\nregressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
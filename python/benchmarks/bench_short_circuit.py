@@ -0,0 +1,52 @@
+"""Compare short-circuit and eager and/or on guard-style rules.
+
+Run from the python/ directory:
+
+    python benchmarks/bench_short_circuit.py
+"""
+
+import timeit
+
+from evalis.compiler import compile_ast
+from evalis.eval import Evaluator
+from evalis.evalis import parse_ast
+from evalis.types import EvaluatorOptions, ParseResultSuccess
+
+ITEMS = list(range(50_000))
+
+# (expression, context) pairs where the left side decides the result
+RULES = [
+    ("enabled and [x * 2 for x in items]", {"enabled": False, "items": ITEMS}),
+    ("cached or [x + 1 for x in items]", {"cached": True, "items": ITEMS}),
+    (
+        "user.active and user.tier == 'gold' and 3 in [x for x in items]",
+        {"user": {"active": False, "tier": "gold"}, "items": ITEMS},
+    ),
+]
+
+NUMBER = 20
+
+
+def bench(label, fn):
+    seconds = min(timeit.repeat(fn, number=NUMBER, repeat=3)) / NUMBER
+    print(f"  {label:<24}{seconds * 1e6:>12.1f} us")
+
+
+def main():
+    for expression, context in RULES:
+        result = parse_ast(expression)
+        assert isinstance(result, ParseResultSuccess)
+        print(expression)
+
+        for name, options in (
+            ("short-circuit", EvaluatorOptions()),
+            ("eager", EvaluatorOptions(should_eagerly_evaluate_logic=True)),
+        ):
+            evaluator = Evaluator(options)
+            compiled = compile_ast(result.ast, options)
+            bench(f"evaluate ({name})", lambda: evaluator.evaluate(result.ast, context))
+            bench(f"compiled ({name})", lambda: compiled(context))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,147 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .constants import EXPRESSION_VERSION, __version__
 from .error import CODE_SYNTAX_ERROR, CODE_TYPE_ERROR, CODE_UNKNOWN, EvalisError
-from .evalis import evaluate_ast, evaluate_expression, parse_ast
 from .__gen__.grammar import RESERVED_KEYWORDS
-from .types import EvaluatorOptions, ParseResult
+from .types import ErrorPolicy, EvaluatorOptions, ParseResult, ParserOptions
+
+# Everything else is imported on first access (PEP 562), so `import evalis`
+# stays cheap for processes that only evaluate pre-parsed or deserialized ASTs.
+# ANTLR is only loaded once an expression is parsed with it (see parse_ast).
+_LAZY_EXPORTS = {
+    "AstArchive": "serialize",
+    "AsyncEvaluator": "async_eval",
+    "CompiledExpression": "compiler",
+    "ContextSchema": "schema",
+    "IncrementalEvaluation": "incremental",
+    "NodeInterner": "intern",
+    "ParallelEvaluator": "parallel",
+    "ParseCacheStats": "cache",
+    "Profiler": "profiling",
+    "ReferencePath": "analysis",
+    "References": "analysis",
+    "RuleMatcher": "matcher",
+    "RuleSet": "rules",
+    "check_ast": "typecheck",
+    "check_expression": "typecheck",
+    "clear_parse_cache": "cache",
+    "compile": "evalis",
+    "compile_ast": "compiler",
+    "compile_matcher": "evalis",
+    "compile_rules": "evalis",
+    "configure_parse_cache": "cache",
+    "evaluate_ast": "evalis",
+    "evaluate_async": "evalis",
+    "evaluate_columns": "evalis",
+    "evaluate_expression": "evalis",
+    "evaluate_incremental": "evalis",
+    "evaluate_many": "evalis",
+    "extract_references": "analysis",
+    "format_ast": "unparse",
+    "get_parse_cache_stats": "cache",
+    "optimize_ast": "optimize",
+    "parse_ast": "evalis",
+    "project_context": "analysis",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_EXPORTS})
+
+
+if TYPE_CHECKING:
+    from .analysis import (
+        ReferencePath,
+        References,
+        extract_references,
+        project_context,
+    )
+    from .async_eval import AsyncEvaluator
+    from .cache import (
+        ParseCacheStats,
+        clear_parse_cache,
+        configure_parse_cache,
+        get_parse_cache_stats,
+    )
+    from .compiler import CompiledExpression, compile_ast
+    from .evalis import (
+        compile,
+        compile_matcher,
+        compile_rules,
+        evaluate_ast,
+        evaluate_async,
+        evaluate_columns,
+        evaluate_expression,
+        evaluate_incremental,
+        evaluate_many,
+        parse_ast,
+    )
+    from .incremental import IncrementalEvaluation
+    from .intern import NodeInterner
+    from .matcher import RuleMatcher
+    from .optimize import optimize_ast
+    from .parallel import ParallelEvaluator
+    from .profiling import Profiler
+    from .rules import RuleSet
+    from .schema import ContextSchema
+    from .serialize import AstArchive
+    from .typecheck import check_ast, check_expression
+    from .unparse import format_ast
 
 __all__ = [
     "__version__",
+    "AstArchive",
+    "AsyncEvaluator",
     "CODE_SYNTAX_ERROR",
     "CODE_TYPE_ERROR",
     "CODE_UNKNOWN",
+    "CompiledExpression",
+    "ContextSchema",
+    "ErrorPolicy",
     "EvalisError",
     "EXPRESSION_VERSION",
+    "IncrementalEvaluation",
+    "NodeInterner",
+    "ParallelEvaluator",
+    "ParseCacheStats",
     "ParseResult",
+    "ParserOptions",
+    "Profiler",
     "RESERVED_KEYWORDS",
+    "ReferencePath",
+    "References",
+    "RuleMatcher",
+    "RuleSet",
     "EvaluatorOptions",
+    "check_ast",
+    "check_expression",
+    "clear_parse_cache",
+    "compile",
+    "compile_ast",
+    "compile_matcher",
+    "compile_rules",
+    "configure_parse_cache",
     "evaluate_ast",
+    "evaluate_async",
+    "evaluate_columns",
     "evaluate_expression",
+    "evaluate_incremental",
+    "evaluate_many",
+    "extract_references",
+    "format_ast",
+    "get_parse_cache_stats",
+    "optimize_ast",
     "parse_ast",
+    "project_context",
 ]
@@ -0,0 +1,249 @@
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from evalis.types import (
+    BinaryOpNode,
+    EvalisNode,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    UnaryOpNode,
+)
+
+
+class PathWildcard:
+    """A path segment that doesn't stand for one literal key."""
+
+    __slots__ = ("_label",)
+
+    def __init__(self, label: str):
+        self._label = label
+
+    def __repr__(self) -> str:
+        return self._label
+
+
+# A `[expr]` segment whose key is only known at evaluation time
+DYNAMIC = PathWildcard("DYNAMIC")
+# Every item of a list, as read by a list comprehension
+EACH = PathWildcard("EACH")
+
+
+@dataclass(frozen=True)
+class ReferencePath:
+    """A path read from the context, e.g. `order.items[EACH].price`."""
+
+    root: str
+    keys: tuple[Any, ...] = ()
+
+    @property
+    def is_dynamic(self) -> bool:
+        return DYNAMIC in self.keys
+
+    def __str__(self) -> str:
+        parts = [self.root]
+        for key in self.keys:
+            if key is DYNAMIC:
+                parts.append("[?]")
+            elif key is EACH:
+                parts.append("[*]")
+            elif isinstance(key, str) and key.isidentifier():
+                parts.append(f".{key}")
+            else:
+                parts.append(f"[{key!r}]")
+
+        return "".join(parts)
+
+
+@dataclass(frozen=True)
+class References:
+    """What an expression reads from its context.
+
+    - roots: the context names it reads.
+    - paths: every value it reads, in order of first use. The whole value at
+      the end of each path may be used, but not other values along the way.
+      Reads through a comprehension variable are paths through the iterable
+      with an EACH segment; `[expr]` segments are DYNAMIC.
+    - bound_variables: names bound by list comprehensions.
+    """
+
+    roots: frozenset[str]
+    paths: tuple[ReferencePath, ...]
+    bound_variables: frozenset[str]
+
+    @property
+    def is_dynamic(self) -> bool:
+        return any(path.is_dynamic for path in self.paths)
+
+
+class _Binding:
+    """A comprehension variable: the path of its items, if known."""
+
+    __slots__ = ("path", "is_used")
+
+    def __init__(self, path: ReferencePath | None):
+        self.path = path
+        self.is_used = False
+
+
+class _ReferenceCollector:
+    def __init__(self):
+        self._paths: dict[ReferencePath, None] = {}
+        self._bound_variables: set[str] = set()
+
+    def collect(self, node: EvalisNode) -> References:
+        self._visit(node, {})
+        return References(
+            roots=frozenset(path.root for path in self._paths),
+            paths=tuple(self._paths),
+            bound_variables=frozenset(self._bound_variables),
+        )
+
+    def _visit(self, node: Any, scope: dict[str, _Binding]) -> None:
+        if isinstance(node, LiteralNode):
+            return
+        if isinstance(node, BinaryOpNode):
+            self._visit(node.left, scope)
+            self._visit(node.right, scope)
+        elif isinstance(node, UnaryOpNode):
+            self._visit(node.expr, scope)
+        elif isinstance(node, ReferenceNode):
+            path = self._reference_path(node, scope)
+            if path is not None:
+                self._paths.setdefault(path, None)
+        elif isinstance(node, ListComprehensionNode):
+            self._visit_list_comprehension(node, scope)
+        else:
+            raise ValueError(f"Unexpected node type found: {node}")
+
+    def _visit_list_comprehension(
+        self, node: ListComprehensionNode, scope: dict[str, _Binding]
+    ) -> None:
+        self._bound_variables.add(node.variable_name)
+
+        iterable = node.iterable_expr
+        if not isinstance(iterable, ReferenceNode):
+            self._visit(iterable, scope)
+            binding = _Binding(None)
+            self._visit(node.element_expr, {**scope, node.variable_name: binding})
+            return
+
+        path = self._reference_path(iterable, scope)
+        item_path = None
+        if path is not None:
+            item_path = ReferencePath(path.root, (*path.keys, EACH))
+
+        binding = _Binding(item_path)
+        self._visit(node.element_expr, {**scope, node.variable_name: binding})
+
+        # The items themselves are only read through the variable, but the
+        # list is always needed to know how many items there are
+        if path is not None and not binding.is_used:
+            self._paths.setdefault(path, None)
+
+    def _reference_path(
+        self, node: ReferenceNode, scope: dict[str, _Binding]
+    ) -> ReferencePath | None:
+        keys = []
+        for child in node.children:
+            if isinstance(child, LiteralNode):
+                keys.append(child.value)
+            else:
+                self._visit(child, scope)
+                keys.append(DYNAMIC)
+
+        binding = scope.get(node.root)
+        if binding is None:
+            return ReferencePath(node.root, tuple(keys))
+
+        binding.is_used = True
+        if binding.path is None:
+            return None
+
+        return ReferencePath(binding.path.root, (*binding.path.keys, *keys))
+
+
+def extract_references(node: EvalisNode) -> References:
+    """Return the context names and paths that evaluating node may read."""
+    return _ReferenceCollector().collect(node)
+
+
+# region: projection ----------------------------------------------------------
+# A trie of paths: {key: subtrie}, where _WHOLE means "keep everything below"
+_WHOLE: dict[Any, Any] = {}
+
+
+def _add_path(trie: dict[Any, Any], keys: tuple[Any, ...]) -> dict[Any, Any]:
+    if trie is _WHOLE:
+        return trie
+    if not keys or keys[0] is DYNAMIC:
+        return _WHOLE
+
+    key, rest = keys[0], keys[1:]
+    trie[key] = _add_path(trie.get(key, {}), rest)
+    return trie
+
+
+def _project(value: Any, trie: dict[Any, Any]) -> Any:
+    if trie is _WHOLE:
+        return value
+
+    if isinstance(value, dict):
+        if EACH in trie:
+            return value
+
+        return {
+            key: _project(value[key], sub) for key, sub in trie.items() if key in value
+        }
+
+    if isinstance(value, list):
+        each = trie.get(EACH)
+        indexed = {}
+        for key, sub in trie.items():
+            if isinstance(key, int) and -len(value) <= key < len(value):
+                indexed[key % len(value)] = sub
+
+        if each is None:
+            # Items can't be dropped without shifting indexes
+            return [
+                _project(item, indexed[i]) if i in indexed else item
+                for i, item in enumerate(value)
+            ]
+
+        return [
+            _project(item, _merge(each, indexed[i]) if i in indexed else each)
+            for i, item in enumerate(value)
+        ]
+
+    return value
+
+
+def _merge(left: dict[Any, Any], right: dict[Any, Any]) -> dict[Any, Any]:
+    if left is _WHOLE or right is _WHOLE:
+        return _WHOLE
+
+    merged = dict(left)
+    for key, sub in right.items():
+        merged[key] = _merge(merged[key], sub) if key in merged else sub
+
+    return merged
+
+
+def project_context(
+    context: dict[str, Any],
+    references: References | Iterable[ReferencePath],
+) -> dict[str, Any]:
+    """Copy the parts of context that the given references read.
+
+    Evaluating the expression the references came from gives the same result
+    with the projected context as with the full one. Only dicts and lists are
+    narrowed down: other values, and everything below a DYNAMIC segment, are
+    kept as they are.
+    """
+    paths = references.paths if isinstance(references, References) else references
+
+    trie: dict[Any, Any] = {}
+    for path in paths:
+        trie = _add_path(trie, (path.root, *path.keys))
+
+    return _project(context, trie)
@@ -1,3 +1,5 @@
+import sys
+
 from evalis.__gen__.EvalisVisitor import EvalisVisitor as BaseEvalisVisitor
 from evalis.__gen__.EvalisParser import EvalisParser
 from .types import (
@@ -10,6 +12,7 @@ from .types import (
     ListComprehensionNode,
     EvalisNode,
 )
+from .utils import unescape_string_literal
 
 
 def _get_op_text(ctx):
@@ -80,13 +83,13 @@ class AstBuilder(BaseEvalisVisitor):
 
     # Visit a parse tree produced by EvalisParser#IdentifierAtom.
     def visitIdentifierAtom(self, ctx):
-        base_identifier = ctx.identifier().getText()
+        base_identifier = sys.intern(ctx.identifier().getText())
         parts: list[EvalisNode] = []
 
         for suffix in ctx.accessSuffix():
             # Dot access
             if suffix.identifier():
-                parts.append(LiteralNode(suffix.identifier().getText()))
+                parts.append(LiteralNode(sys.intern(suffix.identifier().getText())))
             # Index access (e.g., ["key"])
             elif suffix.expr():
                 parts.append(self.visit(suffix.expr()))
@@ -97,7 +100,7 @@ class AstBuilder(BaseEvalisVisitor):
     def visitListComprehension(self, ctx):
         return ListComprehensionNode(
             element_expr=self.visit(ctx.expr(0)),
-            variable_name=ctx.identifier().getText(),
+            variable_name=sys.intern(ctx.identifier().getText()),
             iterable_expr=self.visit(ctx.expr(1)),
         )
 
@@ -139,7 +142,4 @@ class AstBuilder(BaseEvalisVisitor):
 
     # Visit a parse tree produced by EvalisParser#stringLiteralNode.
     def visitStringLiteral(self, ctx: EvalisParser.StringLiteralContext):
-        raw = ctx.getText()
-        unquoted = raw[1:-1]
-        unescaped = unquoted.replace('\\"', '"').replace("\\\\", "\\")
-        return LiteralNode(unescaped)
+        return LiteralNode(unescape_string_literal(ctx.getText()))
@@ -0,0 +1,174 @@
+import asyncio
+import inspect
+from typing import Any, Awaitable, Hashable
+
+from evalis.eval import get_val_from_context
+from evalis.ops import get_binary_op, get_unary_op
+from evalis.scope import Scope
+from evalis.types import (
+    BinaryOpNode,
+    BinaryOpType,
+    EvaluatorOptions,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    UnaryOpNode,
+)
+
+
+def _is_lazy(value: Any) -> bool:
+    return inspect.isawaitable(value) or inspect.iscoroutinefunction(value)
+
+
+async def _resolve_fully(value: Any) -> Any:
+    while _is_lazy(value):
+        value = await (value() if inspect.iscoroutinefunction(value) else value)
+
+    return value
+
+
+async def _outcome(awaitable: Awaitable[Any]) -> tuple[bool, Any]:
+    try:
+        return (True, await awaitable)
+    except Exception as e:
+        return (False, e)
+
+
+async def _gather(*awaitables: Awaitable[Any]) -> list[Any]:
+    """Like asyncio.gather, but always raises the leftmost error."""
+    outcomes = await asyncio.gather(*map(_outcome, awaitables))
+
+    for ok, value in outcomes:
+        if not ok:
+            raise value
+
+    return [value for _, value in outcomes]
+
+
+class AsyncEvaluator:
+    """Evaluates an AST against a context whose values may be fetched lazily.
+
+    Any value reached by a reference can be an awaitable or an async function
+    taking no arguments (a resolver); it is awaited (or called and awaited)
+    when the expression needs it, so branches skipped by `and`/`or` never
+    fetch their data. Each value is fetched at most once per evaluation, even
+    when several branches need it at the same time. The operands of other
+    operators and the items of list comprehensions are evaluated concurrently
+    with asyncio.gather; when several fail, the leftmost error is raised.
+
+    Prefer resolvers over coroutine objects in contexts: coroutines that the
+    expression never touches are never awaited, which Python warns about.
+    Values are only resolved when a reference reaches them, not inside the
+    lists or dicts an expression returns. Errors raised by resolvers are
+    never turned into None by should_null_on_bad_access.
+    """
+
+    _options: EvaluatorOptions
+
+    def __init__(self, options: EvaluatorOptions = EvaluatorOptions()):
+        self._options = options
+
+    async def evaluate(self, node: Any, context: Any) -> Any:
+        return await _AsyncEvaluation(self._options).evaluate(node, context)
+
+
+class _AsyncEvaluation:
+    """The state of one AsyncEvaluator.evaluate call."""
+
+    def __init__(self, options: EvaluatorOptions):
+        self._options = options
+        # (id(container), type(key), key) -> task resolving container[key]
+        self._resolved: dict[Hashable, asyncio.Future[Any]] = {}
+        # Keeps the containers in _resolved alive so their ids stay unique
+        self._containers: list[Any] = []
+
+    async def evaluate(self, node: Any, context: Any) -> Any:
+        if isinstance(node, LiteralNode):
+            return node.value
+        if isinstance(node, BinaryOpNode):
+            return await self._evaluate_binary_op(node, context)
+        if isinstance(node, UnaryOpNode):
+            val = await self.evaluate(node.expr, context)
+
+            return get_unary_op(node.op)(val)
+        if isinstance(node, ReferenceNode):
+            current = await self._lookup(context, node.root)
+            for child in node.children:
+                child_key = await self.evaluate(child, context)
+                current = await self._lookup(current, child_key)
+
+            return current
+        if isinstance(node, ListComprehensionNode):
+            return await self._evaluate_list_comprehension(node, context)
+
+        raise ValueError(f"Unexpected node type found: {node}")
+
+    async def _evaluate_binary_op(self, node: BinaryOpNode, context: Any) -> Any:
+        if not self._options.should_eagerly_evaluate_logic:
+            if node.op == BinaryOpType.AND:
+                left = await self.evaluate(node.left, context)
+                return left and await self.evaluate(node.right, context)
+            if node.op == BinaryOpType.OR:
+                left = await self.evaluate(node.left, context)
+                return left or await self.evaluate(node.right, context)
+
+        if isinstance(node.left, LiteralNode) or isinstance(node.right, LiteralNode):
+            left = await self.evaluate(node.left, context)
+            right = await self.evaluate(node.right, context)
+        else:
+            left, right = await _gather(
+                self.evaluate(node.left, context), self.evaluate(node.right, context)
+            )
+
+        return get_binary_op(node.op)(left, right)
+
+    async def _evaluate_list_comprehension(
+        self, node: ListComprehensionNode, context: Any
+    ) -> Any:
+        iterable = await self.evaluate(node.iterable_expr, context)
+
+        if not isinstance(iterable, list):
+            if self._options.should_null_on_bad_access:
+                return None
+            else:
+                raise ValueError(
+                    f"List comprehension requires iterable to be a list, "
+                    f"got {type(iterable).__name__}"
+                )
+
+        # Items run concurrently, so each one gets its own Scope
+        return await _gather(
+            *(
+                self.evaluate(
+                    node.element_expr, Scope(context, node.variable_name, item)
+                )
+                for item in iterable
+            )
+        )
+
+    async def _lookup(self, context: Any, key: Any) -> Any:
+        # Memoize by the container that actually holds key, so a name bound
+        # outside a comprehension is shared by all of its items
+        while isinstance(context, Scope) and context.name != key:
+            context = context.parent
+
+        try:
+            value = get_val_from_context(
+                context, key, self._options.should_allow_attribute_access
+            )
+        except Exception:
+            if self._options.should_null_on_bad_access:
+                return None
+            raise
+
+        if not _is_lazy(value):
+            return value
+
+        memo_key = (id(context), type(key), key)
+        future = self._resolved.get(memo_key)
+        if future is None:
+            future = asyncio.ensure_future(_resolve_fully(value))
+            self._resolved[memo_key] = future
+            self._containers.append(context)
+
+        return await future
@@ -0,0 +1,31 @@
+from typing import Any, Callable, Iterable, Iterator
+
+from evalis.error import as_evalis_error
+from evalis.membership import MembershipCache
+from evalis.types import ErrorPolicy
+
+
+def iter_results(
+    fn: Callable[[Any], Any],
+    contexts: Iterable[Any],
+    on_error: ErrorPolicy = ErrorPolicy.RAISE,
+) -> Iterator[Any]:
+    """Yield fn(context) for every context, handling failures per on_error.
+
+    Lists searched with `in` are indexed for the whole batch (see
+    MembershipCache), so contexts must not be modified while it runs.
+    """
+    run = MembershipCache().run
+
+    if on_error == ErrorPolicy.RAISE:
+        for context in contexts:
+            yield run(fn, context)
+        return
+
+    should_collect = on_error == ErrorPolicy.COLLECT
+
+    for context in contexts:
+        try:
+            yield run(fn, context)
+        except Exception as e:
+            yield as_evalis_error(e) if should_collect else None
@@ -0,0 +1,173 @@
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+from evalis.types import (
+    BinaryOpNode,
+    ListComprehensionNode,
+    LiteralNode,
+    ParseResult,
+    ParseResultError,
+    ReferenceNode,
+    UnaryOpNode,
+)
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ParseCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+
+class ParseCache:
+    """Thread-safe LRU cache of ParseResults, bounded by entries and bytes.
+
+    Both successful and failed parses are cached. Sizes are approximate (see
+    estimate_parse_result_size). A cache with max_entries=0 stores nothing.
+    """
+
+    _entries: "OrderedDict[Hashable, tuple[ParseResult, int]]"
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        if max_entries < 0 or max_bytes < 0:
+            raise ValueError("ParseCache limits must not be negative")
+
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    def get(self, key: Hashable) -> ParseResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, expression: str, result: ParseResult) -> None:
+        if self._max_entries == 0:
+            return
+
+        size = estimate_parse_result_size(expression, result)
+        if size > self._max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous[1]
+
+            self._entries[key] = (result, size)
+            self._size_bytes += size
+
+            while self._is_over_limits():
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> ParseCacheStats:
+        with self._lock:
+            return ParseCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+            )
+
+    def _is_over_limits(self) -> bool:
+        if len(self._entries) > self._max_entries:
+            return True
+        return self._size_bytes > self._max_bytes
+
+
+def estimate_parse_result_size(expression: str, result: ParseResult) -> int:
+    """Roughly estimate the bytes held by a cache entry for expression."""
+    size = sys.getsizeof(expression) + sys.getsizeof(result)
+
+    if isinstance(result, ParseResultError):
+        return size + sum(
+            sys.getsizeof(error) + sys.getsizeof(error.message)
+            for error in result.errors
+        )
+
+    return size + _estimate_node_size(result.ast)
+
+
+def _estimate_node_size(node: Any) -> int:
+    size = sys.getsizeof(node)
+
+    if isinstance(node, LiteralNode):
+        return size + sys.getsizeof(node.value)
+    if isinstance(node, BinaryOpNode):
+        return size + _estimate_node_size(node.left) + _estimate_node_size(node.right)
+    if isinstance(node, UnaryOpNode):
+        return size + _estimate_node_size(node.expr)
+    if isinstance(node, ReferenceNode):
+        size += sys.getsizeof(node.root) + sys.getsizeof(node.children)
+        return size + sum(_estimate_node_size(child) for child in node.children)
+    if isinstance(node, ListComprehensionNode):
+        size += sys.getsizeof(node.variable_name)
+        size += _estimate_node_size(node.element_expr)
+        return size + _estimate_node_size(node.iterable_expr)
+
+    return size
+
+
+# region: default cache -------------------------------------------------------
+_parse_cache = ParseCache()
+
+
+def get_parse_cache() -> ParseCache:
+    return _parse_cache
+
+
+def configure_parse_cache(
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> None:
+    """Replace the cache used by parse_ast. Use max_entries=0 to disable it."""
+    global _parse_cache
+    _parse_cache = ParseCache(max_entries=max_entries, max_bytes=max_bytes)
+
+
+def clear_parse_cache() -> None:
+    _parse_cache.clear()
+
+
+def get_parse_cache_stats() -> ParseCacheStats:
+    return _parse_cache.stats()
@@ -0,0 +1,440 @@
+"""Columnar evaluation: one expression over whole columns at once.
+
+Instead of a list of row dicts, the context is a dict of equal-length columns
+(lists or NumPy arrays). Numeric/boolean operations are applied to whole
+columns with NumPy; anything that can't be vectorized with identical results
+(strings, nulls in arithmetic, possible int64 overflow, division by zero,
+nested access, comprehensions...) falls back to evaluating row by row.
+
+NumPy is an optional dependency: `pip install evalis[numpy]`.
+"""
+
+from typing import Any, Mapping, Sequence
+
+from evalis.eval import Evaluator
+from evalis.ops import get_binary_op, get_unary_op
+from evalis.types import (
+    BinaryOpNode,
+    BinaryOpType,
+    EvalisNode,
+    EvaluatorOptions,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    UnaryOpNode,
+    UnaryOpType,
+)
+
+# int64 results are only trusted when they are guaranteed not to overflow, and
+# int/float mixes only when every int converts to float exactly.
+_INT64_LIMIT = 2**63
+_FLOAT_EXACT_INT_LIMIT = 2**53
+
+_ARITHMETIC_OPS = (
+    BinaryOpType.ADD,
+    BinaryOpType.SUBTRACT,
+    BinaryOpType.MULTIPLY,
+    BinaryOpType.DIVIDE,
+)
+_COMPARISON_OPS = (
+    BinaryOpType.GT,
+    BinaryOpType.GTE,
+    BinaryOpType.LT,
+    BinaryOpType.LTE,
+    BinaryOpType.EQUALS,
+    BinaryOpType.NOT_EQUALS,
+)
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "Columnar evaluation requires numpy. Install it with `pip install evalis[numpy]`."
+        ) from e
+
+    return numpy
+
+
+# A column while evaluating is either a NumPy array of dtype bool, int64 or
+# float64, or a plain list of Python values.
+type Vector = Any
+
+
+class ColumnarEvaluator:
+    _options: EvaluatorOptions
+
+    def __init__(self, options: EvaluatorOptions = EvaluatorOptions()):
+        self._np = _import_numpy()
+        self._options = options
+        self._row_evaluator = Evaluator(options)
+
+    def evaluate(
+        self, node: EvalisNode, columns: Mapping[str, Sequence[Any]]
+    ) -> list[Any]:
+        """Evaluate node for every row and return the results as a list.
+
+        Results are the same as evaluating node against each row dict
+        {name: column[i]}, where NumPy columns are read as Python values.
+        """
+        sizes = {len(column) for column in columns.values()}
+        if len(sizes) > 1:
+            raise ValueError("All columns must have the same length")
+
+        size = sizes.pop() if sizes else 0
+        if size == 0:
+            return []
+
+        return self._to_list(self._evaluate_frame(node, columns, size))
+
+    def _evaluate_frame(
+        self, node: EvalisNode, columns: Mapping[str, Sequence[Any]], size: int
+    ) -> Vector:
+        self._columns = columns
+        self._size = size
+        self._vectors: dict[str, Vector] = {}
+        self._values: dict[str, list[Any]] = {}
+
+        return self._evaluate(node)
+
+    # region: nodes -----------------------------------------------------------
+    def _evaluate(self, node: Any) -> Vector:
+        if isinstance(node, LiteralNode):
+            return self._constant(node.value)
+        if isinstance(node, ReferenceNode) and not node.children:
+            return self._column_vector(node.root)
+        if isinstance(node, BinaryOpNode):
+            return self._evaluate_binary_op(node)
+        if isinstance(node, UnaryOpNode):
+            return self._evaluate_unary_op(node)
+        if isinstance(node, (ReferenceNode, ListComprehensionNode)):
+            return self._evaluate_rowwise(node)
+
+        raise ValueError(f"Unexpected node type found: {node}")
+
+    def _evaluate_binary_op(self, node: BinaryOpNode) -> Vector:
+        op = node.op
+        if (op == BinaryOpType.AND or op == BinaryOpType.OR) and not (
+            self._options.should_eagerly_evaluate_logic
+        ):
+            return self._evaluate_short_circuit(node)
+
+        left = self._evaluate(node.left)
+        right = self._evaluate(node.right)
+
+        if op in _ARITHMETIC_OPS:
+            result = self._vectorized_arithmetic(op, left, right)
+        elif op in _COMPARISON_OPS:
+            result = self._vectorized_comparison(op, left, right)
+        elif op == BinaryOpType.AND or op == BinaryOpType.OR:
+            result = self._vectorized_logic(op, left, right)
+        elif op == BinaryOpType.IN:
+            result = self._vectorized_in(left, node.right)
+        else:
+            result = None
+
+        if result is not None:
+            return result
+
+        return self._elementwise(get_binary_op(op), left, right)
+
+    def _evaluate_short_circuit(self, node: BinaryOpNode) -> Vector:
+        """Evaluate `and`/`or`, computing the right side only for rows that need it."""
+        np = self._np
+        left = self._evaluate(node.left)
+
+        if self._is_array(left):
+            truthy = left != 0
+        else:
+            truthy = np.array([bool(x) for x in left], dtype=np.bool_)
+
+        needs_right = truthy if node.op == BinaryOpType.AND else ~truthy
+        if not needs_right.any():
+            return left
+        if needs_right.all():
+            return self._evaluate(node.right)
+
+        rows = np.flatnonzero(needs_right)
+        right = self._evaluate_rows(node.right, rows)
+
+        if self._is_array(left) and self._is_array(right) and left.dtype == right.dtype:
+            merged = left.copy()
+            merged[rows] = right
+            return merged
+
+        values = list(self._to_list(left))
+        for row, value in zip(rows.tolist(), self._to_list(right)):
+            values[row] = value
+        return self._from_values(values)
+
+    def _evaluate_rows(self, node: EvalisNode, rows: Any) -> Vector:
+        """Evaluate node on a subset of the rows, given as an index array."""
+        columns = {}
+        for root in _collect_roots(node):
+            column = self._columns.get(root)
+            if column is None:
+                continue
+            if isinstance(column, self._np.ndarray):
+                columns[root] = column[rows]
+            else:
+                columns[root] = [column[row] for row in rows.tolist()]
+
+        return ColumnarEvaluator(self._options)._evaluate_frame(
+            node, columns, len(rows)
+        )
+
+    def _evaluate_unary_op(self, node: UnaryOpNode) -> Vector:
+        val = self._evaluate(node.expr)
+
+        if node.op == UnaryOpType.NOT and self._is_array(val):
+            return val == 0
+
+        op_func = get_unary_op(node.op)
+        return self._from_values([op_func(x) for x in self._to_list(val)])
+
+    def _evaluate_rowwise(self, node: EvalisNode) -> Vector:
+        roots = [root for root in _collect_roots(node) if root in self._columns]
+        values = [self._column_values(root) for root in roots]
+        evaluate = self._row_evaluator.evaluate
+
+        return self._from_values(
+            [evaluate(node, dict(zip(roots, row))) for row in zip(*values, strict=True)]
+            if roots
+            else [evaluate(node, {}) for _ in range(self._size)]
+        )
+
+    # region: vectorized ops --------------------------------------------------
+    def _vectorized_arithmetic(
+        self, op: BinaryOpType, left: Vector, right: Vector
+    ) -> Vector | None:
+        np = self._np
+        if not (self._is_array(left) and self._is_array(right)):
+            return None
+
+        # Python does bool arithmetic as ints, NumPy doesn't
+        left = left.astype(np.int64) if left.dtype == np.bool_ else left
+        right = right.astype(np.int64) if right.dtype == np.bool_ else right
+
+        if op == BinaryOpType.DIVIDE:
+            # Python raises on x / 0, so let the row-wise path do that
+            if np.any(right == 0):
+                return None
+            for operand in (left, right):
+                is_int = operand.dtype == np.int64
+                if is_int and self._max_abs(operand) > _FLOAT_EXACT_INT_LIMIT:
+                    return None
+            return np.true_divide(left, right, dtype=np.float64)
+
+        if left.dtype == np.int64 and right.dtype == np.int64:
+            left_max = self._max_abs(left)
+            right_max = self._max_abs(right)
+            bound = (
+                left_max * right_max
+                if op == BinaryOpType.MULTIPLY
+                else left_max + right_max
+            )
+            if bound >= _INT64_LIMIT:
+                return None
+        elif not self._fits_float(left, right):
+            return None
+
+        if op == BinaryOpType.ADD:
+            return left + right
+        if op == BinaryOpType.SUBTRACT:
+            return left - right
+        return left * right
+
+    def _vectorized_comparison(
+        self, op: BinaryOpType, left: Vector, right: Vector
+    ) -> Vector | None:
+        is_ordering = op not in (BinaryOpType.EQUALS, BinaryOpType.NOT_EQUALS)
+
+        if is_ordering:
+            # Ordering treats null as 0 (see utils.as_num)
+            left = self._as_numeric_or_null(left)
+            right = self._as_numeric_or_null(right)
+
+        if not (self._is_array(left) and self._is_array(right)):
+            return None
+        if not self._fits_float(left, right):
+            return None
+
+        if op == BinaryOpType.GT:
+            return left > right
+        if op == BinaryOpType.GTE:
+            return left >= right
+        if op == BinaryOpType.LT:
+            return left < right
+        if op == BinaryOpType.LTE:
+            return left <= right
+        if op == BinaryOpType.EQUALS:
+            return left == right
+        return left != right
+
+    def _vectorized_logic(
+        self, op: BinaryOpType, left: Vector, right: Vector
+    ) -> Vector | None:
+        np = self._np
+
+        # `and`/`or` return one of their operands, so only bools are safe
+        if not (self._is_array(left) and self._is_array(right)):
+            return None
+        if left.dtype != np.bool_ or right.dtype != np.bool_:
+            return None
+
+        if op == BinaryOpType.AND:
+            return np.logical_and(left, right)
+        return np.logical_or(left, right)
+
+    def _vectorized_in(self, left: Vector, right_node: Any) -> Vector | None:
+        np = self._np
+
+        if not self._is_array(left) or not isinstance(right_node, LiteralNode):
+            return None
+        if not isinstance(right_node.value, (list, tuple)):
+            return None
+
+        members = self._from_values(list(right_node.value))
+        if not self._is_array(members) or not self._fits_float(left, members):
+            return None
+
+        return np.isin(left, members)
+
+    def _elementwise(self, op_func: Any, left: Vector, right: Vector) -> Vector:
+        return self._from_values(
+            [op_func(x, y) for x, y in zip(self._to_list(left), self._to_list(right))]
+        )
+
+    # region: vectors ---------------------------------------------------------
+    def _column_vector(self, root: str) -> Vector:
+        vector = self._vectors.get(root)
+
+        if vector is None:
+            column = self._columns.get(root)
+            if column is None:
+                vector = self._missing_column(root)
+            elif isinstance(column, self._np.ndarray):
+                vector = self._from_array(column)
+            else:
+                vector = self._from_values(list(column))
+            self._vectors[root] = vector
+
+        return vector
+
+    def _column_values(self, root: str) -> list[Any]:
+        values = self._values.get(root)
+
+        if values is None:
+            column = self._columns[root]
+            values = self._to_list(column) if self._is_array(column) else list(column)
+            self._values[root] = values
+
+        return values
+
+    def _missing_column(self, root: str) -> Vector:
+        if self._options.should_null_on_bad_access:
+            return [None] * self._size
+        # Same error the row-wise lookup would raise
+        raise KeyError(root)
+
+    def _constant(self, value: Any) -> Vector:
+        np = self._np
+        value_type = type(value)
+
+        if value_type is bool:
+            return np.full(self._size, value, dtype=np.bool_)
+        if value_type is float:
+            return np.full(self._size, value, dtype=np.float64)
+        if value_type is int and -_INT64_LIMIT <= value < _INT64_LIMIT:
+            return np.full(self._size, value, dtype=np.int64)
+
+        return [value] * self._size
+
+    def _from_array(self, array: Any) -> Vector:
+        np = self._np
+        kind = array.dtype.kind
+
+        if kind == "b":
+            return array
+        if kind == "i":
+            return array.astype(np.int64, copy=False)
+        if kind == "u" and (array.size == 0 or int(array.max()) < _INT64_LIMIT):
+            return array.astype(np.int64)
+        if kind == "f":
+            return array.astype(np.float64, copy=False)
+
+        return self._from_values(array.tolist())
+
+    def _from_values(self, values: list[Any]) -> Vector:
+        """Turn a list into an array when that keeps Python semantics."""
+        np = self._np
+
+        if not values:
+            return values
+
+        first_type = type(values[0])
+        if first_type not in (bool, int, float):
+            return values
+        if not all(type(x) is first_type for x in values):
+            return values
+
+        if first_type is bool:
+            return np.array(values, dtype=np.bool_)
+        if first_type is float:
+            return np.array(values, dtype=np.float64)
+        if -_INT64_LIMIT <= min(values) and max(values) < _INT64_LIMIT:
+            return np.array(values, dtype=np.int64)
+
+        return values
+
+    def _as_numeric_or_null(self, vector: Vector) -> Vector:
+        """Replace nulls with 0 in an otherwise numeric list."""
+        if self._is_array(vector) or None not in vector:
+            return vector
+
+        non_null = [x for x in vector if x is not None]
+        if not non_null:
+            return self._np.zeros(len(vector), dtype=self._np.int64)
+
+        numeric = self._from_values(non_null)
+        if not self._is_array(numeric):
+            return vector
+
+        return self._from_values(
+            [numeric.dtype.type(0).item() if x is None else x for x in vector]
+        )
+
+    def _fits_float(self, left: Any, right: Any) -> bool:
+        """Check NumPy's int -> float conversion is exact for mixed operands."""
+        np = self._np
+        if (left.dtype == np.float64) == (right.dtype == np.float64):
+            return True
+
+        ints = right if left.dtype == np.float64 else left
+        return self._max_abs(ints) <= _FLOAT_EXACT_INT_LIMIT
+
+    def _max_abs(self, array: Any) -> int:
+        return max(int(array.max()), -int(array.min()))
+
+    def _is_array(self, vector: Vector) -> bool:
+        return isinstance(vector, self._np.ndarray)
+
+    def _to_list(self, vector: Vector) -> list[Any]:
+        return vector.tolist() if self._is_array(vector) else vector
+
+
+def _collect_roots(node: Any) -> set[str]:
+    if isinstance(node, ReferenceNode):
+        roots = {node.root}
+        for child in node.children:
+            roots |= _collect_roots(child)
+        return roots
+    if isinstance(node, BinaryOpNode):
+        return _collect_roots(node.left) | _collect_roots(node.right)
+    if isinstance(node, UnaryOpNode):
+        return _collect_roots(node.expr)
+    if isinstance(node, ListComprehensionNode):
+        return _collect_roots(node.iterable_expr) | _collect_roots(node.element_expr)
+
+    return set()
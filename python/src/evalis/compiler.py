@@ -0,0 +1,349 @@
+from typing import Any, Callable, Iterator
+
+from evalis.eval import get_val_from_context
+from evalis.hoisting import HoistedNode, hoist_invariants
+from evalis.membership import MIN_INDEXED_LENGTH, MembershipIndex
+from evalis.ops import get_binary_op, get_unary_op
+from evalis.optimize import optimize_ast
+from evalis.profiling import ProfilingEvaluator
+from evalis.scope import MemoScope
+from evalis.specialize import TypeHints, TypeInference, TypeScope
+from evalis.types import (
+    BinaryOpNode,
+    BinaryOpType,
+    EvalisNode,
+    EvaluatorOptions,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    UnaryOpNode,
+)
+
+
+type CompiledNode = Callable[[Any], Any]
+
+
+class CompiledExpression:
+    """An AST that has been compiled once and can be called with many contexts.
+
+    Results are identical to `evaluate_ast(ast, context, options)`.
+    """
+
+    _ast: EvalisNode
+    _options: EvaluatorOptions
+    _fn: CompiledNode
+
+    def __init__(self, ast: EvalisNode, options: EvaluatorOptions, fn: CompiledNode):
+        self._ast = ast
+        self._options = options
+        self._fn = fn
+
+    @property
+    def ast(self) -> EvalisNode:
+        return self._ast
+
+    @property
+    def options(self) -> EvaluatorOptions:
+        return self._options
+
+    def __call__(self, context: dict[str, Any] = {}) -> Any:
+        return self._fn(context)
+
+
+class Compiler:
+    """Turns an AST into a tree of closures, one per node.
+
+    Everything that only depends on the node (op dispatch, options, child
+    closures) is resolved here, once, so that calling the result only does the
+    work that depends on the context. With type hints, operators whose operand
+    types are known are compiled without their runtime type checks (see
+    evalis.specialize).
+    """
+
+    _options: EvaluatorOptions
+
+    def __init__(
+        self,
+        options: EvaluatorOptions = EvaluatorOptions(),
+        type_hints: TypeHints | None = None,
+    ):
+        self._options = options
+        self._inference = None if type_hints is None else TypeInference(type_hints)
+        # The comprehension variables bound where the node being compiled is
+        self._scope: TypeScope = ()
+
+    def compile(self, node: Any) -> CompiledNode:
+        if isinstance(node, LiteralNode):
+            return self._compile_literal(node)
+        if isinstance(node, BinaryOpNode):
+            return self._compile_binary_op(node)
+        if isinstance(node, UnaryOpNode):
+            return self._compile_unary_op(node)
+        if isinstance(node, ReferenceNode):
+            return self._compile_reference(node)
+        if isinstance(node, ListComprehensionNode):
+            return self._compile_list_comprehension(node)
+        if isinstance(node, HoistedNode):
+            return self._compile_hoisted(node)
+
+        raise ValueError(f"Unexpected node type found: {node}")
+
+    def _compile_literal(self, node: LiteralNode) -> CompiledNode:
+        value = node.value
+
+        def literal(context: Any) -> Any:
+            return value
+
+        return literal
+
+    def compile_root(self, node: Any) -> CompiledNode:
+        """Compile node as the whole expression, rather than part of one."""
+        if self._options.should_stream_comprehensions and isinstance(
+            node, ListComprehensionNode
+        ):
+            return self._compile_iter_list_comprehension(node)
+
+        return self.compile(node)
+
+    def _compile_binary_op(self, node: BinaryOpNode) -> CompiledNode:
+        op_func = get_binary_op(node.op)
+        left_fn = self.compile(node.left)
+
+        if node.op == BinaryOpType.IN and isinstance(node.right, LiteralNode):
+            values = node.right.value
+            if isinstance(values, (list, tuple)) and len(values) >= MIN_INDEXED_LENGTH:
+                return self._compile_literal_membership(left_fn, values)
+
+        should_stream = (
+            self._options.should_stream_comprehensions and node.op == BinaryOpType.IN
+        )
+        if should_stream and isinstance(node.right, ListComprehensionNode):
+            right_fn = self._compile_iter_list_comprehension(node.right)
+        else:
+            right_fn = self.compile(node.right)
+
+        if self._inference is not None:
+            op_func = self._inference.get_specialized_op(node, self._scope) or op_func
+
+        if not self._options.should_eagerly_evaluate_logic:
+            if node.op == BinaryOpType.AND:
+
+                def and_op(context: Any) -> Any:
+                    return left_fn(context) and right_fn(context)
+
+                return and_op
+            if node.op == BinaryOpType.OR:
+
+                def or_op(context: Any) -> Any:
+                    return left_fn(context) or right_fn(context)
+
+                return or_op
+
+        def binary_op(context: Any) -> Any:
+            return op_func(left_fn(context), right_fn(context))
+
+        return binary_op
+
+    def _compile_literal_membership(
+        self, left_fn: CompiledNode, items: list[Any] | tuple[Any, ...]
+    ) -> CompiledNode:
+        index = MembershipIndex(items)
+
+        def literal_membership(context: Any) -> Any:
+            return left_fn(context) in index
+
+        return literal_membership
+
+    def _compile_unary_op(self, node: UnaryOpNode) -> CompiledNode:
+        op_func = get_unary_op(node.op)
+        expr_fn = self.compile(node.expr)
+
+        def unary_op(context: Any) -> Any:
+            return op_func(expr_fn(context))
+
+        return unary_op
+
+    def _compile_reference(self, node: ReferenceNode) -> CompiledNode:
+        keys = [
+            child.value for child in node.children if isinstance(child, LiteralNode)
+        ]
+        if keys and len(keys) == len(node.children):
+            return self._compile_literal_path(node.root, tuple(keys))
+
+        lookup = self._make_lookup()
+        root = node.root
+        child_fns = tuple(self.compile(child) for child in node.children)
+
+        def reference(context: Any) -> Any:
+            current = lookup(context, root)
+            for child_fn in child_fns:
+                current = lookup(current, child_fn(context))
+
+            return current
+
+        return reference
+
+    def _compile_literal_path(self, root: str, keys: tuple[Any, ...]) -> CompiledNode:
+        """Compile a reference like `a.b[0]['c']` into a loop over its keys."""
+        should_null_on_bad_access = self._options.should_null_on_bad_access
+        should_allow_attribute_access = self._options.should_allow_attribute_access
+
+        def literal_path(context: Any) -> Any:
+            try:
+                current = get_val_from_context(
+                    context, root, should_allow_attribute_access
+                )
+                for key in keys:
+                    if type(current) is dict:
+                        current = current[key]
+                    else:
+                        current = get_val_from_context(
+                            current, key, should_allow_attribute_access
+                        )
+            except Exception:
+                # Once a lookup fails every following one would too
+                if should_null_on_bad_access:
+                    return None
+                raise
+
+            return current
+
+        return literal_path
+
+    def _compile_list_comprehension(self, node: ListComprehensionNode) -> CompiledNode:
+        variable_name = node.variable_name
+        iterable_fn = self._compile_iterable(node)
+        element_fn = self._compile_element(node)
+
+        def list_comprehension(context: Any) -> Any:
+            iterable = iterable_fn(context)
+            if iterable is None:
+                return None
+
+            scope = MemoScope(context, variable_name)
+            results = []
+            for item in iterable:
+                scope.value = item
+                results.append(element_fn(scope))
+
+            return results
+
+        return list_comprehension
+
+    def _compile_iter_list_comprehension(
+        self, node: ListComprehensionNode
+    ) -> CompiledNode:
+        variable_name = node.variable_name
+        iterable_fn = self._compile_iterable(node)
+        element_fn = self._compile_element(node)
+
+        def iter_items(context: Any, iterable: list[Any]) -> Iterator[Any]:
+            scope = MemoScope(context, variable_name)
+            for item in iterable:
+                scope.value = item
+                yield element_fn(scope)
+
+        def iter_list_comprehension(context: Any) -> Any:
+            iterable = iterable_fn(context)
+            if iterable is None:
+                return None
+
+            return iter_items(context, iterable)
+
+        return iter_list_comprehension
+
+    def _compile_element(self, node: ListComprehensionNode) -> CompiledNode:
+        """Compile the element of node, which is evaluated once per item.
+
+        Loop-invariant parts of the element are hoisted (see evalis.hoisting),
+        so loops always bind their variable with a MemoScope.
+        """
+        if self._inference is None:
+            return self.compile(hoist_invariants(node))
+
+        scope = self._scope
+        self._scope = self._inference.bind(node, scope)
+        try:
+            return self.compile(hoist_invariants(node))
+        finally:
+            self._scope = scope
+
+    def _compile_hoisted(self, node: HoistedNode) -> CompiledNode:
+        expr_fn = self.compile(node.expr)
+
+        def hoisted(context: Any) -> Any:
+            memo = context.memo
+            if node in memo:
+                return memo[node]
+
+            value = memo[node] = expr_fn(context)
+            return value
+
+        return hoisted
+
+    def _compile_iterable(self, node: ListComprehensionNode) -> CompiledNode:
+        """Compile the iterable of node, which must be a list (or None)."""
+        should_null_on_bad_access = self._options.should_null_on_bad_access
+        iterable_fn = self.compile(node.iterable_expr)
+
+        def iterable(context: Any) -> Any:
+            value = iterable_fn(context)
+
+            if not isinstance(value, list):
+                if should_null_on_bad_access:
+                    return None
+                else:
+                    raise ValueError(
+                        f"List comprehension requires iterable to be a list, "
+                        f"got {type(value).__name__}"
+                    )
+
+            return value
+
+        return iterable
+
+    def _make_lookup(self) -> Callable[[Any, Any], Any]:
+        should_allow_attribute_access = self._options.should_allow_attribute_access
+
+        if not self._options.should_null_on_bad_access:
+            if not should_allow_attribute_access:
+                return get_val_from_context
+
+            def lookup_attribute(context: Any, key: Any) -> Any:
+                return get_val_from_context(context, key, True)
+
+            return lookup_attribute
+
+        def lookup_or_null(context: Any, key: Any) -> Any:
+            try:
+                return get_val_from_context(context, key, should_allow_attribute_access)
+            except Exception:
+                return None
+
+        return lookup_or_null
+
+
+def compile_ast(
+    node: EvalisNode,
+    options: EvaluatorOptions = EvaluatorOptions(),
+    type_hints: TypeHints | None = None,
+) -> CompiledExpression:
+    """Compile an AST into a reusable CompiledExpression.
+
+    The AST is simplified with optimize_ast before compiling. With a profiler
+    in options, the AST is evaluated by a ProfilingEvaluator instead, so the
+    profile matches the AST as written.
+
+    type_hints maps context paths to the exact type of their values, e.g.
+    `{"user.age": int, ("items", EACH, "price"): float}`. They are trusted:
+    a hinted path must always be present and hold a value of that type, or
+    results are undefined.
+    """
+    if options.profiler is not None:
+        evaluator = ProfilingEvaluator(options)
+        return CompiledExpression(
+            node, options, lambda context: evaluator.evaluate_root(node, context)
+        )
+
+    fn = Compiler(options, type_hints).compile_root(optimize_ast(node, options))
+    return CompiledExpression(node, options, fn)
@@ -1,6 +1,6 @@
 from typing import Iterable
 
-from evalis.types import SyntaxMessage
+from evalis.types import SyntaxMessage, TypeMessage
 
 
 CODE_UNKNOWN = "UNKNOWN"
@@ -33,3 +33,25 @@ def syntax_error(errors: Iterable[SyntaxMessage]) -> EvalisError:
 {"\n".join((f"{x.line}:{x.column}: {x.message}" for x in errors))}
 """
     return EvalisError(message=message, code=CODE_SYNTAX_ERROR)
+
+
+def type_error(errors: Iterable[TypeMessage]) -> EvalisError:
+    lines = []
+    for x in errors:
+        position = "" if x.line is None else f"{x.line}:{x.column}: "
+        lines.append(f"{position}{x.source}: {x.message}")
+
+    message = f"""Type errors found while checking the expression:
+{"\n".join(lines)}
+"""
+    return EvalisError(message=message, code=CODE_TYPE_ERROR)
+
+
+def as_evalis_error(error: Exception) -> EvalisError:
+    """Return error as an EvalisError, wrapping anything else as CODE_UNKNOWN."""
+    if isinstance(error, EvalisError):
+        return error
+
+    wrapped = EvalisError(message=f"{type(error).__name__}: {error}")
+    wrapped.__cause__ = error
+    return wrapped
@@ -1,163 +1,201 @@
-from typing import Any
-from evalis.ast import (
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Iterator
+from evalis.hoisting import HoistedNode, hoist_invariants
+from evalis.ops import get_binary_op, get_unary_op
+from evalis.scope import MemoScope, Scope
+from evalis.types import (
+    BinaryOpNode,
     BinaryOpType,
+    EvaluatorOptions,
+    ListComprehensionNode,
     LiteralNode,
-    BinaryOpNode,
     ReferenceNode,
     UnaryOpNode,
-    UnaryOpType,
-    ListComprehensionNode,
-)
-from evalis.error import EvalisError, CODE_TYPE_ERROR
-from evalis.types import EvaluatorOptions
-from evalis.utils import (
-    as_str,
-    is_primitive,
-    should_str_concat,
-    as_num,
-    is_numeric_or_null,
 )
 
+# How many comprehensions an Evaluator keeps hoisted elements for
+MAX_HOISTED_ELEMENTS = 64
+
 
-def get_val_from_context(context: Any, key: Any) -> Any:
+def get_val_from_context(
+    context: Any, key: Any, should_allow_attribute_access: bool = False
+) -> Any:
     if isinstance(context, dict):
         return context[key]
+    elif isinstance(context, Scope):
+        while isinstance(context, Scope):
+            if context.name == key:
+                return context.value
+            context = context.parent
+
+        return get_val_from_context(context, key, should_allow_attribute_access)
     elif isinstance(context, list):
         return context[key]
+    elif isinstance(context, (str, bytes)):
+        raise ValueError(f"Unexpected context type in get_val_from_context: {context}")
+    elif isinstance(context, Mapping):
+        return context[key]
+    elif should_allow_attribute_access and isinstance(key, str):
+        return get_attribute(context, key)
+    elif hasattr(type(context), "__getitem__"):
+        return context[key]
     else:
         raise ValueError(f"Unexpected context type in get_val_from_context: {context}")
 
 
+def get_attribute(obj: Any, name: str) -> Any:
+    # Expressions may come from users, so keep them away from dunders & co.
+    if name.startswith("_"):
+        raise AttributeError(f"Cannot access private attribute '{name}'")
+
+    return getattr(obj, name)
+
+
 class Evaluator:
     _options: EvaluatorOptions
+    # Comprehension elements with loop-invariant subtrees hoisted, by id. Least
+    # recently used first, and bounded so long-lived Evaluators don't keep
+    # every tree they have seen alive.
+    _elements: "OrderedDict[int, tuple[ListComprehensionNode, Any]]"
+    _should_hoist_invariants = True
 
     def __init__(self, options: EvaluatorOptions = EvaluatorOptions()):
         self._options = options
+        self._elements = OrderedDict()
 
     def evaluate(self, node: Any, context: Any) -> Any:
         if isinstance(node, LiteralNode):
             return node.value
         if isinstance(node, BinaryOpNode):
             left = self.evaluate(node.left, context)
+
+            if not self._options.should_eagerly_evaluate_logic:
+                if node.op == BinaryOpType.AND:
+                    return left and self.evaluate(node.right, context)
+                if node.op == BinaryOpType.OR:
+                    return left or self.evaluate(node.right, context)
+
+            should_stream = self._options.should_stream_comprehensions
+            if should_stream and node.op == BinaryOpType.IN:
+                if isinstance(node.right, ListComprehensionNode):
+                    items = self.iter_list_comprehension(node.right, context)
+                    return get_binary_op(node.op)(left, items)
+
             right = self.evaluate(node.right, context)
 
-            match (node.op):
-                case BinaryOpType.ADD:
-                    # There are only a few type of legal additions:
-                    # 1. null + null
-                    # 2. String concatenation
-                    # 3. Numeric addition
-                    # 4. List concatenation
-                    if left is None and right is None:
-                        return None
-                    elif should_str_concat(left, right):
-                        return as_str(left) + as_str(right)
-                    elif is_primitive(left) and is_primitive(right):
-                        return left + right
-                    elif isinstance(left, list) and isinstance(right, list):
-                        return left + right
-                    else:
-                        raise EvalisError(
-                            f"Cannot use + operator with types {type(left)} and {type(right)}",
-                            CODE_TYPE_ERROR,
-                        )
-                case BinaryOpType.AND:
-                    return left and right
-                case BinaryOpType.DIVIDE:
-                    return left / right
-                case BinaryOpType.NOT_EQUALS:
-                    return left != right
-                case BinaryOpType.EQUALS:
-                    return left == right
-                case BinaryOpType.GT:
-                    if is_numeric_or_null(left) and is_numeric_or_null(right):
-                        return as_num(left) > as_num(right)
-                    if isinstance(left, str) and isinstance(right, str):
-                        return left > right
-                    raise EvalisError(
-                        f"Cannot use > operator with types {type(left).__name__} and {type(right).__name__}",
-                        CODE_TYPE_ERROR,
-                    )
-                case BinaryOpType.GTE:
-                    if is_numeric_or_null(left) and is_numeric_or_null(right):
-                        return as_num(left) >= as_num(right)
-                    if isinstance(left, str) and isinstance(right, str):
-                        return left >= right
-                    raise EvalisError(
-                        f"Cannot use >= operator with types {type(left).__name__} and {type(right).__name__}",
-                        CODE_TYPE_ERROR,
-                    )
-                case BinaryOpType.LT:
-                    if is_numeric_or_null(left) and is_numeric_or_null(right):
-                        return as_num(left) < as_num(right)
-                    if isinstance(left, str) and isinstance(right, str):
-                        return left < right
-                    raise EvalisError(
-                        f"Cannot use < operator with types {type(left).__name__} and {type(right).__name__}",
-                        CODE_TYPE_ERROR,
-                    )
-                case BinaryOpType.LTE:
-                    if is_numeric_or_null(left) and is_numeric_or_null(right):
-                        return as_num(left) <= as_num(right)
-                    if isinstance(left, str) and isinstance(right, str):
-                        return left <= right
-                    raise EvalisError(
-                        f"Cannot use <= operator with types {type(left).__name__} and {type(right).__name__}",
-                        CODE_TYPE_ERROR,
-                    )
-                case BinaryOpType.MULTIPLY:
-                    return left * right
-                case BinaryOpType.OR:
-                    return left or right
-                case BinaryOpType.SUBTRACT:
-                    return left - right
-                case BinaryOpType.IN:
-                    # TODO: Handle dynamic type coercion a bit better...
-                    return left in right
-                case _:
-                    raise ValueError(f"Unexpected binary op found: {node.op}")
+            return get_binary_op(node.op)(left, right)
         if isinstance(node, UnaryOpNode):
             val = self.evaluate(node.expr, context)
 
-            match (node.op):
-                case UnaryOpType.NOT:
-                    return not val
-                case _:
-                    raise ValueError(f"Unexpected unary op found: {node.op}")
+            return get_unary_op(node.op)(val)
 
         if isinstance(node, ReferenceNode):
             current = self._lookup_reference(context, node.root)
             for child in node.children:
-                child_key = self.evaluate(child, context)
+                if isinstance(child, LiteralNode):
+                    child_key = child.value
+                else:
+                    child_key = self.evaluate(child, context)
                 current = self._lookup_reference(current, child_key)
 
             return current
 
         if isinstance(node, ListComprehensionNode):
-            iterable = self.evaluate(node.iterable_expr, context)
-
-            if not isinstance(iterable, list):
-                if self._options.should_null_on_bad_access:
-                    return None
-                else:
-                    raise ValueError(
-                        f"List comprehension requires iterable to be a list, "
-                        f"got {type(iterable).__name__}"
-                    )
+            iterable = self._evaluate_iterable(node, context)
+            if iterable is None:
+                return None
 
             results = []
+            element, scope = self._start_loop(node, context)
             for item in iterable:
-                scoped_context = {**context, node.variable_name: item}
-                result = self.evaluate(node.element_expr, scoped_context)
+                scope.value = item
+                result = self.evaluate(element, scope)
                 results.append(result)
 
             return results
 
+        if isinstance(node, HoistedNode):
+            memo = context.memo
+            if node in memo:
+                return memo[node]
+
+            value = memo[node] = self.evaluate(node.expr, context)
+            return value
+
         raise ValueError(f"Unexpected node type found: {node}")
 
+    def evaluate_root(self, node: Any, context: Any) -> Any:
+        """Evaluate a whole expression, streaming a comprehension if enabled."""
+        if self._options.should_stream_comprehensions and isinstance(
+            node, ListComprehensionNode
+        ):
+            return self.iter_list_comprehension(node, context)
+
+        return self.evaluate(node, context)
+
+    def iter_list_comprehension(
+        self, node: ListComprehensionNode, context: Any
+    ) -> Iterator[Any] | None:
+        """Like evaluate, but yield the items instead of building a list.
+
+        The iterable is evaluated (and checked) right away; items are
+        evaluated as the iterator is consumed.
+        """
+        iterable = self._evaluate_iterable(node, context)
+        if iterable is None:
+            return None
+
+        return self._iter_items(node, context, iterable)
+
+    def _iter_items(
+        self, node: ListComprehensionNode, context: Any, iterable: list[Any]
+    ) -> Iterator[Any]:
+        element, scope = self._start_loop(node, context)
+        for item in iterable:
+            scope.value = item
+            yield self.evaluate(element, scope)
+
+    def _start_loop(
+        self, node: ListComprehensionNode, context: Any
+    ) -> tuple[Any, Scope]:
+        """Return the element to evaluate per item and the Scope to use."""
+        if not self._should_hoist_invariants:
+            return node.element_expr, Scope(context, node.variable_name)
+
+        entry = self._elements.get(id(node))
+        if entry is None or entry[0] is not node:
+            entry = self._elements[id(node)] = (node, hoist_invariants(node))
+            if len(self._elements) > MAX_HOISTED_ELEMENTS:
+                self._elements.popitem(last=False)
+        else:
+            self._elements.move_to_end(id(node))
+
+        element = entry[1]
+        if element is node.element_expr:
+            return element, Scope(context, node.variable_name)
+
+        return element, MemoScope(context, node.variable_name)
+
+    def _evaluate_iterable(self, node: ListComprehensionNode, context: Any) -> Any:
+        iterable = self.evaluate(node.iterable_expr, context)
+
+        if not isinstance(iterable, list):
+            if self._options.should_null_on_bad_access:
+                return None
+            else:
+                raise ValueError(
+                    f"List comprehension requires iterable to be a list, "
+                    f"got {type(iterable).__name__}"
+                )
+
+        return iterable
+
     def _lookup_reference(self, context: Any, key: Any) -> Any:
         try:
-            return get_val_from_context(context, key)
+            return get_val_from_context(
+                context, key, self._options.should_allow_attribute_access
+            )
         except Exception:
             if self._options.should_null_on_bad_access:
                 return None
@@ -1,18 +1,33 @@
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, Sequence
 
-from evalis.antlr4_adapter import parse_expression_tree
-from evalis.ast import AstBuilder, EvalisNode
-from evalis.error import syntax_error
-from evalis.eval import Evaluator
+from evalis.batch import iter_results
+from evalis.cache import get_parse_cache
+from evalis.compiler import CompiledExpression, compile_ast
+from evalis.error import syntax_error, type_error
+from evalis.incremental import IncrementalEvaluation
+from evalis.parser import parse_expression
+from evalis.profiling import create_evaluator
+from evalis.specialize import TypeHints
 from evalis.types import (
+    ErrorPolicy,
+    EvalisNode,
     EvaluatorOptions,
+    ParserOptions,
     ParseResult,
     ParseResultError,
     ParseResultSuccess,
 )
 
+if TYPE_CHECKING:
+    from evalis.matcher import RuleMatcher
+    from evalis.rules import RuleSet
+    from evalis.schema import ContextSchema
 
-def parse_ast(expression: str) -> ParseResult:
+
+def parse_ast(
+    expression: str,
+    options: ParserOptions = ParserOptions(),
+) -> ParseResult:
     """Parse expression and return ParseResult with ast or errors.
 
     Does NOT throw - returns a result object that contains either:
@@ -20,7 +35,34 @@ def parse_ast(expression: str) -> ParseResult:
     - errors: Tuple of syntax errors
 
     For simple use cases, use evaluate_expression() which throws on errors.
+
+    Results are memoized by expression text (see configure_parse_cache).
     """
+    cache = get_parse_cache()
+    key = (expression, options)
+    result = cache.get(key)
+
+    if result is None:
+        result = _parse_ast_uncached(expression, options)
+        cache.put(key, expression, result)
+
+    return result
+
+
+def _parse_ast_uncached(expression: str, options: ParserOptions) -> ParseResult:
+    if options.should_use_native_parser:
+        ast, errors = parse_expression(expression)
+
+        if ast is None:
+            return ParseResultError(ast=None, errors=errors)
+
+        return ParseResultSuccess(ast=ast, errors=None)
+
+    # ANTLR and the generated parser are slow to import, so they are only
+    # loaded once an expression is parsed with them
+    from evalis.antlr4_adapter import parse_expression_tree
+    from evalis.ast import AstBuilder
+
     tree, errors = parse_expression_tree(expression)
 
     if errors:
@@ -31,30 +73,211 @@ def parse_ast(expression: str) -> ParseResult:
     return ParseResultSuccess(ast=ast, errors=None)
 
 
+def _parse_or_raise(expression: str, options: ParserOptions) -> EvalisNode:
+    result = parse_ast(expression, options)
+
+    if isinstance(result, ParseResultError):
+        raise syntax_error(result.errors)
+
+    return result.ast
+
+
+def _as_ast(
+    expression_or_ast: str | EvalisNode, parser_options: ParserOptions
+) -> EvalisNode:
+    if isinstance(expression_or_ast, str):
+        return _parse_or_raise(expression_or_ast, parser_options)
+
+    return expression_or_ast
+
+
+def _check_or_raise(
+    expression_or_ast: str | EvalisNode,
+    node: EvalisNode,
+    schema: "ContextSchema",
+    options: EvaluatorOptions,
+) -> None:
+    from evalis.typecheck import check_ast, check_expression
+
+    messages = check_ast(node, schema, options)
+    if not messages:
+        return
+
+    if isinstance(expression_or_ast, str):
+        # Checking the source again finds where the errors are
+        messages = check_expression(expression_or_ast, schema, options)
+    raise type_error(messages)
+
+
 def evaluate_ast(
     node: EvalisNode,
     context: dict[str, Any] = {},
     options: EvaluatorOptions = EvaluatorOptions(),
 ) -> Any:
-    evaluator = Evaluator(options)
-    result = evaluator.evaluate(node, context)
-
-    return result
+    return create_evaluator(options).evaluate_root(node, context)
 
 
 def evaluate_expression(
     expression: str,
     context: dict[str, Any] = {},
     options: EvaluatorOptions = EvaluatorOptions(),
+    parser_options: ParserOptions = ParserOptions(),
 ) -> Any:
     """Evaluate expression and return result.
 
     Throws EvalisError if there are syntax errors.
     For non-throwing parse, use parse_ast() directly.
     """
-    result = parse_ast(expression)
+    return evaluate_ast(_parse_or_raise(expression, parser_options), context, options)
 
-    if isinstance(result, ParseResultError):
-        raise syntax_error(result.errors)
 
-    return evaluate_ast(result.ast, context, options)
+async def evaluate_async(
+    expression_or_ast: str | EvalisNode,
+    context: dict[str, Any] = {},
+    options: EvaluatorOptions = EvaluatorOptions(),
+    parser_options: ParserOptions = ParserOptions(),
+) -> Any:
+    """Evaluate an expression whose context values may be fetched lazily.
+
+    Context values can be awaitables or async functions taking no arguments;
+    they are awaited only if the expression reaches them, at most once per
+    evaluation. See AsyncEvaluator. Throws EvalisError on syntax errors.
+    """
+    from evalis.async_eval import AsyncEvaluator
+
+    node = _as_ast(expression_or_ast, parser_options)
+
+    return await AsyncEvaluator(options).evaluate(node, context)
+
+
+def compile(
+    expression: str,
+    options: EvaluatorOptions = EvaluatorOptions(),
+    parser_options: ParserOptions = ParserOptions(),
+    type_hints: TypeHints | None = None,
+    schema: "ContextSchema | None" = None,
+) -> CompiledExpression:
+    """Parse and compile expression into a reusable CompiledExpression.
+
+    Throws EvalisError if there are syntax errors. Calling the result with a
+    context is equivalent to evaluate_expression(expression, context, options).
+    See compile_ast for type_hints.
+
+    With a schema, the expression is checked against it first (throwing
+    EvalisError with CODE_TYPE_ERROR for type errors), and the schema's
+    type_hints are used for compiling.
+    """
+    node = _parse_or_raise(expression, parser_options)
+
+    if schema is not None:
+        _check_or_raise(expression, node, schema, options)
+        type_hints = {**schema.type_hints, **(type_hints or {})}
+
+    return compile_ast(node, options, type_hints)
+
+
+def compile_rules(
+    rules: Mapping[str, str | EvalisNode],
+    options: EvaluatorOptions = EvaluatorOptions(),
+    parser_options: ParserOptions = ParserOptions(),
+) -> "RuleSet":
+    """Parse and compile named expressions into a RuleSet.
+
+    Throws EvalisError if any expression has syntax errors. RuleSet.evaluate
+    evaluates every rule against a context in one pass, computing shared
+    subexpressions once.
+    """
+    from evalis.rules import RuleSet
+
+    return RuleSet(
+        {name: _as_ast(rule, parser_options) for name, rule in rules.items()},
+        options,
+    )
+
+
+def compile_matcher(
+    rules: Mapping[str, str | EvalisNode],
+    options: EvaluatorOptions = EvaluatorOptions(),
+    parser_options: ParserOptions = ParserOptions(),
+) -> "RuleMatcher":
+    """Parse and index named boolean expressions into a RuleMatcher.
+
+    Throws EvalisError if any expression has syntax errors. RuleMatcher.match
+    returns the names of the rules that are true for a context, using indexes
+    over their conditions to avoid evaluating most of them.
+    """
+    from evalis.matcher import RuleMatcher
+
+    return RuleMatcher(
+        {name: _as_ast(rule, parser_options) for name, rule in rules.items()},
+        options,
+    )
+
+
+def evaluate_many(
+    expression_or_ast: str | EvalisNode,
+    contexts: Iterable[dict[str, Any]],
+    options: EvaluatorOptions = EvaluatorOptions(),
+    on_error: ErrorPolicy = ErrorPolicy.RAISE,
+    lazy: bool = False,
+    parser_options: ParserOptions = ParserOptions(),
+    schema: "ContextSchema | None" = None,
+) -> list[Any] | Iterator[Any]:
+    """Evaluate one expression against many contexts.
+
+    The expression is parsed and compiled once. Returns a list of results in
+    the same order as contexts, or an iterator over them if lazy is True.
+
+    on_error decides what happens when evaluating a context fails: raise
+    (default), put the EvalisError in its slot (COLLECT) or put None (NULL).
+    Syntax errors always raise, and so do type errors found by checking
+    against schema, before any context is evaluated.
+    """
+    node = _as_ast(expression_or_ast, parser_options)
+
+    if schema is None:
+        compiled = compile_ast(node, options)
+    else:
+        _check_or_raise(expression_or_ast, node, schema, options)
+        compiled = compile_ast(node, options, schema.type_hints)
+
+    results = iter_results(compiled, contexts, on_error)
+
+    return results if lazy else list(results)
+
+
+def evaluate_incremental(
+    expression_or_ast: str | EvalisNode,
+    context: dict[str, Any],
+    options: EvaluatorOptions = EvaluatorOptions(),
+    parser_options: ParserOptions = ParserOptions(),
+) -> IncrementalEvaluation:
+    """Evaluate an expression in a way that can be updated as the context changes.
+
+    Throws EvalisError if there are syntax errors. The returned
+    IncrementalEvaluation has the result, and update(path, value) changes one
+    context value and re-evaluates only the parts of the expression reading it.
+    """
+    node = _as_ast(expression_or_ast, parser_options)
+
+    return IncrementalEvaluation(node, context, options)
+
+
+def evaluate_columns(
+    expression_or_ast: str | EvalisNode,
+    columns: Mapping[str, Sequence[Any]],
+    options: EvaluatorOptions = EvaluatorOptions(),
+    parser_options: ParserOptions = ParserOptions(),
+) -> list[Any]:
+    """Evaluate one expression over columnar data and return a result per row.
+
+    columns maps names to equal-length lists or NumPy arrays, so row i is the
+    context {name: column[i]}. Numeric and boolean operations run vectorized
+    with NumPy (an optional dependency); everything else falls back to
+    evaluating row by row with identical results.
+    """
+    from evalis.columnar import ColumnarEvaluator
+
+    node = _as_ast(expression_or_ast, parser_options)
+
+    return ColumnarEvaluator(options).evaluate(node, columns)
@@ -0,0 +1,123 @@
+"""Loop-invariant hoisting for list comprehension elements.
+
+A comprehension's element is evaluated once per item, but parts of it often
+don't depend on the item, e.g. `config.scale` in `[x * config.scale for x in
+xs]` or `rates[region]` in `[rates[region] * x.price for x in items]`. Those
+subtrees are wrapped in a HoistedNode, which the Evaluator and the Compiler
+evaluate the first time an item needs it and then reuse for the remaining
+items of that loop.
+
+Evaluating on first use rather than before the loop keeps error behavior
+identical: a hoisted subtree that raises does so for the same item, at the
+same point, as without hoisting, and one that is never reached (an empty
+list, a short-circuited `and`) is never evaluated.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from evalis.types import (
+    BinaryOpNode,
+    BinaryOpType,
+    EvalisNode,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    UnaryOpNode,
+)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class HoistedNode:
+    """A loop-invariant subtree, evaluated at most once per loop.
+
+    Only appears in elements returned by hoist_invariants, never in parsed
+    ASTs. It is always evaluated with the loop's MemoScope as context.
+    """
+
+    expr: EvalisNode
+
+
+def hoist_invariants(node: ListComprehensionNode) -> Any:
+    """Return node's element with its loop-invariant subtrees hoisted.
+
+    Returns the element itself when there is nothing worth hoisting.
+    """
+    return _Hoister(node.variable_name).rewrite(node.element_expr, True)
+
+
+class _Hoister:
+    def __init__(self, variable_name: str):
+        self._variable_name = variable_name
+        self._free_names: dict[int, frozenset[str]] = {}
+
+    def rewrite(self, node: Any, is_returned: bool) -> Any:
+        """Rewrite node; is_returned means its value can become the element."""
+        if self._variable_name not in self._get_free_names(node):
+            # A value that becomes part of the result must still be a new
+            # object per item (e.g. a list), unless it comes from the context
+            if _is_cheap(node) or (is_returned and not isinstance(node, ReferenceNode)):
+                return node
+            return HoistedNode(node)
+
+        if isinstance(node, BinaryOpNode):
+            # `and`/`or` return one of their operands
+            is_logic = node.op == BinaryOpType.AND or node.op == BinaryOpType.OR
+            left = self.rewrite(node.left, is_returned and is_logic)
+            right = self.rewrite(node.right, is_returned and is_logic)
+            if left is node.left and right is node.right:
+                return node
+            return BinaryOpNode(op=node.op, left=left, right=right)
+        if isinstance(node, UnaryOpNode):
+            expr = self.rewrite(node.expr, False)
+            return node if expr is node.expr else UnaryOpNode(op=node.op, expr=expr)
+        if isinstance(node, ReferenceNode):
+            children = tuple(self.rewrite(child, False) for child in node.children)
+            if all(new is old for new, old in zip(children, node.children)):
+                return node
+            return ReferenceNode(root=node.root, children=children)
+        if isinstance(node, ListComprehensionNode):
+            # The element runs in the inner loop, which does its own hoisting;
+            # only the iterable is evaluated once per item of this loop
+            iterable_expr = self.rewrite(node.iterable_expr, False)
+            if iterable_expr is node.iterable_expr:
+                return node
+            return ListComprehensionNode(
+                element_expr=node.element_expr,
+                variable_name=node.variable_name,
+                iterable_expr=iterable_expr,
+            )
+
+        return node
+
+    def _get_free_names(self, node: Any) -> frozenset[str]:
+        """The context names node reads that it doesn't bind itself."""
+        names = self._free_names.get(id(node))
+        if names is not None:
+            return names
+
+        if isinstance(node, BinaryOpNode):
+            names = self._get_free_names(node.left) | self._get_free_names(node.right)
+        elif isinstance(node, UnaryOpNode):
+            names = self._get_free_names(node.expr)
+        elif isinstance(node, ReferenceNode):
+            names = frozenset((node.root,)).union(
+                *(self._get_free_names(child) for child in node.children)
+            )
+        elif isinstance(node, ListComprehensionNode):
+            element_names = self._get_free_names(node.element_expr) - {
+                node.variable_name
+            }
+            names = self._get_free_names(node.iterable_expr) | element_names
+        else:
+            names = frozenset()
+
+        self._free_names[id(node)] = names
+        return names
+
+
+def _is_cheap(node: Any) -> bool:
+    """Whether node costs no more to evaluate than to look up a hoisted value."""
+    return isinstance(node, LiteralNode) or (
+        isinstance(node, ReferenceNode) and not node.children
+    )
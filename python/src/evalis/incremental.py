@@ -0,0 +1,289 @@
+"""Re-evaluating an expression after small changes to its context.
+
+IncrementalEvaluation keeps the result of every operator node and which
+context paths each one reads. After update(path, value) only the nodes that
+read something at, above or below path are evaluated again, so re-scoring an
+entity after one field changes costs roughly the depth of the expression
+rather than its size.
+"""
+
+from typing import Any, Sequence
+
+from evalis.analysis import DYNAMIC, EACH, ReferencePath, extract_references
+from evalis.eval import Evaluator
+from evalis.ops import get_binary_op, get_unary_op
+from evalis.types import (
+    BinaryOpNode,
+    BinaryOpType,
+    EvalisNode,
+    EvaluatorOptions,
+    ListComprehensionNode,
+    LiteralNode,
+    UnaryOpNode,
+)
+
+# A context path as a tuple: (root, *keys)
+type _Path = tuple[Any, ...]
+
+
+class _Cell:
+    """The cached result of one node of the expression."""
+
+    __slots__ = ("node", "parent", "children", "is_valid", "value", "error")
+
+    def __init__(self, node: Any, parent: "_Cell | None"):
+        self.node = node
+        self.parent = parent
+        self.children: tuple[_Cell, ...] = ()
+        self.is_valid = False
+        self.value: Any = None
+        self.error: Exception | None = None
+
+
+class _PathIndex:
+    """A trie of the paths read by the leaf cells."""
+
+    __slots__ = ("cells", "children")
+
+    def __init__(self):
+        self.cells: list[_Cell] = []
+        self.children: dict[Any, _PathIndex] = {}
+
+    def add(self, path: _Path, cell: _Cell) -> None:
+        index = self
+        for key in path:
+            index = index.children.setdefault(key, _PathIndex())
+        index.cells.append(cell)
+
+    def find(self, path: _Path) -> list[_Cell]:
+        """Return the cells reading path, a path above it or a path below it."""
+        found: list[_Cell] = []
+        index = self
+        for key in path:
+            found.extend(index.cells)
+            next_index = index.children.get(key)
+            if next_index is None:
+                return found
+            index = next_index
+
+        stack = [index]
+        while stack:
+            index = stack.pop()
+            found.extend(index.cells)
+            stack.extend(index.children.values())
+
+        return found
+
+
+class IncrementalEvaluation:
+    """An evaluation of one expression that can be updated field by field.
+
+    Operator nodes (`and`, `+`, `==`, `not`...) cache their results. References,
+    literals and list comprehensions are leaves: each records the context
+    paths it reads (see extract_references) and is evaluated as a whole by the
+    Evaluator. update(path, value) changes the context, invalidates the
+    leaves reading an overlapping path and their ancestors, and evaluates
+    again only those. Results are identical to evaluating the updated context
+    from scratch.
+
+    The caller's context is never modified: dicts and lists on an updated
+    path are copied the first time they are written to. List comprehensions
+    always produce lists, even with should_stream_comprehensions.
+    """
+
+    _options: EvaluatorOptions
+    _node: EvalisNode
+    _context: dict[str, Any]
+
+    def __init__(
+        self,
+        node: EvalisNode,
+        context: dict[str, Any],
+        options: EvaluatorOptions = EvaluatorOptions(),
+    ):
+        self._options = options
+        self._node = node
+        self._context = context
+        self._evaluator = Evaluator(options)
+        # Containers already copied from the caller's context, by id
+        self._owned: dict[int, Any] = {}
+        self._index = _PathIndex()
+        self._root = self._build(node, None)
+        self._evaluated_count = 0
+
+        try:
+            self._evaluate(self._root)
+        except Exception:
+            # Stays cached in the root cell, raised by result/update
+            pass
+
+    @property
+    def options(self) -> EvaluatorOptions:
+        return self._options
+
+    @property
+    def node(self) -> EvalisNode:
+        return self._node
+
+    @property
+    def context(self) -> dict[str, Any]:
+        """The context with all updates applied."""
+        return self._context
+
+    @property
+    def evaluated_count(self) -> int:
+        """Nodes evaluated so far, including by the initial evaluation."""
+        return self._evaluated_count
+
+    @property
+    def result(self) -> Any:
+        """The result for the current context. Raises if evaluating it did."""
+        return self._evaluate(self._root)
+
+    def update(self, path: str | Sequence[Any] | ReferencePath, value: Any) -> Any:
+        """Set the value at path in the context and return the new result.
+
+        path is `"cart.total"`, a sequence of keys such as `("items", 0,
+        "price")` or a ReferencePath without wildcards. Every container on the
+        way must exist and be a dict or a list.
+        """
+        changed = self._set(_as_path(path), value)
+
+        for cell in self._index.find(changed):
+            while cell is not None and cell.is_valid:
+                cell.is_valid = False
+                cell = cell.parent
+
+        return self.result
+
+    # region: building ----------------------------------------------------------
+    def _build(self, node: Any, parent: _Cell | None) -> _Cell:
+        cell = _Cell(node, parent)
+
+        if _is_streamed_membership(node, self._options):
+            # `x in [...]` stops at the first match, so it's evaluated whole
+            self._add_dependencies(node, cell)
+        elif isinstance(node, BinaryOpNode):
+            cell.children = (
+                self._build(node.left, cell),
+                self._build(node.right, cell),
+            )
+        elif isinstance(node, UnaryOpNode):
+            cell.children = (self._build(node.expr, cell),)
+        elif not isinstance(node, LiteralNode):
+            self._add_dependencies(node, cell)
+
+        return cell
+
+    def _add_dependencies(self, node: Any, cell: _Cell) -> None:
+        for reference in extract_references(node).paths:
+            self._index.add(_dependency(reference), cell)
+
+    # region: evaluating --------------------------------------------------------
+    def _evaluate(self, cell: _Cell) -> Any:
+        if not cell.is_valid:
+            self._evaluated_count += 1
+            try:
+                cell.value = self._compute(cell)
+                cell.error = None
+            except Exception as e:
+                cell.value = None
+                cell.error = e
+            cell.is_valid = True
+
+        if cell.error is not None:
+            raise cell.error
+
+        return cell.value
+
+    def _compute(self, cell: _Cell) -> Any:
+        node = cell.node
+
+        if isinstance(node, BinaryOpNode) and cell.children:
+            left_cell, right_cell = cell.children
+            left = self._evaluate(left_cell)
+
+            if not self._options.should_eagerly_evaluate_logic:
+                if node.op == BinaryOpType.AND:
+                    return left and self._evaluate(right_cell)
+                if node.op == BinaryOpType.OR:
+                    return left or self._evaluate(right_cell)
+
+            return get_binary_op(node.op)(left, self._evaluate(right_cell))
+        if isinstance(node, UnaryOpNode):
+            return get_unary_op(node.op)(self._evaluate(cell.children[0]))
+
+        return self._evaluator.evaluate(node, self._context)
+
+    # region: updating ----------------------------------------------------------
+    def _set(self, path: _Path, value: Any) -> _Path:
+        """Set value at path and return the path whose value changed.
+
+        Changing a list item is recorded as a change of the whole list, since
+        the same item can be read with different (e.g. negative) indexes.
+        """
+        changed = None
+        container = self._own(self._context)
+        self._context = container
+
+        for depth, key in enumerate(path[:-1]):
+            child = self._own(container[key])
+            container[key] = child
+            container = child
+            if changed is None and isinstance(child, list):
+                changed = path[: depth + 1]
+
+        container[path[-1]] = value
+
+        return path if changed is None else changed
+
+    def _own(self, container: Any) -> Any:
+        if id(container) in self._owned:
+            return container
+
+        if isinstance(container, dict):
+            copy: Any = dict(container)
+        elif isinstance(container, list):
+            copy = list(container)
+        else:
+            raise ValueError(
+                f"Cannot update a path through {type(container).__name__}, "
+                f"only through dicts and lists"
+            )
+
+        self._owned[id(copy)] = copy
+        return copy
+
+
+def _is_streamed_membership(node: Any, options: EvaluatorOptions) -> bool:
+    if not isinstance(node, BinaryOpNode) or node.op != BinaryOpType.IN:
+        return False
+    is_comprehension = isinstance(node.right, ListComprehensionNode)
+    return is_comprehension and options.should_stream_comprehensions
+
+
+def _dependency(reference: ReferencePath) -> _Path:
+    """The part of a reference's path that is known before evaluating."""
+    keys = reference.keys
+    for i, key in enumerate(keys):
+        if key is DYNAMIC or key is EACH:
+            keys = keys[:i]
+            break
+
+    return (reference.root, *keys)
+
+
+def _as_path(path: str | Sequence[Any] | ReferencePath) -> _Path:
+    if isinstance(path, ReferencePath):
+        keys: _Path = (path.root, *path.keys)
+    elif isinstance(path, str):
+        keys = tuple(path.split("."))
+    else:
+        keys = tuple(path)
+
+    if not keys or not isinstance(keys[0], str):
+        raise ValueError(f"Invalid context path: {path!r}")
+    if any(key is DYNAMIC or key is EACH for key in keys):
+        raise ValueError(f"Cannot update a path with wildcards: {path!r}")
+
+    return keys
@@ -0,0 +1,96 @@
+import sys
+from typing import Any, Hashable
+
+from evalis.types import (
+    BinaryOpNode,
+    EvalisNode,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    UnaryOpNode,
+)
+
+
+class NodeInterner:
+    """Hash-conses ASTs: structurally equal subtrees become one shared node.
+
+    Intern many ASTs with the same NodeInterner to share their common parts
+    (e.g. `user.tier == "gold"` used by thousands of rules). Nodes are
+    immutable, so sharing them is invisible to evaluation. The interner holds
+    every node it has seen; drop it once the ASTs are built.
+    """
+
+    _nodes: dict[Hashable, EvalisNode]
+
+    def __init__(self):
+        self._nodes = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def intern(self, node: Any) -> EvalisNode:
+        if isinstance(node, LiteralNode):
+            key = _literal_key(node.value)
+            if key is None:
+                return node
+        elif isinstance(node, BinaryOpNode):
+            node = BinaryOpNode(
+                op=node.op, left=self.intern(node.left), right=self.intern(node.right)
+            )
+            key = (BinaryOpNode, node.op, id(node.left), id(node.right))
+        elif isinstance(node, UnaryOpNode):
+            node = UnaryOpNode(op=node.op, expr=self.intern(node.expr))
+            key = (UnaryOpNode, node.op, id(node.expr))
+        elif isinstance(node, ReferenceNode):
+            node = ReferenceNode(
+                root=sys.intern(node.root),
+                children=tuple(self.intern(child) for child in node.children),
+            )
+            key = (ReferenceNode, node.root, *map(id, node.children))
+        elif isinstance(node, ListComprehensionNode):
+            node = ListComprehensionNode(
+                element_expr=self.intern(node.element_expr),
+                variable_name=sys.intern(node.variable_name),
+                iterable_expr=self.intern(node.iterable_expr),
+            )
+            key = (
+                ListComprehensionNode,
+                node.variable_name,
+                id(node.element_expr),
+                id(node.iterable_expr),
+            )
+        else:
+            raise ValueError(f"Unexpected node type found: {node}")
+
+        # Children are canonical, so their ids identify them
+        return self._nodes.setdefault(key, node)
+
+
+def _literal_key(value: Any) -> Hashable | None:
+    key = _value_key(value)
+    return None if key is None else (LiteralNode, key)
+
+
+def _value_key(value: Any) -> Hashable | None:
+    """Return a key equal only for values of the same types, or None if value
+    can't be shared (e.g. it holds a list)."""
+    # 1, 1.0 and true are equal in Python but are different literals, and so
+    # are 0.0 and -0.0. Tuples compare their items the same way, so every
+    # item is keyed by its type too
+    if isinstance(value, float):
+        return (type(value), value.hex())
+    if isinstance(value, tuple):
+        keys = []
+        for item in value:
+            key = _value_key(item)
+            if key is None:
+                return None
+            keys.append(key)
+        return (type(value), *keys)
+
+    try:
+        hash(value)
+    except TypeError:
+        return None
+
+    return (type(value), value)
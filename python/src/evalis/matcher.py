@@ -0,0 +1,237 @@
+import math
+from bisect import bisect_left, bisect_right
+from typing import Any, Mapping
+
+from evalis.compiler import CompiledNode, Compiler, compile_ast
+from evalis.optimize import optimize_ast
+from evalis.types import (
+    BinaryOpNode,
+    BinaryOpType,
+    EvalisNode,
+    EvaluatorOptions,
+    LiteralNode,
+    ReferenceNode,
+)
+
+# Values whose hash agrees with ==, so equality can be answered by a dict
+_HASHABLE_TYPES = (type(None), bool, int, float, str)
+_NUMERIC_TYPES = (int, float)
+
+_MIRRORED_OPS = {
+    BinaryOpType.GT: BinaryOpType.LT,
+    BinaryOpType.GTE: BinaryOpType.LTE,
+    BinaryOpType.LT: BinaryOpType.GT,
+    BinaryOpType.LTE: BinaryOpType.GTE,
+}
+
+_UNKNOWN = object()
+
+type Path = tuple[Any, ...]
+
+
+class _RangeIndex:
+    """Rules with a `path <op> threshold` condition, sorted by threshold."""
+
+    def __init__(self, op: BinaryOpType, entries: list[tuple[float, int]]):
+        entries.sort(key=lambda entry: entry[0])
+        self.op = op
+        self.thresholds = [threshold for threshold, _ in entries]
+        self.rules = [rule for _, rule in entries]
+
+    def passing(self, value: Any) -> list[int]:
+        """Rules whose condition holds for value."""
+        op = self.op
+        if op == BinaryOpType.GT:
+            return self.rules[: bisect_left(self.thresholds, value)]
+        if op == BinaryOpType.GTE:
+            return self.rules[: bisect_right(self.thresholds, value)]
+
+        if op == BinaryOpType.LT:
+            start = bisect_right(self.thresholds, value)
+        else:
+            start = bisect_left(self.thresholds, value)
+        return self.rules[start:]
+
+
+class RuleMatcher:
+    """Finds which of many named rules are true (truthy) for a context.
+
+    Each rule whose top level is a conjunction (`a and b and ...`) is indexed
+    by one of its conditions, preferring `reference == literal` and
+    `reference in literal_list` (hash index) over numeric comparisons like
+    `reference > 10` (sorted interval index). References must be fixed paths
+    such as `order.customer.tier`. For each context the referenced values are
+    looked up once, the indexes select candidate rules, and only candidates
+    are fully evaluated. Rules without an indexable condition are always
+    candidates.
+
+    match returns the same names as evaluating every rule, except that rules
+    ruled out by their index are not evaluated, so errors they would have
+    raised are not raised.
+    """
+
+    _options: EvaluatorOptions
+    _names: tuple[str, ...]
+    _fns: tuple[CompiledNode, ...]
+    _paths: dict[Path, CompiledNode]
+    _equality: dict[Path, dict[Any, list[int]]]
+    _equality_rules: dict[Path, list[int]]
+    _ranges: list[tuple[Path, _RangeIndex]]
+    _unindexed: list[int]
+
+    def __init__(
+        self,
+        rules: Mapping[str, EvalisNode],
+        options: EvaluatorOptions = EvaluatorOptions(),
+    ):
+        self._options = options
+        self._names = tuple(rules)
+        self._fns = tuple(compile_ast(node, options) for node in rules.values())
+        self._paths = {}
+        self._equality = {}
+        self._equality_rules = {}
+        self._unindexed = []
+
+        ranges: dict[tuple[Path, BinaryOpType], list[tuple[float, int]]] = {}
+        compiler = Compiler(options)
+
+        for index, node in enumerate(rules.values()):
+            condition = _choose_condition(optimize_ast(node, options))
+            if condition is None:
+                self._unindexed.append(index)
+                continue
+
+            path, op, values, reference = condition
+            if path not in self._paths:
+                self._paths[path] = compiler.compile(reference)
+
+            if op == BinaryOpType.EQUALS:
+                buckets = self._equality.setdefault(path, {})
+                for value in values:
+                    buckets.setdefault(value, []).append(index)
+                self._equality_rules.setdefault(path, []).append(index)
+            else:
+                ranges.setdefault((path, op), []).append((values[0], index))
+
+        self._ranges = [
+            (path, _RangeIndex(op, entries)) for (path, op), entries in ranges.items()
+        ]
+
+    @property
+    def options(self) -> EvaluatorOptions:
+        return self._options
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def match(self, context: dict[str, Any] = {}) -> list[str]:
+        """Return the names of the rules that are truthy for context, in order."""
+        return [self._names[index] for index in self._match_indexes(context)]
+
+    def _match_indexes(self, context: Any) -> list[int]:
+        fns = self._fns
+        return [
+            index for index in sorted(self._candidates(context)) if fns[index](context)
+        ]
+
+    def _candidates(self, context: Any) -> set[int]:
+        values: dict[Path, Any] = {}
+
+        def lookup(path: Path) -> Any:
+            value = values.get(path, _UNKNOWN)
+            if value is _UNKNOWN and path not in values:
+                try:
+                    value = self._paths[path](context)
+                except Exception:
+                    # Let the candidates raise the error when evaluated
+                    value = _UNKNOWN
+                values[path] = value
+            return value
+
+        candidates = set(self._unindexed)
+
+        for path, buckets in self._equality.items():
+            value = lookup(path)
+            if type(value) in _HASHABLE_TYPES:
+                candidates.update(buckets.get(value, ()))
+            else:
+                candidates.update(self._equality_rules[path])
+
+        for path, range_index in self._ranges:
+            value = lookup(path)
+            if type(value) in _NUMERIC_TYPES and not math.isnan(value):
+                candidates.update(range_index.passing(value))
+            else:
+                candidates.update(range_index.rules)
+
+        return candidates
+
+
+def _choose_condition(
+    node: Any,
+) -> tuple[Path, BinaryOpType, tuple[Any, ...], ReferenceNode] | None:
+    """Pick the condition of a conjunction to index the rule by.
+
+    Returns (path, op, values, reference) where op is EQUALS (the rule can
+    only be true if the path's value equals one of values) or a comparison
+    (the rule can only be true if `value <op> values[0]`).
+    """
+    best = None
+
+    for condition in _conjuncts(node):
+        indexed = _index_condition(condition)
+        if indexed is None:
+            continue
+        if indexed[1] == BinaryOpType.EQUALS:
+            return indexed
+        if best is None:
+            best = indexed
+
+    return best
+
+
+def _conjuncts(node: Any) -> list[Any]:
+    if isinstance(node, BinaryOpNode) and node.op == BinaryOpType.AND:
+        return _conjuncts(node.left) + _conjuncts(node.right)
+    return [node]
+
+
+def _index_condition(
+    node: Any,
+) -> tuple[Path, BinaryOpType, tuple[Any, ...], ReferenceNode] | None:
+    if not isinstance(node, BinaryOpNode):
+        return None
+
+    op = node.op
+    reference, literal = node.left, node.right
+    if isinstance(reference, LiteralNode) and op in _MIRRORED_OPS:
+        reference, literal, op = literal, reference, _MIRRORED_OPS[op]
+    elif isinstance(reference, LiteralNode) and op == BinaryOpType.EQUALS:
+        reference, literal = literal, reference
+
+    if not isinstance(reference, ReferenceNode) or not isinstance(literal, LiteralNode):
+        return None
+    path = _literal_path(reference)
+    if path is None:
+        return None
+    value = literal.value
+
+    if op == BinaryOpType.EQUALS and type(value) in _HASHABLE_TYPES:
+        return (path, op, (value,), reference)
+    if op == BinaryOpType.IN and isinstance(value, (list, tuple)):
+        if all(type(member) in _HASHABLE_TYPES for member in value):
+            return (path, BinaryOpType.EQUALS, tuple(value), reference)
+    if op in _MIRRORED_OPS and type(value) in _NUMERIC_TYPES:
+        if not (isinstance(value, float) and math.isnan(value)):
+            return (path, op, (value,), reference)
+
+    return None
+
+
+def _literal_path(node: ReferenceNode) -> Path | None:
+    keys = [child.value for child in node.children if isinstance(child, LiteralNode)]
+    if len(keys) < len(node.children):
+        return None
+
+    # Keyed by type too: a[1] and a[1.0] are different lookups
+    return (node.root, *((type(key), key) for key in keys))
@@ -0,0 +1,119 @@
+"""Hashed indexes for `in` against large lists.
+
+`x in some_list` scans the list. When the same list is searched many times
+(a literal list in a compiled expression, or a context list like a blocklist
+shared by every context of a batch), a MembershipIndex answers in constant
+time with the same result as the scan.
+"""
+
+from contextvars import ContextVar
+from typing import Any, Callable, Iterable, TypeVar
+
+# Shorter lists are scanned, which is about as fast as hashing
+MIN_INDEXED_LENGTH = 16
+# Lists built during evaluation (e.g. by comprehensions) are new objects every
+# time, so the cache starts over rather than growing without bound
+MAX_CACHED_LISTS = 256
+
+_T = TypeVar("_T")
+
+
+class MembershipIndex:
+    """Answers `value in items` for a list that doesn't change.
+
+    Hashable items go into a set; since equal values hash equally
+    (`hash(1) == hash(1.0) == hash(True)`), a set lookup finds exactly the
+    items a scan would. Unhashable items are scanned, and unhashable values
+    are looked up by scanning all items.
+    """
+
+    __slots__ = ("_items", "_hashed", "_unhashable")
+
+    def __init__(self, items: Iterable[Any]):
+        self._items = list(items)
+        self._hashed: set[Any] = set()
+        self._unhashable: list[Any] = []
+
+        for item in self._items:
+            try:
+                self._hashed.add(item)
+            except TypeError:
+                self._unhashable.append(item)
+
+    def __contains__(self, value: Any) -> bool:
+        try:
+            if value in self._hashed:
+                return True
+        except TypeError:
+            return value in self._items
+
+        return bool(self._unhashable) and value in self._unhashable
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class MembershipCache:
+    """Indexes of the lists searched with `in` while the cache is active.
+
+    Lists are keyed by identity, so they must not be modified while the cache
+    is active. A list is only indexed the second time it is searched, so
+    lists searched once cost no more than a scan. Activate the cache with
+    `with MembershipCache():` or run one call in it with run().
+    """
+
+    __slots__ = ("_entries", "_tokens")
+
+    # id(list) -> (list, index, or None if searched once so far)
+    _entries: dict[int, tuple[list[Any], MembershipIndex | None]]
+
+    def __init__(self):
+        self._entries = {}
+        self._tokens: list[Any] = []
+
+    def run(self, fn: Callable[..., _T], *args: Any) -> _T:
+        token = _active_cache.set(self)
+        try:
+            return fn(*args)
+        finally:
+            _active_cache.reset(token)
+
+    def __enter__(self) -> "MembershipCache":
+        self._tokens.append(_active_cache.set(self))
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _active_cache.reset(self._tokens.pop())
+
+    def contains(self, value: Any, items: list[Any]) -> bool:
+        entry = self._entries.get(id(items))
+
+        if entry is None:
+            if len(self._entries) >= MAX_CACHED_LISTS:
+                self._entries.clear()
+
+            # Keeping the list also keeps its id from being reused
+            self._entries[id(items)] = (items, None)
+            return value in items
+
+        index = entry[1]
+        if index is None:
+            index = MembershipIndex(items)
+            self._entries[id(items)] = (items, index)
+
+        return value in index
+
+
+_active_cache: ContextVar[MembershipCache | None] = ContextVar(
+    "evalis_membership_cache", default=None
+)
+
+
+def list_contains(value: Any, items: list[Any]) -> bool:
+    """`value in items`, using the active MembershipCache for long lists."""
+    if len(items) >= MIN_INDEXED_LENGTH:
+        cache = _active_cache.get()
+        if cache is not None:
+            return cache.contains(value, items)
+
+    return value in items
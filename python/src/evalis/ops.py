@@ -0,0 +1,195 @@
+from typing import Any, Callable
+
+from evalis.error import EvalisError, CODE_TYPE_ERROR
+from evalis.membership import list_contains
+from evalis.types import BinaryOpType, UnaryOpType
+from evalis.utils import (
+    as_str,
+    is_primitive,
+    should_str_concat,
+    as_num,
+    is_numeric_or_null,
+)
+
+
+# Values of these exact types (not subclasses such as bool) take the fast paths
+# below, which give the same results as the general rules that follow them
+_NUMBER_TYPES = frozenset((int, float))
+
+
+# region: binary ops ----------------------------------------------------------
+def op_add(left: Any, right: Any) -> Any:
+    left_type = type(left)
+    right_type = type(right)
+    if left_type in _NUMBER_TYPES and right_type in _NUMBER_TYPES:
+        return left + right
+    if left_type is str and right_type is str:
+        return left + right
+
+    # There are only a few type of legal additions:
+    # 1. null + null
+    # 2. String concatenation
+    # 3. Numeric addition
+    # 4. List concatenation
+    if left is None and right is None:
+        return None
+    elif should_str_concat(left, right):
+        return as_str(left) + as_str(right)
+    elif is_primitive(left) and is_primitive(right):
+        return left + right
+    elif isinstance(left, list) and isinstance(right, list):
+        return left + right
+    else:
+        raise EvalisError(
+            f"Cannot use + operator with types {type(left)} and {type(right)}",
+            CODE_TYPE_ERROR,
+        )
+
+
+def op_subtract(left: Any, right: Any) -> Any:
+    return left - right
+
+
+def op_multiply(left: Any, right: Any) -> Any:
+    return left * right
+
+
+def op_divide(left: Any, right: Any) -> Any:
+    return left / right
+
+
+def op_equals(left: Any, right: Any) -> Any:
+    return left == right
+
+
+def op_not_equals(left: Any, right: Any) -> Any:
+    return left != right
+
+
+def op_gt(left: Any, right: Any) -> Any:
+    left_type = type(left)
+    right_type = type(right)
+    if left_type in _NUMBER_TYPES and right_type in _NUMBER_TYPES:
+        return left > right
+    if left_type is str and right_type is str:
+        return left > right
+
+    if is_numeric_or_null(left) and is_numeric_or_null(right):
+        return as_num(left) > as_num(right)
+    if isinstance(left, str) and isinstance(right, str):
+        return left > right
+    raise EvalisError(
+        f"Cannot use > operator with types {type(left).__name__} and {type(right).__name__}",
+        CODE_TYPE_ERROR,
+    )
+
+
+def op_gte(left: Any, right: Any) -> Any:
+    left_type = type(left)
+    right_type = type(right)
+    if left_type in _NUMBER_TYPES and right_type in _NUMBER_TYPES:
+        return left >= right
+    if left_type is str and right_type is str:
+        return left >= right
+
+    if is_numeric_or_null(left) and is_numeric_or_null(right):
+        return as_num(left) >= as_num(right)
+    if isinstance(left, str) and isinstance(right, str):
+        return left >= right
+    raise EvalisError(
+        f"Cannot use >= operator with types {type(left).__name__} and {type(right).__name__}",
+        CODE_TYPE_ERROR,
+    )
+
+
+def op_lt(left: Any, right: Any) -> Any:
+    left_type = type(left)
+    right_type = type(right)
+    if left_type in _NUMBER_TYPES and right_type in _NUMBER_TYPES:
+        return left < right
+    if left_type is str and right_type is str:
+        return left < right
+
+    if is_numeric_or_null(left) and is_numeric_or_null(right):
+        return as_num(left) < as_num(right)
+    if isinstance(left, str) and isinstance(right, str):
+        return left < right
+    raise EvalisError(
+        f"Cannot use < operator with types {type(left).__name__} and {type(right).__name__}",
+        CODE_TYPE_ERROR,
+    )
+
+
+def op_lte(left: Any, right: Any) -> Any:
+    left_type = type(left)
+    right_type = type(right)
+    if left_type in _NUMBER_TYPES and right_type in _NUMBER_TYPES:
+        return left <= right
+    if left_type is str and right_type is str:
+        return left <= right
+
+    if is_numeric_or_null(left) and is_numeric_or_null(right):
+        return as_num(left) <= as_num(right)
+    if isinstance(left, str) and isinstance(right, str):
+        return left <= right
+    raise EvalisError(
+        f"Cannot use <= operator with types {type(left).__name__} and {type(right).__name__}",
+        CODE_TYPE_ERROR,
+    )
+
+
+def op_and(left: Any, right: Any) -> Any:
+    return left and right
+
+
+def op_or(left: Any, right: Any) -> Any:
+    return left or right
+
+
+def op_in(left: Any, right: Any) -> Any:
+    # TODO: Handle dynamic type coercion a bit better...
+    if type(right) is list:
+        return list_contains(left, right)
+
+    return left in right
+
+
+BINARY_OPS: dict[BinaryOpType, Callable[[Any, Any], Any]] = {
+    BinaryOpType.ADD: op_add,
+    BinaryOpType.SUBTRACT: op_subtract,
+    BinaryOpType.MULTIPLY: op_multiply,
+    BinaryOpType.DIVIDE: op_divide,
+    BinaryOpType.EQUALS: op_equals,
+    BinaryOpType.NOT_EQUALS: op_not_equals,
+    BinaryOpType.GT: op_gt,
+    BinaryOpType.GTE: op_gte,
+    BinaryOpType.LT: op_lt,
+    BinaryOpType.LTE: op_lte,
+    BinaryOpType.AND: op_and,
+    BinaryOpType.OR: op_or,
+    BinaryOpType.IN: op_in,
+}
+
+
+# region: unary ops -----------------------------------------------------------
+def op_not(val: Any) -> Any:
+    return not val
+
+
+UNARY_OPS: dict[UnaryOpType, Callable[[Any], Any]] = {
+    UnaryOpType.NOT: op_not,
+}
+
+
+def get_binary_op(op: BinaryOpType) -> Callable[[Any, Any], Any]:
+    op_func = BINARY_OPS.get(op)
+    if op_func is None:
+        raise ValueError(f"Unexpected binary op found: {op}")
+    return op_func
+
+
+def get_unary_op(op: UnaryOpType) -> Callable[[Any], Any]:
+    op_func = UNARY_OPS.get(op)
+    if op_func is None:
+        raise ValueError(f"Unexpected unary op found: {op}")
+    return op_func
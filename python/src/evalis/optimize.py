@@ -0,0 +1,125 @@
+from typing import Any
+
+from evalis.eval import Evaluator
+from evalis.types import (
+    BinaryOpNode,
+    BinaryOpType,
+    EvalisNode,
+    EvaluatorOptions,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    UnaryOpNode,
+    UnaryOpType,
+)
+
+# Only immutable results are folded, so evaluations never share a mutable value
+_FOLDABLE_TYPES = (type(None), bool, int, float, str)
+
+
+class Optimizer:
+    """Simplifies an AST without changing what evaluating it does.
+
+    - Literal-only subtrees are folded into a LiteralNode. Subtrees that raise
+      (e.g. CODE_TYPE_ERROR for `5 > "a"`) are left alone so the error still
+      happens at evaluation time.
+    - `and`/`or` with a literal left operand are reduced to the operand that
+      decides the result.
+    - Redundant negations (`not not <bool>`) are removed.
+    """
+
+    _options: EvaluatorOptions
+
+    def __init__(self, options: EvaluatorOptions = EvaluatorOptions()):
+        self._options = options
+        self._evaluator = Evaluator(options)
+
+    def optimize(self, node: Any) -> EvalisNode:
+        if isinstance(node, LiteralNode):
+            return node
+        if isinstance(node, BinaryOpNode):
+            return self._optimize_binary_op(node)
+        if isinstance(node, UnaryOpNode):
+            return self._optimize_unary_op(node)
+        if isinstance(node, ReferenceNode):
+            return ReferenceNode(
+                root=node.root,
+                children=tuple(self.optimize(child) for child in node.children),
+            )
+        if isinstance(node, ListComprehensionNode):
+            return ListComprehensionNode(
+                element_expr=self.optimize(node.element_expr),
+                variable_name=node.variable_name,
+                iterable_expr=self.optimize(node.iterable_expr),
+            )
+
+        raise ValueError(f"Unexpected node type found: {node}")
+
+    def _optimize_binary_op(self, node: BinaryOpNode) -> EvalisNode:
+        left = self.optimize(node.left)
+        right = self.optimize(node.right)
+        optimized = BinaryOpNode(op=node.op, left=left, right=right)
+
+        if isinstance(left, LiteralNode) and isinstance(right, LiteralNode):
+            return self._fold(optimized)
+
+        if isinstance(left, LiteralNode):
+            # `L and R` is R when L is truthy, `L or R` is R when L is falsy
+            if node.op == BinaryOpType.AND and left.value:
+                return right
+            if node.op == BinaryOpType.OR and not left.value:
+                return right
+
+            # ...and L otherwise, as long as R doesn't have to be evaluated
+            if not self._options.should_eagerly_evaluate_logic and (
+                node.op == BinaryOpType.AND or node.op == BinaryOpType.OR
+            ):
+                return left
+
+        return optimized
+
+    def _optimize_unary_op(self, node: UnaryOpNode) -> EvalisNode:
+        expr = self.optimize(node.expr)
+        optimized = UnaryOpNode(op=node.op, expr=expr)
+
+        if isinstance(expr, LiteralNode):
+            return self._fold(optimized)
+
+        # `not not x` is x when x is already a bool
+        if node.op == UnaryOpType.NOT and isinstance(expr, UnaryOpNode):
+            if expr.op == UnaryOpType.NOT and _is_bool_valued(expr.expr):
+                return expr.expr
+
+        return optimized
+
+    def _fold(self, node: EvalisNode) -> EvalisNode:
+        try:
+            value = self._evaluator.evaluate(node, {})
+        except Exception:
+            return node
+
+        if not isinstance(value, _FOLDABLE_TYPES):
+            return node
+
+        return LiteralNode(value)
+
+
+def _is_bool_valued(node: Any) -> bool:
+    if isinstance(node, UnaryOpNode):
+        return node.op == UnaryOpType.NOT
+    # Comparisons are left out on purpose: they return whatever the operands'
+    # __eq__/__gt__/... return, which isn't always a bool (e.g. NumPy scalars).
+    if isinstance(node, BinaryOpNode):
+        return node.op == BinaryOpType.IN
+    if isinstance(node, LiteralNode):
+        return isinstance(node.value, bool)
+
+    return False
+
+
+def optimize_ast(
+    node: EvalisNode,
+    options: EvaluatorOptions = EvaluatorOptions(),
+) -> EvalisNode:
+    """Return a simplified AST that evaluates exactly like node."""
+    return Optimizer(options).optimize(node)
@@ -0,0 +1,141 @@
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice, repeat
+from typing import Any, Iterable, Iterator, Sequence
+
+from evalis.batch import iter_results
+from evalis.compiler import CompiledExpression, compile_ast
+from evalis.types import ErrorPolicy, EvalisNode, EvaluatorOptions
+
+DEFAULT_CHUNKSIZE = 256
+
+# The expression compiled in this worker process, set by _init_worker
+_worker_expression: CompiledExpression | None = None
+
+
+def _init_worker(node: EvalisNode, options: EvaluatorOptions) -> None:
+    global _worker_expression
+    _worker_expression = compile_ast(node, options)
+
+
+def _evaluate_chunk(contexts: list[Any], on_error: ErrorPolicy) -> list[Any]:
+    expression = _worker_expression
+    assert expression is not None, "worker was not initialized"
+    return list(iter_results(expression, contexts, on_error))
+
+
+def _is_gil_enabled() -> bool:
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_enabled is None else is_enabled()
+
+
+class ParallelEvaluator:
+    """Evaluates one expression over many contexts on a pool of workers.
+
+    By default contexts are sent in chunks to a ProcessPoolExecutor whose
+    workers receive the AST once, when they start, and compile it. On
+    free-threaded builds (no GIL) a ThreadPoolExecutor sharing one compiled
+    expression is used instead; use_threads overrides the choice.
+
+    Contexts (and results) must be picklable when using processes. The pool
+    is created on first use and kept until close(), so use it as a context
+    manager or reuse it across batches.
+    """
+
+    _node: EvalisNode
+    _options: EvaluatorOptions
+    _executor: Executor | None
+
+    def __init__(
+        self,
+        node: EvalisNode,
+        options: EvaluatorOptions = EvaluatorOptions(),
+        max_workers: int | None = None,
+        use_threads: bool | None = None,
+        chunksize: int | None = None,
+    ):
+        if chunksize is not None and chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+
+        self._node = node
+        self._options = options
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._use_threads = (
+            not _is_gil_enabled() if use_threads is None else use_threads
+        )
+        self._chunksize = chunksize
+        self._executor = None
+        self._compiled = compile_ast(node, options) if self._use_threads else None
+
+    @property
+    def uses_threads(self) -> bool:
+        return self._use_threads
+
+    def evaluate_many(
+        self,
+        contexts: Iterable[dict[str, Any]],
+        on_error: ErrorPolicy = ErrorPolicy.RAISE,
+        lazy: bool = False,
+    ) -> list[Any] | Iterator[Any]:
+        """Evaluate the expression against every context, in parallel.
+
+        Results come back in the same order as contexts. on_error works like
+        in evaluate_many; with RAISE the first failing context (in order)
+        raises. If lazy is True an iterator over the results is returned; the
+        work is still submitted up front.
+        """
+        chunks = _chunk(contexts, self._chunksize_for(contexts))
+        executor = self._get_executor()
+
+        if self._use_threads:
+            compiled = self._compiled
+            assert compiled is not None
+            results = executor.map(
+                lambda chunk: list(iter_results(compiled, chunk, on_error)), chunks
+            )
+        else:
+            results = executor.map(_evaluate_chunk, chunks, repeat(on_error))
+
+        flat = chain.from_iterable(results)
+        return flat if lazy else list(flat)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "ParallelEvaluator":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._use_threads:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+            else:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    initializer=_init_worker,
+                    initargs=(self._node, self._options),
+                )
+
+        return self._executor
+
+    def _chunksize_for(self, contexts: Iterable[Any]) -> int:
+        if self._chunksize is not None:
+            return self._chunksize
+        if not isinstance(contexts, Sequence):
+            return DEFAULT_CHUNKSIZE
+
+        # About 4 chunks per worker balances load without too much overhead
+        chunksize = -(-len(contexts) // (self._max_workers * 4))
+        return max(1, min(chunksize, DEFAULT_CHUNKSIZE * 16))
+
+
+def _chunk(contexts: Iterable[Any], chunksize: int) -> Iterator[list[Any]]:
+    iterator = iter(contexts)
+    while chunk := list(islice(iterator, chunksize)):
+        yield chunk
@@ -0,0 +1,351 @@
+"""A hand-written parser for the Evalis grammar that does not need ANTLR.
+
+This mirrors grammar/Evalis.g4 with precedence climbing and produces the same
+EvalisNode trees as antlr4_adapter + ast.AstBuilder. Syntax errors are reported
+at the same line/column as ANTLR, using ANTLR's message format.
+"""
+
+import re
+import sys
+from typing import NamedTuple
+
+from evalis.types import (
+    BinaryOpNode,
+    BinaryOpType,
+    EvalisNode,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    SyntaxMessage,
+    UnaryOpNode,
+    UnaryOpType,
+)
+from evalis.utils import unescape_string_literal
+
+
+# region: lexer ---------------------------------------------------------------
+KIND_EOF = "<EOF>"
+KIND_IDENTIFIER = "IDENTIFIER"
+KIND_INT = "INT"
+KIND_FLOAT = "FLOAT"
+KIND_STRING = "STRING"
+
+KEYWORDS = frozenset(("not", "and", "or", "null", "true", "false", "in", "for"))
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<WS>[\ \t\r\n]+)
+    | (?P<FLOAT>[0-9]+\.[0-9]+)
+    | (?P<INT>[0-9]+)
+    | (?P<IDENTIFIER>[a-zA-Z_][a-zA-Z0-9_]*)
+    | (?P<STRING>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+    | (?P<PUNCT><=|>=|==|!=|[-+*/<>()\[\].])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+    pos: int
+
+
+class _SyntaxError(Exception):
+    def __init__(self, pos: int, message: str):
+        super().__init__(message)
+        self.pos = pos
+        self.message = message
+
+
+def tokenize(expression: str) -> list[Token]:
+    tokens: list[Token] = []
+    pos = 0
+    end = len(expression)
+    match = _TOKEN_RE.match
+
+    while pos < end:
+        m = match(expression, pos)
+        if m is None:
+            raise _SyntaxError(pos, f"token recognition error at: '{expression[pos]}'")
+
+        kind = m.lastgroup
+        text = m.group()
+
+        if kind == "IDENTIFIER":
+            tokens.append(
+                Token(text if text in KEYWORDS else KIND_IDENTIFIER, text, pos)
+            )
+        elif kind == "PUNCT":
+            tokens.append(Token(text, text, pos))
+        elif kind != "WS":
+            tokens.append(Token(str(kind), text, pos))
+
+        pos = m.end()
+
+    tokens.append(Token(KIND_EOF, "<EOF>", end))
+    return tokens
+
+
+# region: parser --------------------------------------------------------------
+# Higher binds tighter. Matches the order of the alternatives in Evalis.g4.
+BINARY_PRECEDENCE = {
+    "or": 1,
+    "and": 2,
+    "in": 3,
+    "==": 4,
+    "!=": 4,
+    "<": 5,
+    "<=": 5,
+    ">": 5,
+    ">=": 5,
+    "+": 6,
+    "-": 6,
+    "*": 7,
+    "/": 7,
+}
+
+_BINARY_OP_TYPES = {text: BinaryOpType(text) for text in BINARY_PRECEDENCE}
+
+_EXPR_START = frozenset(
+    (
+        "not",
+        "(",
+        "[",
+        "null",
+        "true",
+        "false",
+        KIND_IDENTIFIER,
+        KIND_INT,
+        KIND_FLOAT,
+        KIND_STRING,
+    )
+)
+
+_BINARY_OPS = frozenset(BINARY_PRECEDENCE)
+_SUFFIX_START = frozenset((".", "["))
+
+_EXPR_START_DISPLAY = (
+    "{'not', '(', '[', 'null', 'true', 'false', IDENTIFIER, INT, FLOAT, STRING}"
+)
+
+
+def _display_kind(kind: str) -> str:
+    if kind in (KIND_EOF, KIND_IDENTIFIER, KIND_INT, KIND_FLOAT, KIND_STRING):
+        return kind
+    return f"'{kind}'"
+
+
+class Parser:
+    _tokens: list[Token]
+    _index: int
+    # Tokens that close the constructs we are currently nested in, innermost
+    # last. Used to report "missing" tokens the same way ANTLR does.
+    _closers: list[str]
+
+    def __init__(self, tokens: list[Token]):
+        self._tokens = tokens
+        self._index = 0
+        self._closers = [KIND_EOF]
+
+    def parse(self) -> EvalisNode:
+        node = self._parse_expr(0)
+        self._match(KIND_EOF, frozenset())
+        return node
+
+    def _peek(self, offset: int = 0) -> Token:
+        index = min(self._index + offset, len(self._tokens) - 1)
+        return self._tokens[index]
+
+    def _advance(self) -> Token:
+        token = self._tokens[self._index]
+        self._index += 1
+        return token
+
+    def _expr_follow(self, can_have_suffix: bool = False) -> frozenset[str]:
+        """Tokens that may follow an atom that ends the current position."""
+        follow = _BINARY_OPS | {self._closers[-1]}
+        return follow | _SUFFIX_START if can_have_suffix else follow
+
+    def _match(self, kind: str, follow: frozenset[str]) -> Token:
+        token = self._peek()
+        if token.kind == kind:
+            return self._advance()
+
+        expected = _display_kind(kind)
+
+        if self._peek(1).kind == kind:
+            raise _SyntaxError(
+                token.pos, f"extraneous input '{token.text}' expecting {expected}"
+            )
+        if token.kind in follow:
+            raise _SyntaxError(token.pos, f"missing {expected} at '{token.text}'")
+
+        raise _SyntaxError(
+            token.pos, f"mismatched input '{token.text}' expecting {expected}"
+        )
+
+    def _parse_expr(self, min_precedence: int) -> EvalisNode:
+        left = self._parse_unary()
+
+        while True:
+            kind = self._peek().kind
+            precedence = BINARY_PRECEDENCE.get(kind)
+            if precedence is None or precedence < min_precedence:
+                return left
+
+            self._advance()
+            right = self._parse_expr(precedence + 1)
+            left = BinaryOpNode(op=_BINARY_OP_TYPES[kind], left=left, right=right)
+
+    def _parse_unary(self) -> EvalisNode:
+        if self._peek().kind == "not":
+            self._advance()
+            return UnaryOpNode(op=UnaryOpType.NOT, expr=self._parse_unary())
+
+        return self._parse_atom()
+
+    def _parse_atom(self) -> EvalisNode:
+        token = self._peek()
+        kind = token.kind
+
+        if kind == KIND_IDENTIFIER:
+            self._advance()
+            return self._parse_reference(sys.intern(token.text))
+        if kind == KIND_INT:
+            self._advance()
+            return LiteralNode(int(token.text))
+        if kind == KIND_FLOAT:
+            self._advance()
+            return LiteralNode(float(token.text))
+        if kind == KIND_STRING:
+            self._advance()
+            return LiteralNode(unescape_string_literal(token.text))
+        if kind == "true" or kind == "false":
+            self._advance()
+            return LiteralNode(kind == "true")
+        if kind == "null":
+            self._advance()
+            return LiteralNode(None)
+        if kind == "(":
+            self._advance()
+            self._closers.append(")")
+            node = self._parse_expr(0)
+            self._closers.pop()
+            self._match(")", self._expr_follow())
+            return node
+        if kind == "[":
+            self._advance()
+            return self._parse_list_comprehension()
+
+        if self._peek(1).kind in _EXPR_START:
+            raise _SyntaxError(
+                token.pos,
+                f"extraneous input '{token.text}' expecting {_EXPR_START_DISPLAY}",
+            )
+        raise _SyntaxError(
+            token.pos,
+            f"mismatched input '{token.text}' expecting {_EXPR_START_DISPLAY}",
+        )
+
+    def _parse_reference(self, root: str) -> EvalisNode:
+        parts: list[EvalisNode] = []
+
+        while True:
+            kind = self._peek().kind
+
+            if kind == ".":
+                self._advance()
+                identifier = self._match(KIND_IDENTIFIER, self._expr_follow(True))
+                parts.append(LiteralNode(sys.intern(identifier.text)))
+            elif kind == "[":
+                self._advance()
+                self._closers.append("]")
+                parts.append(self._parse_expr(0))
+                self._closers.pop()
+                self._match("]", self._expr_follow(True))
+            else:
+                return ReferenceNode(root=root, children=tuple(parts))
+
+    def _parse_list_comprehension(self) -> EvalisNode:
+        self._closers.append("for")
+        element_expr = self._parse_expr(0)
+        self._closers[-1] = "]"
+        self._match("for", frozenset((KIND_IDENTIFIER,)))
+        variable_name = sys.intern(
+            self._match(KIND_IDENTIFIER, frozenset(("in",))).text
+        )
+        self._match("in", _EXPR_START)
+        iterable_expr = self._parse_expr(0)
+        self._closers.pop()
+        self._match("]", self._expr_follow())
+
+        return ListComprehensionNode(
+            element_expr=element_expr,
+            variable_name=variable_name,
+            iterable_expr=iterable_expr,
+        )
+
+
+class SpanParser(Parser):
+    """A Parser that also records where each node is in the expression.
+
+    Parsing is slower than with Parser, so this is only used where positions
+    are needed, e.g. to report type errors (see evalis.typecheck).
+    """
+
+    # id(node) -> (start, end) offsets of atoms and `not` nodes; the spans of
+    # binary nodes follow from their operands
+    _spans: dict[int, tuple[int, int]]
+
+    def __init__(self, tokens: list[Token]):
+        super().__init__(tokens)
+        self._spans = {}
+
+    def get_span(self, node: EvalisNode) -> tuple[int, int] | None:
+        """Return the (start, end) offsets of node, if this parser built it."""
+        span = self._spans.get(id(node))
+        if span is None and isinstance(node, BinaryOpNode):
+            left = self.get_span(node.left)
+            right = self.get_span(node.right)
+            if left is not None and right is not None:
+                span = (left[0], right[1])
+
+        return span
+
+    def _parse_unary(self) -> EvalisNode:
+        start = self._peek().pos
+        node = super()._parse_unary()
+        end = self._tokens[self._index - 1]
+        # Atoms in parentheses keep the span without the parentheses
+        self._spans.setdefault(id(node), (start, end.pos + len(end.text)))
+
+        return node
+
+
+def get_line_column(expression: str, pos: int) -> tuple[int, int]:
+    """Return the 1-based line and 0-based column of an offset, like ANTLR."""
+    line = expression.count("\n", 0, pos) + 1
+    column = pos - (expression.rfind("\n", 0, pos) + 1)
+    return line, column
+
+
+def _to_syntax_message(expression: str, error: _SyntaxError) -> SyntaxMessage:
+    line, column = get_line_column(expression, error.pos)
+    return SyntaxMessage(line=line, column=column, message=error.message)
+
+
+def parse_expression(
+    expression: str,
+) -> tuple[EvalisNode | None, tuple[SyntaxMessage, ...]]:
+    """Parse expression and return (ast, errors).
+
+    Returns:
+        (ast, errors) where:
+        - ast is the EvalisNode if successful, None otherwise
+        - errors is tuple of SyntaxMessages if any, empty tuple otherwise
+    """
+    try:
+        return (Parser(tokenize(expression)).parse(), ())
+    except _SyntaxError as e:
+        return (None, (_to_syntax_message(expression, e),))
@@ -0,0 +1,207 @@
+"""Per-node profiling of evaluations.
+
+Pass a Profiler in EvaluatorOptions(profiler=...) and evaluations run on a
+ProfilingEvaluator, which records call counts, time and result types for every
+AST node it evaluates. Without a profiler the plain Evaluator runs, so
+profiling costs nothing when it is off.
+"""
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Iterator, Mapping
+
+from evalis.eval import Evaluator
+from evalis.types import (
+    BinaryOpNode,
+    EvalisNode,
+    EvaluatorOptions,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    UnaryOpNode,
+)
+from evalis.unparse import format_ast
+
+
+@dataclass(frozen=True)
+class NodeProfile:
+    node: EvalisNode
+    # format_ast(node), since nodes don't keep their position in the source
+    source: str
+    # Nesting level below the root node of the expression
+    depth: int
+    calls: int
+    errors: int
+    # Seconds spent evaluating the node, with and without its children
+    total_time: float
+    self_time: float
+    # Type name of each result -> number of results of that type
+    result_types: Mapping[str, int]
+
+
+@dataclass(frozen=True)
+class ProfileReport:
+    """Profiles of every node of the profiled expressions, in source order.
+
+    Nodes that were never evaluated (e.g. the right side of a short-circuited
+    `and`) are included with calls=0.
+    """
+
+    nodes: tuple[NodeProfile, ...]
+
+    def for_node(self, node: EvalisNode) -> NodeProfile | None:
+        """Return the profile of this node object (not of an equal node)."""
+        for profile in self.nodes:
+            if profile.node is node:
+                return profile
+
+        return None
+
+    def slowest(self, count: int = 10) -> list[NodeProfile]:
+        """Return the nodes with the highest self time first."""
+        return sorted(self.nodes, key=lambda profile: -profile.self_time)[:count]
+
+    def format(self) -> str:
+        """Return the report as a table with one indented line per node."""
+        lines = [f"{'calls':>8} {'total ms':>10} {'self ms':>10}  expression"]
+        for profile in self.nodes:
+            lines.append(
+                f"{profile.calls:>8} {profile.total_time * 1000:>10.3f} "
+                f"{profile.self_time * 1000:>10.3f}  "
+                f"{'  ' * profile.depth}{profile.source}"
+            )
+
+        return "\n".join(lines)
+
+
+class _NodeStats:
+    __slots__ = ("node", "calls", "errors", "total_time", "result_types")
+
+    def __init__(self, node: Any):
+        self.node = node
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.result_types: dict[str, int] = {}
+
+
+class Profiler:
+    """Collects node statistics across any number of evaluations.
+
+    Statistics are kept per node object, so interned or shared subtrees are
+    profiled together. A Profiler is not thread-safe, and evaluations in other
+    processes (e.g. ParallelEvaluator) aren't recorded.
+    """
+
+    _stats: dict[int, _NodeStats]
+
+    def __init__(self):
+        self._stats = {}
+
+    def reset(self) -> None:
+        self._stats = {}
+
+    def report(self) -> ProfileReport:
+        stats = self._stats
+        children = {
+            id(child) for entry in stats.values() for child in _children(entry.node)
+        }
+        roots = [entry.node for key, entry in stats.items() if key not in children]
+
+        nodes: list[NodeProfile] = []
+        for root in roots:
+            nodes.extend(self._profile_tree(root, 0))
+
+        return ProfileReport(tuple(nodes))
+
+    def _profile_tree(self, node: Any, depth: int) -> Iterator[NodeProfile]:
+        entry = self._stats.get(id(node))
+        children = _children(node)
+        children_time = sum(
+            child_entry.total_time
+            for child_entry in (self._stats.get(id(child)) for child in children)
+            if child_entry is not None
+        )
+
+        if entry is None:
+            yield NodeProfile(node, format_ast(node), depth, 0, 0, 0.0, 0.0, {})
+        else:
+            yield NodeProfile(
+                node=node,
+                source=format_ast(node),
+                depth=depth,
+                calls=entry.calls,
+                errors=entry.errors,
+                total_time=entry.total_time,
+                self_time=max(entry.total_time - children_time, 0.0),
+                result_types=dict(entry.result_types),
+            )
+
+        for child in children:
+            yield from self._profile_tree(child, depth + 1)
+
+    def _get_stats(self, node: Any) -> _NodeStats:
+        entry = self._stats.get(id(node))
+        if entry is None:
+            # Keeping the node alive also keeps its id from being reused
+            entry = self._stats[id(node)] = _NodeStats(node)
+
+        return entry
+
+
+def _children(node: Any) -> tuple[Any, ...]:
+    """The child nodes that the Evaluator evaluates."""
+    if isinstance(node, BinaryOpNode):
+        return (node.left, node.right)
+    if isinstance(node, UnaryOpNode):
+        return (node.expr,)
+    if isinstance(node, ReferenceNode):
+        # Literal children are read directly, not evaluated
+        return tuple(
+            child for child in node.children if not isinstance(child, LiteralNode)
+        )
+    if isinstance(node, ListComprehensionNode):
+        return (node.iterable_expr, node.element_expr)
+
+    return ()
+
+
+class ProfilingEvaluator(Evaluator):
+    """An Evaluator that records every node it evaluates in a Profiler."""
+
+    _profiler: Profiler
+    # Evaluate every node as written, so the report matches the AST
+    _should_hoist_invariants = False
+
+    def __init__(self, options: EvaluatorOptions):
+        if options.profiler is None:
+            raise ValueError("ProfilingEvaluator requires EvaluatorOptions.profiler")
+
+        super().__init__(options)
+        self._profiler = options.profiler
+
+    def evaluate(self, node: Any, context: Any) -> Any:
+        entry = self._profiler._get_stats(node)
+        entry.calls += 1
+        start = perf_counter()
+
+        try:
+            result = super().evaluate(node, context)
+        except BaseException:
+            entry.errors += 1
+            raise
+        finally:
+            entry.total_time += perf_counter() - start
+
+        type_name = type(result).__name__
+        entry.result_types[type_name] = entry.result_types.get(type_name, 0) + 1
+
+        return result
+
+
+def create_evaluator(options: EvaluatorOptions) -> Evaluator:
+    """Return a ProfilingEvaluator if options has a profiler, else an Evaluator."""
+    if options.profiler is None:
+        return Evaluator(options)
+
+    return ProfilingEvaluator(options)
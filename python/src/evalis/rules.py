@@ -0,0 +1,204 @@
+from contextvars import ContextVar
+from typing import Any, Mapping
+
+from evalis.compiler import CompiledNode, Compiler
+from evalis.error import as_evalis_error
+from evalis.intern import NodeInterner
+from evalis.optimize import optimize_ast
+from evalis.types import (
+    BinaryOpNode,
+    ErrorPolicy,
+    EvalisNode,
+    EvaluatorOptions,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    UnaryOpNode,
+)
+
+# Values of shared subexpressions for the RuleSet.evaluate call in progress
+_memo: ContextVar[dict[int, Any]] = ContextVar("evalis_rule_set_memo")
+
+_MISSING = object()
+
+
+class _Failure:
+    """A memoized subexpression that raised, so it raises again when reused."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class RuleSet:
+    """Evaluates many named expressions against one context in a single pass.
+
+    Structurally equal subexpressions are merged across all rules into one
+    DAG, and every merged subexpression used more than once (e.g.
+    `user.tier == "gold"` or `order.total`) is evaluated at most once per
+    context. Results are identical to evaluating each rule on its own.
+
+    Subexpressions inside list comprehension elements are never shared, since
+    they may depend on the comprehension variable.
+    """
+
+    _options: EvaluatorOptions
+    _rules: dict[str, EvalisNode]
+    _fns: tuple[tuple[str, CompiledNode], ...]
+    _shared_count: int
+
+    def __init__(
+        self,
+        rules: Mapping[str, EvalisNode],
+        options: EvaluatorOptions = EvaluatorOptions(),
+    ):
+        self._options = options
+
+        interner = NodeInterner()
+        self._rules = {
+            name: interner.intern(optimize_ast(node, options))
+            for name, node in rules.items()
+        }
+
+        shared = _find_shared_nodes(self._rules.values())
+        self._shared_count = len(shared)
+
+        compiler = _SharingCompiler(options, shared)
+        self._fns = tuple(
+            (name, compiler.compile_root(node)) for name, node in self._rules.items()
+        )
+
+    @property
+    def options(self) -> EvaluatorOptions:
+        return self._options
+
+    @property
+    def rules(self) -> Mapping[str, EvalisNode]:
+        """The rules' ASTs, after optimizing and merging equal subtrees."""
+        return self._rules
+
+    @property
+    def shared_count(self) -> int:
+        """How many subexpressions are shared (and memoized) between uses."""
+        return self._shared_count
+
+    def __len__(self) -> int:
+        return len(self._fns)
+
+    def evaluate(
+        self,
+        context: dict[str, Any] = {},
+        on_error: ErrorPolicy = ErrorPolicy.RAISE,
+    ) -> dict[str, Any]:
+        """Evaluate every rule against context and return results by name.
+
+        on_error decides what happens when a rule fails: raise (default), put
+        the EvalisError in its slot (COLLECT) or put None (NULL).
+        """
+        token = _memo.set({})
+
+        try:
+            if on_error == ErrorPolicy.RAISE:
+                return {name: fn(context) for name, fn in self._fns}
+
+            should_collect = on_error == ErrorPolicy.COLLECT
+            results = {}
+
+            for name, fn in self._fns:
+                try:
+                    results[name] = fn(context)
+                except Exception as e:
+                    results[name] = as_evalis_error(e) if should_collect else None
+
+            return results
+        finally:
+            _memo.reset(token)
+
+
+class _SharingCompiler(Compiler):
+    """A Compiler that memoizes the shared nodes of a RuleSet per evaluation."""
+
+    def __init__(self, options: EvaluatorOptions, shared: dict[int, int]):
+        super().__init__(options)
+        self._shared = shared
+        self._compiled: dict[int, CompiledNode] = {}
+        self._element_depth = 0
+
+    def compile(self, node: Any) -> CompiledNode:
+        index = self._shared.get(id(node))
+        if index is None or self._element_depth > 0:
+            return super().compile(node)
+
+        fn = self._compiled.get(index)
+        if fn is None:
+            fn = _memoize(index, super().compile(node))
+            self._compiled[index] = fn
+
+        return fn
+
+    def _compile_element(self, node: ListComprehensionNode) -> CompiledNode:
+        self._element_depth += 1
+        try:
+            return super()._compile_element(node)
+        finally:
+            self._element_depth -= 1
+
+
+def _memoize(index: int, fn: CompiledNode) -> CompiledNode:
+    def shared(context: Any) -> Any:
+        memo = _memo.get()
+        value = memo.get(index, _MISSING)
+
+        if value is _MISSING:
+            try:
+                value = fn(context)
+            except Exception as e:
+                memo[index] = _Failure(e)
+                raise
+
+            memo[index] = value
+        elif type(value) is _Failure:
+            raise value.error
+
+        return value
+
+    return shared
+
+
+def _find_shared_nodes(roots: Any) -> dict[int, int]:
+    """Return {id(node): index} for canonical nodes evaluated more than once.
+
+    A shared node's children are only counted once, since the memoized node is
+    the only thing that evaluates them. Nodes inside comprehension elements
+    aren't counted, and neither are nodes cheaper than a memo lookup.
+    """
+    seen: set[int] = set()
+    shared: dict[int, int] = {}
+
+    def visit(node: Any) -> None:
+        if isinstance(node, LiteralNode):
+            return
+        if isinstance(node, ReferenceNode) and not node.children:
+            return
+
+        if id(node) in seen:
+            shared.setdefault(id(node), len(shared))
+            return
+        seen.add(id(node))
+
+        if isinstance(node, BinaryOpNode):
+            visit(node.left)
+            visit(node.right)
+        elif isinstance(node, UnaryOpNode):
+            visit(node.expr)
+        elif isinstance(node, ReferenceNode):
+            for child in node.children:
+                visit(child)
+        elif isinstance(node, ListComprehensionNode):
+            visit(node.iterable_expr)
+
+    for root in roots:
+        visit(root)
+
+    return shared
@@ -0,0 +1,197 @@
+"""Declaring the shape of contexts.
+
+A ContextSchema says which types the values at context paths can have. It is
+written as a dict of paths to types, or derived from a dataclass or TypedDict
+describing the context. evalis.typecheck checks expressions against it, and
+its type_hints let compile skip runtime type checks (see evalis.specialize).
+"""
+
+import dataclasses
+import typing
+from types import NoneType, UnionType
+from typing import Any, Collection, Literal, Mapping
+
+from evalis.analysis import EACH, ReferencePath
+from evalis.specialize import TypeHints, as_context_path
+
+# A context path as a tuple: (root, *keys), where EACH stands for every item
+# of a list
+type _Path = tuple[Any, ...]
+
+
+class ContextSchema:
+    """The possible types of the values in a context, by path.
+
+    Types are written like annotations: `int`, `str | None`, `list[Item]`,
+    `Literal["a", "b"]`, or a nested dataclass or TypedDict, whose fields are
+    added below its path. `list[X]` adds X for the items of the list, at the
+    path with an EACH key. Paths that aren't declared, and `Any`, are unknown
+    and never checked.
+
+    Declared values are assumed to be present. Use `X | None` for values that
+    may be missing or null; everything below an optional value may be null too,
+    except the items of an optional list.
+    """
+
+    _types: dict[_Path, frozenset[type]]
+    # Paths whose value, and every value on the way to it, can't be None
+    _required: set[_Path]
+    # For values that may be None: the paths (the value's own, or those of
+    # the values on the way to it) whose value being None makes it None
+    _null_sources: dict[_Path, frozenset[_Path]]
+
+    def __init__(self, types: Mapping[str | tuple[Any, ...] | ReferencePath, Any]):
+        self._types = {}
+        self._required = set()
+        self._null_sources = {}
+
+        for path, annotation in types.items():
+            self._add(as_context_path(path), annotation, frozenset())
+
+    @classmethod
+    def from_type(cls, context_type: type) -> "ContextSchema":
+        """Derive a schema from a dataclass or TypedDict describing a context."""
+        if not _is_record_type(context_type):
+            raise ValueError(f"Expected a dataclass or TypedDict, got {context_type!r}")
+
+        schema = cls({})
+        for name, annotation, is_optional in _get_fields(context_type):
+            schema._add((name,), annotation, _sources((name,), is_optional))
+
+        return schema
+
+    def get(
+        self,
+        path: str | tuple[Any, ...] | ReferencePath,
+        non_null: Collection[_Path] = (),
+    ) -> frozenset[type] | None:
+        """Return the possible types of the value at path, or None if unknown.
+
+        non_null are paths (as tuples) known not to be None, e.g. because an
+        `and` checked them. NoneType is left out if they are the only reasons
+        for the value to be None.
+        """
+        path = as_context_path(path)
+        types = self._types.get(path)
+        if types is None or NoneType not in types or not non_null:
+            return types
+
+        # Reading a value that isn't None means the ones on the way to it
+        # weren't None either
+        known = {
+            known_path[:i]
+            for known_path in non_null
+            for i in range(1, len(known_path) + 1)
+        }
+        if self._null_sources[path] <= known:
+            return types - {NoneType}
+        return types
+
+    @property
+    def type_hints(self) -> TypeHints:
+        """The paths whose value always has one known type, for compile."""
+        hints: dict[str | tuple[Any, ...] | ReferencePath, type] = {}
+        for path in self._required:
+            (hint,) = self._types[path]
+            hints[path] = hint
+
+        return hints
+
+    def _add(
+        self, path: _Path, annotation: Any, null_sources: frozenset[_Path]
+    ) -> None:
+        found = self._add_types(path, annotation, null_sources)
+        if found is None:
+            return
+
+        found_types, null_sources = found
+        if null_sources:
+            found_types = found_types | {NoneType}
+
+        existing = self._types.get(path)
+        if existing is None and len(found_types) == 1 and not null_sources:
+            self._required.add(path)
+        else:
+            self._required.discard(path)
+
+        self._types[path] = found_types if existing is None else existing | found_types
+        self._null_sources[path] = (
+            self._null_sources.get(path, frozenset()) | null_sources
+        )
+
+    def _add_types(
+        self, path: _Path, annotation: Any, null_sources: frozenset[_Path]
+    ) -> tuple[frozenset[type], frozenset[_Path]] | None:
+        """Add the paths below path; return (types at path, null sources)."""
+        if annotation is Any:
+            return None
+        if annotation is None or annotation is NoneType:
+            return frozenset((NoneType,)), null_sources | {path}
+
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+
+        if origin is typing.Union or origin is UnionType:
+            members = [arg for arg in args if arg is not NoneType]
+            null_sources |= _sources(path, len(members) < len(args))
+
+            found_types: set[type] = set()
+            for member in members:
+                found = self._add_types(path, member, null_sources)
+                if found is None:
+                    return None
+                found_types |= found[0]
+                null_sources |= found[1]
+
+            return frozenset(found_types), null_sources
+        if origin is typing.Annotated:
+            return self._add_types(path, args[0], null_sources)
+        if origin is Literal:
+            types = frozenset(type(arg) for arg in args)
+            return types, null_sources | _sources(path, NoneType in types)
+        if origin is list:
+            # A null list has no items, so they aren't optional because it is
+            if args:
+                self._add((*path, EACH), args[0], frozenset())
+            return frozenset((list,)), null_sources
+        if origin is not None:
+            return frozenset((origin,)), null_sources
+
+        if _is_record_type(annotation):
+            for name, field, is_field_optional in _get_fields(annotation):
+                field_path = (*path, name)
+                field_sources = null_sources | _sources(field_path, is_field_optional)
+                self._add(field_path, field, field_sources)
+
+            is_typeddict = typing.is_typeddict(annotation)
+            return frozenset((dict if is_typeddict else annotation,)), null_sources
+        if isinstance(annotation, type):
+            return frozenset((annotation,)), null_sources
+
+        raise ValueError(f"Unsupported type in schema at {path!r}: {annotation!r}")
+
+
+def _sources(path: _Path, is_optional: bool) -> frozenset[_Path]:
+    return frozenset((path,)) if is_optional else frozenset()
+
+
+def _is_record_type(annotation: Any) -> bool:
+    return isinstance(annotation, type) and (
+        dataclasses.is_dataclass(annotation) or typing.is_typeddict(annotation)
+    )
+
+
+def _get_fields(record_type: type) -> list[tuple[str, Any, bool]]:
+    """Return (name, annotation, is_optional) for each field of record_type."""
+    annotations = typing.get_type_hints(record_type)
+
+    if typing.is_typeddict(record_type):
+        required = getattr(record_type, "__required_keys__")
+        return [
+            (name, hint, name not in required) for name, hint in annotations.items()
+        ]
+
+    return [
+        (field.name, annotations[field.name], False)
+        for field in dataclasses.fields(record_type)
+    ]
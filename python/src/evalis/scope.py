@@ -0,0 +1,45 @@
+from typing import Any
+
+
+class Scope:
+    """A context with one extra name bound on top of a parent context.
+
+    List comprehensions bind their variable with a Scope instead of copying the
+    whole context for every item. A comprehension creates one Scope and
+    rebinds `value` for each item; nested comprehensions chain Scopes, and the
+    innermost binding of a name wins.
+
+    Lookups that miss every frame fall through to the root context, so they
+    fail exactly like they would on the root context itself.
+    """
+
+    __slots__ = ("parent", "name", "value")
+
+    parent: Any
+    name: str
+    value: Any
+
+    def __init__(self, parent: Any, name: str, value: Any = None):
+        self.parent = parent
+        self.name = name
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"Scope({self.name}={self.value!r}, parent={self.parent!r})"
+
+
+class MemoScope(Scope):
+    """A Scope that also holds the values of its loop's hoisted subtrees.
+
+    See evalis.hoisting. The memo lives as long as one run of the loop, so
+    values are shared between the items of a loop but never across loops.
+    """
+
+    __slots__ = ("memo",)
+
+    # HoistedNode -> value
+    memo: dict[Any, Any]
+
+    def __init__(self, parent: Any, name: str, value: Any = None):
+        super().__init__(parent, name, value)
+        self.memo = {}
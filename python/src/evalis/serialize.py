@@ -0,0 +1,484 @@
+"""Binary and JSON serialization of ASTs, so rules can be loaded without parsing.
+
+Both formats are tagged with EXPRESSION_VERSION and refuse to load ASTs
+written for a different version.
+
+The binary format is:
+
+    b"EVLS" | format version (u8) | expression version (str)
+    string table: count (u32), then strings
+    index: count (u32), then per AST: name (string index), offset, size (u32)
+    ASTs: one node stream per AST, at offset from the start of this section
+
+Strings are a varint byte length followed by UTF-8. Each AST is encoded on its
+own, pre-order, so any one of them can be decoded straight from the buffer
+(e.g. an mmap) without touching the others. Nodes that appear more than once
+in an AST (see NodeInterner) are written once and referenced afterwards.
+"""
+
+import json
+import struct
+import sys
+from typing import Any, Iterator, Mapping
+
+from evalis.constants import EXPRESSION_VERSION
+from evalis.intern import NodeInterner
+from evalis.types import (
+    BinaryOpNode,
+    BinaryOpType,
+    EvalisNode,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    UnaryOpNode,
+    UnaryOpType,
+)
+
+MAGIC = b"EVLS"
+FORMAT_VERSION = 1
+
+# region: node tags -----------------------------------------------------------
+_TAG_NULL = 0
+_TAG_TRUE = 1
+_TAG_FALSE = 2
+_TAG_INT = 3
+_TAG_BIG_INT = 4
+_TAG_FLOAT = 5
+_TAG_STRING = 6
+_TAG_TUPLE = 7
+_TAG_BINARY = 8
+_TAG_UNARY = 9
+_TAG_REFERENCE = 10
+_TAG_LIST_COMPREHENSION = 11
+_TAG_BACKREF = 12
+_TAG_LIST = 13
+
+# Part of the format: only ever append to these
+_BINARY_OPS = (
+    BinaryOpType.ADD,
+    BinaryOpType.SUBTRACT,
+    BinaryOpType.MULTIPLY,
+    BinaryOpType.DIVIDE,
+    BinaryOpType.EQUALS,
+    BinaryOpType.NOT_EQUALS,
+    BinaryOpType.LT,
+    BinaryOpType.LTE,
+    BinaryOpType.GT,
+    BinaryOpType.GTE,
+    BinaryOpType.AND,
+    BinaryOpType.OR,
+    BinaryOpType.IN,
+)
+_UNARY_OPS = (UnaryOpType.NOT,)
+
+_BINARY_OP_CODES = {op: code for code, op in enumerate(_BINARY_OPS)}
+_UNARY_OP_CODES = {op: code for code, op in enumerate(_UNARY_OPS)}
+
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+
+# region: binary encoding -----------------------------------------------------
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings: dict[str, int] = {}
+
+    def string(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def encode(self, node: EvalisNode) -> bytes:
+        out = bytearray()
+        self._emitted: dict[int, int] = {}
+        self._node(out, node)
+        return bytes(out)
+
+    def _node(self, out: bytearray, node: Any) -> None:
+        index = self._emitted.get(id(node))
+        if index is not None:
+            out.append(_TAG_BACKREF)
+            _write_varint(out, index)
+            return
+
+        if isinstance(node, LiteralNode):
+            self._literal(out, node.value)
+        elif isinstance(node, BinaryOpNode):
+            out.append(_TAG_BINARY)
+            out.append(_BINARY_OP_CODES[node.op])
+            self._node(out, node.left)
+            self._node(out, node.right)
+        elif isinstance(node, UnaryOpNode):
+            out.append(_TAG_UNARY)
+            out.append(_UNARY_OP_CODES[node.op])
+            self._node(out, node.expr)
+        elif isinstance(node, ReferenceNode):
+            out.append(_TAG_REFERENCE)
+            _write_varint(out, self.string(node.root))
+            _write_varint(out, len(node.children))
+            for child in node.children:
+                self._node(out, child)
+        elif isinstance(node, ListComprehensionNode):
+            out.append(_TAG_LIST_COMPREHENSION)
+            _write_varint(out, self.string(node.variable_name))
+            self._node(out, node.element_expr)
+            self._node(out, node.iterable_expr)
+        else:
+            raise ValueError(f"Unexpected node type found: {node}")
+
+        # Numbered in the order nodes are completed, which loading mirrors
+        self._emitted[id(node)] = len(self._emitted)
+
+    def _literal(self, out: bytearray, value: Any) -> None:
+        if value is None:
+            out.append(_TAG_NULL)
+        elif value is True:
+            out.append(_TAG_TRUE)
+        elif value is False:
+            out.append(_TAG_FALSE)
+        elif type(value) is int:
+            if -(2**63) <= value < 2**63:
+                out.append(_TAG_INT)
+                out += _I64.pack(value)
+            else:
+                out.append(_TAG_BIG_INT)
+                _write_varint(out, self.string(str(value)))
+        elif type(value) is float:
+            out.append(_TAG_FLOAT)
+            out += _F64.pack(value)
+        elif type(value) is str:
+            out.append(_TAG_STRING)
+            _write_varint(out, self.string(value))
+        elif type(value) is list or type(value) is tuple:
+            out.append(_TAG_LIST if type(value) is list else _TAG_TUPLE)
+            _write_varint(out, len(value))
+            for item in value:
+                self._literal(out, item)
+        else:
+            raise ValueError(f"Cannot serialize literal of type {type(value).__name__}")
+
+
+def dumps_all(asts: Mapping[str, EvalisNode]) -> bytes:
+    """Serialize named ASTs (e.g. a rule set) into one binary blob."""
+    encoder = _Encoder()
+    names = [encoder.string(name) for name in asts]
+    bodies = [encoder.encode(node) for node in asts.values()]
+
+    out = bytearray(MAGIC)
+    out.append(FORMAT_VERSION)
+    version = EXPRESSION_VERSION.encode()
+    _write_varint(out, len(version))
+    out += version
+
+    out += _U32.pack(len(encoder.strings))
+    for string in encoder.strings:
+        data = string.encode()
+        _write_varint(out, len(data))
+        out += data
+
+    out += _U32.pack(len(bodies))
+    offset = 0
+    for name, body in zip(names, bodies):
+        _write_varint(out, name)
+        out += _U32.pack(offset)
+        out += _U32.pack(len(body))
+        offset += len(body)
+
+    for body in bodies:
+        out += body
+
+    return bytes(out)
+
+
+def dumps(node: EvalisNode) -> bytes:
+    """Serialize one AST into a binary blob."""
+    return dumps_all({"": node})
+
+
+# region: binary decoding -----------------------------------------------------
+class _Reader:
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: memoryview, pos: int = 0):
+        self.data = data
+        self.pos = pos
+
+    def byte(self) -> int:
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def varint(self) -> int:
+        data = self.data
+        pos = self.pos
+        value = 0
+        shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.pos = pos
+                return value
+            shift += 7
+
+    def u32(self) -> int:
+        (value,) = _U32.unpack_from(self.data, self.pos)
+        self.pos += 4
+        return value
+
+    def string(self) -> str:
+        size = self.varint()
+        start = self.pos
+        end = self.pos = start + size
+        return str(self.data[start:end], "utf-8")
+
+
+class AstArchive(Mapping[str, EvalisNode]):
+    """Read-only mapping of name to AST over a buffer written by dumps_all.
+
+    Only the header, string table and index are read up front; each AST is
+    decoded the first time it is looked up. The buffer can be bytes or
+    anything supporting the buffer protocol, such as an mmap of a file, and
+    must stay open while the archive is used.
+    """
+
+    def __init__(self, data: Any, interner: NodeInterner | None = None):
+        view = memoryview(data)
+        reader = _Reader(view)
+
+        if bytes(view[:4]) != MAGIC:
+            raise ValueError("Not a serialized Evalis AST")
+        reader.pos = 4
+
+        format_version = reader.byte()
+        if format_version != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported serialized AST format {format_version}, "
+                f"expected {FORMAT_VERSION}"
+            )
+
+        expression_version = reader.string()
+        if expression_version != EXPRESSION_VERSION:
+            raise ValueError(
+                f"ASTs were serialized for expression version {expression_version}, "
+                f"but this package supports {EXPRESSION_VERSION}"
+            )
+
+        self._strings = [sys.intern(reader.string()) for _ in range(reader.u32())]
+
+        index = []
+        for _ in range(reader.u32()):
+            name = self._strings[reader.varint()]
+            offset = reader.u32()
+            size = reader.u32()
+            index.append((name, offset, size))
+
+        self._view = view
+        self._body_start = reader.pos
+        self._index = {name: offset for name, offset, _ in index}
+        self._interner = interner
+        self._decoded: dict[str, EvalisNode] = {}
+
+    def __getitem__(self, name: str) -> EvalisNode:
+        node = self._decoded.get(name)
+        if node is None:
+            reader = _Reader(self._view, self._body_start + self._index[name])
+            node = _Decoder(reader, self._strings).node()
+            if self._interner is not None:
+                node = self._interner.intern(node)
+            self._decoded[name] = node
+
+        return node
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class _Decoder:
+    def __init__(self, reader: _Reader, strings: list[str]):
+        self._reader = reader
+        self._strings = strings
+        self._nodes: list[EvalisNode] = []
+
+    def node(self) -> EvalisNode:
+        reader = self._reader
+        tag = reader.byte()
+
+        if tag == _TAG_BACKREF:
+            return self._nodes[reader.varint()]
+
+        node: EvalisNode
+        if tag == _TAG_BINARY:
+            op = _BINARY_OPS[reader.byte()]
+            left = self.node()
+            node = BinaryOpNode(op=op, left=left, right=self.node())
+        elif tag == _TAG_REFERENCE:
+            root = self._strings[reader.varint()]
+            count = reader.varint()
+            node = ReferenceNode(
+                root=root, children=tuple(self.node() for _ in range(count))
+            )
+        elif tag == _TAG_UNARY:
+            op = _UNARY_OPS[reader.byte()]
+            node = UnaryOpNode(op=op, expr=self.node())
+        elif tag == _TAG_LIST_COMPREHENSION:
+            variable_name = self._strings[reader.varint()]
+            element_expr = self.node()
+            node = ListComprehensionNode(
+                element_expr=element_expr,
+                variable_name=variable_name,
+                iterable_expr=self.node(),
+            )
+        else:
+            node = LiteralNode(self._literal(tag))
+
+        self._nodes.append(node)
+        return node
+
+    def _literal(self, tag: int) -> Any:
+        reader = self._reader
+
+        if tag == _TAG_NULL:
+            return None
+        if tag == _TAG_TRUE:
+            return True
+        if tag == _TAG_FALSE:
+            return False
+        if tag == _TAG_INT:
+            (value,) = _I64.unpack_from(reader.data, reader.pos)
+            reader.pos += 8
+            return value
+        if tag == _TAG_FLOAT:
+            (value,) = _F64.unpack_from(reader.data, reader.pos)
+            reader.pos += 8
+            return value
+        if tag == _TAG_STRING:
+            return self._strings[reader.varint()]
+        if tag == _TAG_BIG_INT:
+            return int(self._strings[reader.varint()])
+        if tag == _TAG_TUPLE:
+            return tuple(self._literal(reader.byte()) for _ in range(reader.varint()))
+        if tag == _TAG_LIST:
+            return [self._literal(reader.byte()) for _ in range(reader.varint())]
+
+        raise ValueError(f"Unexpected tag {tag} in serialized AST")
+
+
+def loads_all(data: Any, interner: NodeInterner | None = None) -> dict[str, EvalisNode]:
+    """Load every AST from a buffer written by dumps_all.
+
+    Pass a NodeInterner to share equal subtrees between the loaded ASTs.
+    """
+    return dict(AstArchive(data, interner))
+
+
+def loads(data: Any) -> EvalisNode:
+    """Load the AST from a buffer written by dumps."""
+    return AstArchive(data)[""]
+
+
+# region: json ----------------------------------------------------------------
+def to_json_dict(node: Any) -> dict[str, Any]:
+    """Convert an AST to plain JSON data, shaped like the TypeScript AST."""
+    if isinstance(node, LiteralNode):
+        return {"type": "literal", "value": node.value}
+    if isinstance(node, BinaryOpNode):
+        return {
+            "type": "binaryOp",
+            "op": node.op.value,
+            "left": to_json_dict(node.left),
+            "right": to_json_dict(node.right),
+        }
+    if isinstance(node, UnaryOpNode):
+        return {"type": "unaryOp", "op": node.op.value, "expr": to_json_dict(node.expr)}
+    if isinstance(node, ReferenceNode):
+        return {
+            "type": "reference",
+            "root": node.root,
+            "children": [to_json_dict(child) for child in node.children],
+        }
+    if isinstance(node, ListComprehensionNode):
+        return {
+            "type": "listComprehension",
+            "elementExpr": to_json_dict(node.element_expr),
+            "variableName": node.variable_name,
+            "iterableExpr": to_json_dict(node.iterable_expr),
+        }
+
+    raise ValueError(f"Unexpected node type found: {node}")
+
+
+def from_json_dict(data: Mapping[str, Any]) -> EvalisNode:
+    """Convert JSON data made by to_json_dict back into an AST.
+
+    JSON has no tuples, so tuple literals come back as lists.
+    """
+    node_type = data["type"]
+
+    if node_type == "literal":
+        return LiteralNode(data["value"])
+    if node_type == "binaryOp":
+        return BinaryOpNode(
+            op=BinaryOpType(data["op"]),
+            left=from_json_dict(data["left"]),
+            right=from_json_dict(data["right"]),
+        )
+    if node_type == "unaryOp":
+        return UnaryOpNode(
+            op=UnaryOpType(data["op"]), expr=from_json_dict(data["expr"])
+        )
+    if node_type == "reference":
+        return ReferenceNode(
+            root=sys.intern(data["root"]),
+            children=tuple(from_json_dict(child) for child in data["children"]),
+        )
+    if node_type == "listComprehension":
+        return ListComprehensionNode(
+            element_expr=from_json_dict(data["elementExpr"]),
+            variable_name=sys.intern(data["variableName"]),
+            iterable_expr=from_json_dict(data["iterableExpr"]),
+        )
+
+    raise ValueError(f"Unexpected node type found: {node_type}")
+
+
+def dumps_json(asts: Mapping[str, EvalisNode]) -> str:
+    """Serialize named ASTs to a JSON document.
+
+    Non-finite float literals are written as NaN/Infinity, which Python's json
+    module reads back but strict JSON parsers don't.
+    """
+    return json.dumps(
+        {
+            "expressionVersion": EXPRESSION_VERSION,
+            "asts": {name: to_json_dict(node) for name, node in asts.items()},
+        },
+        separators=(",", ":"),
+    )
+
+
+def loads_json(text: str | bytes) -> dict[str, EvalisNode]:
+    """Load named ASTs from a JSON document written by dumps_json."""
+    data = json.loads(text)
+
+    expression_version = data.get("expressionVersion")
+    if expression_version != EXPRESSION_VERSION:
+        raise ValueError(
+            f"ASTs were serialized for expression version {expression_version}, "
+            f"but this package supports {EXPRESSION_VERSION}"
+        )
+
+    return {name: from_json_dict(node) for name, node in data["asts"].items()}
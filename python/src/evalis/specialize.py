@@ -0,0 +1,193 @@
+"""Static types of expressions, from type hints about their context.
+
+With hints such as `{"user.age": int}`, compile_ast can prove that both
+operands of a `+` or a comparison are numbers (or both strings) and compile it
+to the plain Python operator, skipping the runtime type dispatch of
+evalis.ops. The results are the same as without hints, as long as the hints
+are right.
+"""
+
+import operator
+from typing import Any, Callable, Mapping
+
+from evalis.analysis import EACH, ReferencePath
+from evalis.hoisting import HoistedNode
+from evalis.types import (
+    BinaryOpNode,
+    BinaryOpType,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    UnaryOpNode,
+)
+
+# A context path as a tuple: (root, *keys), where EACH stands for every item
+# of a list
+type _Path = tuple[Any, ...]
+
+# Context paths -> the type of the value at that path. Paths are written as
+# `"user.age"`, as a tuple of keys such as `("items", EACH, "price")` or as a
+# ReferencePath
+type TypeHints = Mapping[str | tuple[Any, ...] | ReferencePath, type]
+
+# The comprehension variables in scope, innermost last, with the path of the
+# items they are bound to (None if unknown)
+type TypeScope = tuple[tuple[str, _Path | None], ...]
+
+# Exact types that evalis.ops handles like Python does when both operands
+# are numbers, or both are strings
+_NUMBER_TYPES = frozenset((bool, int, float))
+_PRIMITIVE_TYPES = frozenset((bool, int, float, str, type(None)))
+
+# These return whatever the operands' __eq__/__gt__/... return, which is only
+# known to be a bool for primitives (NumPy scalars return NumPy bools)
+_COMPARISON_OPS = frozenset(
+    (
+        BinaryOpType.EQUALS,
+        BinaryOpType.NOT_EQUALS,
+        BinaryOpType.GT,
+        BinaryOpType.GTE,
+        BinaryOpType.LT,
+        BinaryOpType.LTE,
+    )
+)
+
+_SPECIALIZED_OPS: dict[BinaryOpType, Callable[[Any, Any], Any]] = {
+    BinaryOpType.ADD: operator.add,
+    BinaryOpType.GT: operator.gt,
+    BinaryOpType.GTE: operator.ge,
+    BinaryOpType.LT: operator.lt,
+    BinaryOpType.LTE: operator.le,
+}
+
+
+class TypeInference:
+    """Infers the type of nodes from type hints about the context.
+
+    infer() returns the exact type of the values a node evaluates to, or None
+    when it can't be known. Hints are trusted: a hinted path is assumed to
+    always be present and to hold a value of exactly the hinted type.
+    """
+
+    _type_hints: dict[_Path, type]
+
+    def __init__(self, type_hints: TypeHints):
+        self._type_hints = {}
+        for path, hint in type_hints.items():
+            if not isinstance(hint, type):
+                raise ValueError(f"Type hint for {path!r} is not a type: {hint!r}")
+            self._type_hints[as_context_path(path)] = hint
+
+        # (id(node), scope) -> (node, type); keeping the node alive also keeps
+        # its id from being reused
+        self._types: dict[tuple[int, TypeScope], tuple[Any, type | None]] = {}
+
+    def infer(self, node: Any, scope: TypeScope = ()) -> type | None:
+        key = (id(node), scope)
+        cached = self._types.get(key)
+        if cached is not None:
+            return cached[1]
+
+        inferred = self._infer(node, scope)
+        self._types[key] = (node, inferred)
+        return inferred
+
+    def bind(self, node: ListComprehensionNode, scope: TypeScope) -> TypeScope:
+        """Return the scope of node's element, with its variable bound."""
+        item_path = None
+        if isinstance(node.iterable_expr, ReferenceNode):
+            path = self._get_path(node.iterable_expr, scope)
+            if path is not None:
+                item_path = (*path, EACH)
+
+        return (*scope, (node.variable_name, item_path))
+
+    def get_specialized_op(
+        self, node: BinaryOpNode, scope: TypeScope = ()
+    ) -> Callable[[Any, Any], Any] | None:
+        """Return a plain operator giving the same results as evalis.ops for
+        node's operands, or None if their types aren't known to allow it."""
+        op_func = _SPECIALIZED_OPS.get(node.op)
+        if op_func is None:
+            return None
+
+        left_type = self.infer(node.left, scope)
+        right_type = self.infer(node.right, scope)
+        if left_type in _NUMBER_TYPES and right_type in _NUMBER_TYPES:
+            return op_func
+        if left_type is str and right_type is str:
+            return op_func
+
+        return None
+
+    def _infer(self, node: Any, scope: TypeScope) -> type | None:
+        if isinstance(node, LiteralNode):
+            return type(node.value)
+        if isinstance(node, ReferenceNode):
+            path = self._get_path(node, scope)
+            return None if path is None else self._type_hints.get(path)
+        if isinstance(node, UnaryOpNode):
+            return bool
+        if isinstance(node, BinaryOpNode):
+            return self._infer_binary_op(node, scope)
+        if isinstance(node, ListComprehensionNode):
+            return list
+        if isinstance(node, HoistedNode):
+            return self.infer(node.expr, scope)
+
+        return None
+
+    def _infer_binary_op(self, node: BinaryOpNode, scope: TypeScope) -> type | None:
+        if node.op == BinaryOpType.IN:
+            return bool
+
+        left_type = self.infer(node.left, scope)
+        right_type = self.infer(node.right, scope)
+
+        if node.op in _COMPARISON_OPS:
+            if left_type in _PRIMITIVE_TYPES and right_type in _PRIMITIVE_TYPES:
+                return bool
+            return None
+
+        if node.op == BinaryOpType.AND or node.op == BinaryOpType.OR:
+            return left_type if left_type is right_type else None
+
+        if left_type in _NUMBER_TYPES and right_type in _NUMBER_TYPES:
+            if node.op == BinaryOpType.DIVIDE or float in (left_type, right_type):
+                return float
+            return int
+
+        # `+` with a string and any other primitive concatenates
+        if node.op == BinaryOpType.ADD and str in (left_type, right_type):
+            if left_type in _PRIMITIVE_TYPES and right_type in _PRIMITIVE_TYPES:
+                return str
+
+        return None
+
+    def _get_path(self, node: ReferenceNode, scope: TypeScope) -> _Path | None:
+        keys = [
+            child.value for child in node.children if isinstance(child, LiteralNode)
+        ]
+        if len(keys) < len(node.children):
+            return None
+
+        for name, item_path in reversed(scope):
+            if name == node.root:
+                return None if item_path is None else (*item_path, *keys)
+
+        return (node.root, *keys)
+
+
+def as_context_path(path: str | tuple[Any, ...] | ReferencePath) -> _Path:
+    """Return path as a tuple of (root, *keys)."""
+    if isinstance(path, ReferencePath):
+        keys: _Path = (path.root, *path.keys)
+    elif isinstance(path, str):
+        keys = tuple(path.split("."))
+    else:
+        keys = tuple(path)
+
+    if not keys or not isinstance(keys[0], str):
+        raise ValueError(f"Invalid context path: {path!r}")
+
+    return keys
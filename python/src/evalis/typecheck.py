@@ -0,0 +1,339 @@
+"""Checking expressions against a ContextSchema before evaluating them.
+
+check_ast reports what evaluating an expression would raise for some context
+matching the schema, because of the types involved:
+
+- operators used with types they don't support (CODE_TYPE_ERROR for `+` and
+  comparisons, e.g. `user.name > 5`; a TypeError for the others),
+- keys read from values that have none (`user.age.x` with an int age, or
+  through a value that may be null),
+- list comprehensions over values that aren't lists.
+
+Only declared paths are checked, so an empty schema reports nothing. Errors
+are reported when any combination of the possible types raises, so
+`user.nickname + 1` is an error for a `str | None` nickname.
+
+Unless should_eagerly_evaluate_logic is set, the right operand of `and`/`or`
+only runs for some values of the left one, and is checked knowing that: in
+`user and user.age > 1` or `user != null and ...` user isn't null on the
+right, and neither is it in `user == null or ...` and `not user or ...`.
+"""
+
+import dataclasses
+from types import NoneType
+from typing import Any
+
+from evalis.analysis import EACH
+from evalis.error import EvalisError, syntax_error
+from evalis.ops import get_binary_op
+from evalis.parser import SpanParser, get_line_column, parse_expression, tokenize
+from evalis.schema import ContextSchema
+from evalis.types import (
+    BinaryOpNode,
+    BinaryOpType,
+    EvalisNode,
+    EvaluatorOptions,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    TypeMessage,
+    UnaryOpNode,
+    UnaryOpType,
+)
+from evalis.unparse import format_ast
+
+# A context path as a tuple: (root, *keys), where EACH stands for every item
+# of a list
+type _Path = tuple[Any, ...]
+# The possible types of a value, or None if unknown
+type _Types = frozenset[type] | None
+
+# Operators are checked by applying them to one value of each type, so the
+# checker follows evalis.ops without repeating its rules. Other types (e.g.
+# classes from the schema) are unknown to it
+_SAMPLES: dict[type, Any] = {
+    NoneType: None,
+    bool: True,
+    int: 1,
+    float: 1.5,
+    str: "a",
+    list: [],
+    dict: {},
+}
+
+# Values that keys can't be read from (see get_val_from_context)
+_SCALAR_TYPES = frozenset((NoneType, bool, int, float, str))
+
+_BOOL = frozenset((bool,))
+_LIST = frozenset((list,))
+
+
+class _TypeChecker:
+    _schema: ContextSchema
+    _options: EvaluatorOptions
+    # (node, message) for every error found, in evaluation order
+    _errors: list[tuple[Any, str]]
+    # Paths known not to be None where the node being checked runs
+    _non_null: frozenset[_Path]
+
+    def __init__(self, schema: ContextSchema, options: EvaluatorOptions):
+        self._schema = schema
+        self._options = options
+        self._errors = []
+        self._non_null = frozenset()
+
+    def check(self, node: EvalisNode) -> list[tuple[Any, str]]:
+        self._errors = []
+        self._non_null = frozenset()
+        self._infer(node, {})
+        return self._errors
+
+    def _infer(self, node: Any, scope: dict[str, _Path | None]) -> _Types:
+        if isinstance(node, LiteralNode):
+            return frozenset((type(node.value),))
+        if isinstance(node, BinaryOpNode):
+            return self._infer_binary_op(node, scope)
+        if isinstance(node, UnaryOpNode):
+            self._infer(node.expr, scope)
+            return _BOOL
+        if isinstance(node, ReferenceNode):
+            return self._resolve(node, scope)[0]
+        if isinstance(node, ListComprehensionNode):
+            return self._infer_list_comprehension(node, scope)
+
+        raise ValueError(f"Unexpected node type found: {node}")
+
+    def _infer_binary_op(
+        self, node: BinaryOpNode, scope: dict[str, _Path | None]
+    ) -> _Types:
+        left = self._infer(node.left, scope)
+        right = self._infer_right(node, scope)
+        if node.op == BinaryOpType.EQUALS or node.op == BinaryOpType.NOT_EQUALS:
+            return _BOOL
+        if left is None or right is None:
+            return None
+
+        if node.op == BinaryOpType.AND or node.op == BinaryOpType.OR:
+            # Either operand can be the result
+            return left | right
+
+        op_func = get_binary_op(node.op)
+        results: set[type] = set()
+        is_known = True
+        for left_type in sorted(left, key=_type_name):
+            for right_type in sorted(right, key=_type_name):
+                if left_type not in _SAMPLES or right_type not in _SAMPLES:
+                    is_known = False
+                    continue
+
+                try:
+                    result = op_func(_SAMPLES[left_type], _SAMPLES[right_type])
+                except (EvalisError, TypeError):
+                    self._errors.append(
+                        (
+                            node,
+                            f"Cannot use {node.op.value} operator with types "
+                            f"{_type_name(left_type)} and {_type_name(right_type)}",
+                        )
+                    )
+                    # Only the first error, and nothing that follows from it
+                    return None
+
+                results.add(type(result))
+
+        return frozenset(results) if is_known else None
+
+    def _infer_right(
+        self, node: BinaryOpNode, scope: dict[str, _Path | None]
+    ) -> _Types:
+        """Infer the right operand of node, which may only run for some left
+        operands if node is a short-circuiting `and`/`or`."""
+        if self._options.should_eagerly_evaluate_logic:
+            return self._infer(node.right, scope)
+        if node.op == BinaryOpType.AND:
+            non_null = self._get_non_null(node.left, scope, True)
+        elif node.op == BinaryOpType.OR:
+            non_null = self._get_non_null(node.left, scope, False)
+        else:
+            return self._infer(node.right, scope)
+
+        outer = self._non_null
+        self._non_null = outer | non_null
+        try:
+            return self._infer(node.right, scope)
+        finally:
+            self._non_null = outer
+
+    def _get_non_null(
+        self, node: Any, scope: dict[str, _Path | None], is_truthy: bool
+    ) -> frozenset[_Path]:
+        """Return the paths that can't be None if node is truthy (or falsy)."""
+        if isinstance(node, UnaryOpNode) and node.op == UnaryOpType.NOT:
+            return self._get_non_null(node.expr, scope, not is_truthy)
+        if isinstance(node, ReferenceNode):
+            path = self._get_path(node, scope) if is_truthy else None
+            return frozenset() if path is None else frozenset((path,))
+        if not isinstance(node, BinaryOpNode):
+            return frozenset()
+
+        # `a and b` is truthy only if both are, `a or b` falsy only if both are
+        if node.op == (BinaryOpType.AND if is_truthy else BinaryOpType.OR):
+            left = self._get_non_null(node.left, scope, is_truthy)
+            return left | self._get_non_null(node.right, scope, is_truthy)
+        if node.op == (BinaryOpType.NOT_EQUALS if is_truthy else BinaryOpType.EQUALS):
+            if _is_null(node.right) and isinstance(node.left, ReferenceNode):
+                return self._get_non_null(node.left, scope, True)
+            if _is_null(node.left) and isinstance(node.right, ReferenceNode):
+                return self._get_non_null(node.right, scope, True)
+
+        return frozenset()
+
+    def _get_path(
+        self, node: ReferenceNode, scope: dict[str, _Path | None]
+    ) -> _Path | None:
+        """Return the path of a reference without reporting errors again."""
+        errors = self._errors
+        self._errors = []
+        try:
+            return self._resolve(node, scope)[1]
+        finally:
+            self._errors = errors
+
+    def _infer_list_comprehension(
+        self, node: ListComprehensionNode, scope: dict[str, _Path | None]
+    ) -> _Types:
+        iterable = node.iterable_expr
+        if isinstance(iterable, ReferenceNode):
+            iterable_types, path = self._resolve(iterable, scope)
+        else:
+            iterable_types, path = self._infer(iterable, scope), None
+
+        item_path = None if path is None else (*path, EACH)
+        self._infer(node.element_expr, {**scope, node.variable_name: item_path})
+
+        if iterable_types is None or iterable_types == _LIST:
+            return _LIST
+        if self._options.should_null_on_bad_access:
+            return _LIST | {NoneType}
+
+        not_list = min(iterable_types - _LIST, key=_type_name)
+        self._errors.append(
+            (
+                node,
+                f"List comprehension requires iterable to be a list, "
+                f"got {_type_name(not_list)}",
+            )
+        )
+        return _LIST
+
+    def _resolve(
+        self, node: ReferenceNode, scope: dict[str, _Path | None]
+    ) -> tuple[_Types, _Path | None]:
+        """Return the possible types of a reference and its path in the schema."""
+        path = scope[node.root] if node.root in scope else (node.root,)
+        types = None if path is None else self._schema.get(path, self._non_null)
+
+        for child in node.children:
+            if isinstance(child, LiteralNode):
+                key = child.value
+            else:
+                self._infer(child, scope)
+                key = None
+
+            if types is not None:
+                self._check_read(node, types, key)
+
+            if path is None:
+                continue
+            if types is not None and list in types and types <= _LIST | {NoneType}:
+                path = (*path, EACH)
+            elif isinstance(child, LiteralNode):
+                path = (*path, key)
+            else:
+                path = None
+
+            parent_types = types
+            types = None if path is None else self._schema.get(path, self._non_null)
+            if types is not None and parent_types is not None:
+                unreadable = self._get_unreadable(parent_types, key)
+                if unreadable is not None and self._options.should_null_on_bad_access:
+                    types = types | {NoneType}
+
+        return types, path
+
+    def _check_read(self, node: ReferenceNode, types: frozenset[type], key: Any):
+        if self._options.should_null_on_bad_access:
+            return
+
+        unreadable = self._get_unreadable(types, key)
+        if unreadable is not None:
+            what = "a key" if key is None else repr(key)
+            self._errors.append(
+                (node, f"Cannot read {what} from {_type_name(unreadable)}")
+            )
+
+    def _get_unreadable(self, types: frozenset[type], key: Any) -> type | None:
+        """Return one of types that key (None if dynamic) can't be read from."""
+        for value_type in sorted(types, key=_type_name):
+            if value_type in _SCALAR_TYPES:
+                return value_type
+            if value_type is list and isinstance(key, str):
+                return value_type
+            is_dataclass = dataclasses.is_dataclass(value_type)
+            if is_dataclass and not self._options.should_allow_attribute_access:
+                return value_type
+
+        return None
+
+
+def _is_null(node: Any) -> bool:
+    return isinstance(node, LiteralNode) and node.value is None
+
+
+def _type_name(value_type: type) -> str:
+    return value_type.__name__
+
+
+def check_ast(
+    node: EvalisNode,
+    schema: ContextSchema,
+    options: EvaluatorOptions = EvaluatorOptions(),
+) -> tuple[TypeMessage, ...]:
+    """Return the type errors evaluating node may raise for contexts matching
+    schema, in evaluation order. Messages have no line and column."""
+    return tuple(
+        TypeMessage(source=format_ast(error_node), message=message)
+        for error_node, message in _TypeChecker(schema, options).check(node)
+    )
+
+
+def check_expression(
+    expression: str,
+    schema: ContextSchema,
+    options: EvaluatorOptions = EvaluatorOptions(),
+) -> tuple[TypeMessage, ...]:
+    """Like check_ast, with the line and column of each error in expression.
+
+    Throws EvalisError if there are syntax errors.
+    """
+    node, syntax_errors = parse_expression(expression)
+    if node is None:
+        raise syntax_error(syntax_errors)
+    if not _TypeChecker(schema, options).check(node):
+        return ()
+
+    # Parse again, keeping track of where nodes are. The expression is valid,
+    # so this can't fail
+    parser = SpanParser(tokenize(expression))
+    node = parser.parse()
+
+    messages = []
+    for error_node, message in _TypeChecker(schema, options).check(node):
+        line = column = None
+        span = parser.get_span(error_node)
+        if span is not None:
+            line, column = get_line_column(expression, span[0])
+
+        messages.append(TypeMessage(format_ast(error_node), message, line, column))
+
+    return tuple(messages)
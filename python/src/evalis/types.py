@@ -1,7 +1,11 @@
 from dataclasses import dataclass
-from typing import Any
+from enum import Enum
+from typing import TYPE_CHECKING, Any
 from evalis.__gen__.grammar import BinaryOpType, UnaryOpType
 
+if TYPE_CHECKING:
+    from evalis.profiling import Profiler
+
 
 # region: parse result --------------------------------------------------------
 @dataclass(frozen=True)
@@ -20,31 +24,33 @@ type ParseResult = ParseResultSuccess | ParseResultError
 
 
 # region: ast nodes -----------------------------------------------------------
-@dataclass(frozen=True)
+# Slotted, since large rule sets keep many of these alive. See intern.py for
+# sharing identical subtrees between ASTs.
+@dataclass(frozen=True, slots=True)
 class ReferenceNode:
     root: str
     children: "tuple[EvalisNode, ...]"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UnaryOpNode:
     op: UnaryOpType
     expr: Any
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BinaryOpNode:
     op: BinaryOpType
     left: Any
     right: Any
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LiteralNode:
     value: Any
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ListComprehensionNode:
     element_expr: Any
     variable_name: str
@@ -60,6 +66,37 @@ EvalisNode = (
 @dataclass(frozen=True)
 class EvaluatorOptions:
     should_null_on_bad_access: bool = False
+    # Evaluate both sides of `and`/`or` even when the left side decides the
+    # result (the original behavior), so errors on the right side still raise
+    should_eagerly_evaluate_logic: bool = False
+    # Produce list comprehension items lazily where a list isn't needed: when
+    # the whole expression is a comprehension the result is an iterator, and
+    # `x in [...]` stops at the first match
+    should_stream_comprehensions: bool = False
+    # Look up names on objects that aren't dicts or lists (dataclasses,
+    # namedtuples, ...) as attributes. Names starting with `_` are refused
+    should_allow_attribute_access: bool = False
+    # Record per-node call counts, times and result types in this Profiler
+    # (see evalis.profiling). evaluate_ast and compile_ast then evaluate with a
+    # ProfilingEvaluator instead of the Evaluator or the compiler
+    profiler: "Profiler | None" = None
+
+
+class ErrorPolicy(Enum):
+    """What batch APIs do when evaluating one context fails."""
+
+    # Stop and raise the error
+    RAISE = "raise"
+    # Put the error (as an EvalisError) in the result slot and keep going
+    COLLECT = "collect"
+    # Put None in the result slot and keep going
+    NULL = "null"
+
+
+@dataclass(frozen=True)
+class ParserOptions:
+    # Use the pure-Python parser in evalis.parser instead of ANTLR
+    should_use_native_parser: bool = False
 
 
 @dataclass(frozen=True)
@@ -67,3 +104,13 @@ class SyntaxMessage:
     line: int
     column: int
     message: str
+
+
+@dataclass(frozen=True)
+class TypeMessage:
+    # The subexpression with the error, as written by format_ast
+    source: str
+    message: str
+    # Where the subexpression starts, when checked from expression source
+    line: int | None = None
+    column: int | None = None
@@ -0,0 +1,90 @@
+"""Turn an AST back into expression source.
+
+Parentheses are only added where precedence requires them, so the result of
+parsing an expression and formatting it is a normalized version of the
+expression, and parsing that again gives an equal AST.
+"""
+
+import re
+from decimal import Decimal
+from typing import Any
+
+from evalis.parser import BINARY_PRECEDENCE, KEYWORDS
+from evalis.types import (
+    BinaryOpNode,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+    UnaryOpNode,
+)
+
+_IDENTIFIER_RE = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+
+# `not` binds tighter than every binary operator; atoms bind tightest
+_NOT_PRECEDENCE = max(BINARY_PRECEDENCE.values()) + 1
+_ATOM_PRECEDENCE = _NOT_PRECEDENCE + 1
+
+
+def format_ast(node: Any) -> str:
+    """Return expression source that parses to node."""
+    return _format(node)[0]
+
+
+def _format(node: Any) -> tuple[str, int]:
+    """Return (source, precedence of its outermost operator)."""
+    if isinstance(node, LiteralNode):
+        return _format_literal(node.value), _ATOM_PRECEDENCE
+    if isinstance(node, BinaryOpNode):
+        precedence = BINARY_PRECEDENCE[node.op.value]
+        # Binary operators are left associative, so an equal precedence
+        # operator needs parentheses on the right but not on the left
+        left = _format_operand(node.left, precedence)
+        right = _format_operand(node.right, precedence + 1)
+        return f"{left} {node.op.value} {right}", precedence
+    if isinstance(node, UnaryOpNode):
+        operand = _format_operand(node.expr, _NOT_PRECEDENCE)
+        return f"{node.op.value} {operand}", _NOT_PRECEDENCE
+    if isinstance(node, ReferenceNode):
+        parts = [node.root]
+        for child in node.children:
+            if isinstance(child, LiteralNode) and _is_identifier(child.value):
+                parts.append(f".{child.value}")
+            else:
+                parts.append(f"[{format_ast(child)}]")
+        return "".join(parts), _ATOM_PRECEDENCE
+    if isinstance(node, ListComprehensionNode):
+        element = format_ast(node.element_expr)
+        iterable = format_ast(node.iterable_expr)
+        return (
+            f"[{element} for {node.variable_name} in {iterable}]",
+            _ATOM_PRECEDENCE,
+        )
+
+    raise ValueError(f"Unexpected node type found: {node}")
+
+
+def _format_operand(node: Any, min_precedence: int) -> str:
+    source, precedence = _format(node)
+    return f"({source})" if precedence < min_precedence else source
+
+
+def _format_literal(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+    if isinstance(value, float) and value == value and abs(value) != float("inf"):
+        # The grammar has no exponents, so 1e-07 is written out as 0.0000001
+        source = format(Decimal(repr(value)), "f")
+        return source if "." in source else f"{source}.0"
+
+    return repr(value)
+
+
+def _is_identifier(value: Any) -> bool:
+    if not isinstance(value, str) or value in KEYWORDS:
+        return False
+    return _IDENTIFIER_RE.fullmatch(value) is not None
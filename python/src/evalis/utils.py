@@ -15,7 +15,13 @@ def should_str_concat(left: Any, right: Any) -> bool:
     return True
 
 
+# Checked before the isinstance() below, which is slow for the numbers.Number ABC
+_PRIMITIVE_TYPES = frozenset((bool, str, bytes, int, float, type(None)))
+
+
 def is_primitive(value) -> bool:
+    if type(value) in _PRIMITIVE_TYPES:
+        return True
     return isinstance(value, (bool, str, bytes, numbers.Number, type(None)))
 
 
@@ -38,3 +44,9 @@ def as_num(val: Any) -> Any:
     if val is None:
         return 0
     return val
+
+
+def unescape_string_literal(raw: str) -> str:
+    """Strip the quotes from a STRING token and unescape it."""
+    unquoted = raw[1:-1]
+    return unquoted.replace('\\"', '"').replace("\\\\", "\\")
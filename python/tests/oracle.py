@@ -0,0 +1,48 @@
+import yaml
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from evalis.parser import parse_expression
+from evalis.types import EvalisNode
+
+DIR_BASE = Path(__file__).resolve().parent.parent.parent
+TEST_ORACLE_YML = DIR_BASE / "test-oracle" / "cases.yml"
+
+with TEST_ORACLE_YML.open("r", encoding="utf-8") as f:
+    TEST_CASES = yaml.safe_load(f)
+
+_T = TypeVar("_T")
+
+
+def describe_test_case(test_case):
+    expr = test_case.get("expr", None)
+    desc = test_case.get("description", None)
+
+    if desc:
+        return f"test for: {desc}"
+    if expr:
+        return f"test for expression: {test_case.get("expr")}"
+
+    return ""
+
+
+def parse(expression: str) -> EvalisNode:
+    """Parse an expression the test expects to be valid."""
+    node, errors = parse_expression(expression)
+    assert node is not None, errors
+    return node
+
+
+def parse_as(expression: str, node_type: type[_T]) -> _T:
+    """Parse a valid expression whose root the test expects to be a node_type."""
+    node = parse(expression)
+    assert isinstance(node, node_type), node
+    return node
+
+
+def outcome(fn: Callable[[], Any]) -> tuple[Any, ...]:
+    """Call fn and return ("ok", result), or ("error", type, message) if it raises."""
+    try:
+        return ("ok", fn())
+    except Exception as e:
+        return ("error", type(e), str(e))
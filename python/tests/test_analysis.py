@@ -0,0 +1,73 @@
+import pytest
+from evalis.analysis import extract_references, project_context
+from evalis.evalis import evaluate_ast
+from evalis.parser import parse_expression
+from evalis.types import EvaluatorOptions
+from oracle import TEST_CASES, describe_test_case, parse
+
+
+@pytest.mark.parametrize(
+    "expression,paths",
+    [
+        ("a + b.c", ["a", "b.c"]),
+        ("order.customer['zip code'][0]", ["order.customer['zip code'][0]"]),
+        ("a[b + 1].c", ["b", "a[?].c"]),
+        (
+            "[item.price * rate for item in order.items]",
+            ["order.items[*].price", "rate"],
+        ),
+        ("[1 for item in order.items]", ["order.items"]),
+        ("[x for x in xs] + [[y.a for y in x] for x in xs]", ["xs[*]", "xs[*][*].a"]),
+        ("[x.a for x in [y for y in ys]]", ["ys[*]"]),
+        ("[x.a for x in ys + zs]", ["ys", "zs"]),
+        ("[x for x in x.items]", ["x.items[*]"]),
+        ("1 + 2", []),
+    ],
+)
+def test_extract_references(expression, paths):
+    references = extract_references(parse(expression))
+
+    assert [str(path) for path in references.paths] == paths
+    assert references.roots == {path.split(".")[0].split("[")[0] for path in paths}
+
+
+def test_extract_references_reports_bound_and_dynamic():
+    references = extract_references(parse("[a[i] for i in items]"))
+
+    assert references.bound_variables == {"i"}
+    assert references.is_dynamic
+
+
+def test_project_context_keeps_only_read_paths():
+    context = {
+        "order": {
+            "items": [{"price": 1, "sku": "a"}, {"price": 2, "sku": "b"}],
+            "notes": "x" * 1000,
+        },
+        "rate": 2,
+        "unused": {"big": list(range(100))},
+    }
+    ast = parse("[item.price * rate for item in order.items]")
+
+    projected = project_context(context, extract_references(ast))
+
+    assert projected == {"order": {"items": [{"price": 1}, {"price": 2}]}, "rate": 2}
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES, ids=describe_test_case)
+def test_projected_context_evaluates_oracle(test_case):
+    ast, _ = parse_expression(test_case["expr"])
+    if ast is None:
+        return
+
+    context = test_case.get("context", {})
+    options = EvaluatorOptions(
+        should_null_on_bad_access=test_case.get("should_null_on_bad_access", False)
+    )
+    projected = project_context(context, extract_references(ast))
+
+    if test_case.get("expected_error"):
+        with pytest.raises(Exception, match=test_case["expected_error"]):
+            evaluate_ast(ast, projected, options)
+    else:
+        assert evaluate_ast(ast, projected, options) == test_case.get("expected")
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+from evalis.evalis import evaluate_async
+from evalis.types import EvaluatorOptions
+from oracle import TEST_CASES, describe_test_case
+
+
+def run(expression, context, options=EvaluatorOptions()):
+    return asyncio.run(evaluate_async(expression, context, options))
+
+
+def resolver(value, calls=None, name=None):
+    async def resolve():
+        if calls is not None:
+            calls.append(name)
+        return value
+
+    return resolve
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES, ids=describe_test_case)
+def test_evaluate_async_oracle(test_case):
+    context = test_case.get("context", {})
+    options = EvaluatorOptions(
+        should_null_on_bad_access=test_case.get("should_null_on_bad_access", False)
+    )
+
+    # Serve every top-level value through a resolver
+    lazy_context = {key: resolver(value) for key, value in context.items()}
+
+    if test_case.get("expected_error"):
+        with pytest.raises(Exception, match=test_case["expected_error"]):
+            run(test_case["expr"], lazy_context, options)
+    else:
+        assert run(test_case["expr"], lazy_context, options) == test_case.get(
+            "expected"
+        )
+
+
+def test_evaluate_async_skips_unneeded_values():
+    calls = []
+    context = {
+        "enabled": resolver(False, calls, "enabled"),
+        "score": resolver(1, calls, "score"),
+    }
+
+    assert run("enabled and score > 0", context) is False
+    assert calls == ["enabled"]
+
+
+def test_evaluate_async_fetches_each_value_once():
+    calls = []
+    context = {
+        "rate": resolver(2, calls, "rate"),
+        "user": resolver({"profile": resolver({"age": 30}, calls, "profile")}),
+        "items": [1, 2, 3],
+    }
+
+    result = run(
+        "[x * rate for x in items] + [user.profile.age + rate for x in items]", context
+    )
+
+    assert result == [2, 4, 6, 32, 32, 32]
+    assert sorted(calls) == ["profile", "rate"]
+
+
+def test_evaluate_async_accepts_awaitables():
+    async def main():
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(5)
+        return await evaluate_async("a * 2", {"a": future})
+
+    assert asyncio.run(main()) == 10
+
+
+def test_evaluate_async_resolves_branches_concurrently():
+    async def main():
+        ready = asyncio.Event()
+
+        async def left():
+            await ready.wait()
+            return 1
+
+        async def right():
+            ready.set()
+            return 2
+
+        expression = evaluate_async("a + b", {"a": left, "b": right})
+        return await asyncio.wait_for(expression, timeout=5)
+
+    assert asyncio.run(main()) == 3
+
+
+def test_evaluate_async_raises_leftmost_error():
+    async def slow_failure():
+        await asyncio.sleep(0.01)
+        raise ValueError("left")
+
+    async def fast_failure():
+        raise ValueError("right")
+
+    with pytest.raises(ValueError, match="left"):
+        run("a + b", {"a": slow_failure, "b": fast_failure})
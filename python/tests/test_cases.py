@@ -1,26 +1,7 @@
 import pytest
-import yaml
-from pathlib import Path
 from evalis.evalis import evaluate_expression
 from evalis.types import EvaluatorOptions
-
-DIR_BASE = Path(__file__).resolve().parent.parent.parent
-TEST_ORACLE_YML = DIR_BASE / "test-oracle" / "cases.yml"
-
-with TEST_ORACLE_YML.open("r", encoding="utf-8") as f:
-    TEST_CASES = yaml.safe_load(f)
-
-
-def describe_test_case(test_case):
-    expr = test_case.get("expr", None)
-    desc = test_case.get("description", None)
-
-    if desc:
-        return f"test for: {desc}"
-    if expr:
-        return f"test for expression: {test_case.get("expr")}"
-
-    return ""
+from oracle import TEST_CASES, describe_test_case
 
 
 @pytest.mark.parametrize("test_case", TEST_CASES, ids=describe_test_case)
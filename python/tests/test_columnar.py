@@ -0,0 +1,120 @@
+import pytest
+from evalis.eval import Evaluator
+from evalis.evalis import evaluate_columns
+from evalis.types import EvaluatorOptions, LiteralNode, BinaryOpNode, BinaryOpType
+from oracle import outcome, parse
+
+np = pytest.importorskip("numpy")
+
+COLUMNS = {
+    "i": [1, -2, 3, 0, 5],
+    "j": [4, 5, -6, 7, 8],
+    "f": [0.5, -1.5, 2.0, 0.0, 3.25],
+    "b": [True, False, True, False, True],
+    "n": [None, 1, None, 2, 3],
+    "s": ["a", "b", "c", "d", "e"],
+    "big": [2**62, 1, 2**62, 3, 4],
+    "obj": [{"k": 1}, {"k": 2}, {"k": 3}, {"k": 4}, {"k": 5}],
+    "items": [[1, 2], [], [3], [4, 5, 6], [0]],
+    "arr": np.array([10, 20, 30, 40, 50]),
+    "farr": np.array([1.0, np.nan, 3.0, -4.0, 5.0], dtype=np.float32),
+}
+
+EXPRESSIONS = [
+    "i + j",
+    "i - j * 2",
+    "i * f",
+    "i / j",
+    "j / i",
+    "f / 2",
+    "big + big",
+    "big * big",
+    "i > j",
+    "i >= f",
+    "n < 2",
+    "n > i",
+    "i == f",
+    "s == 'c'",
+    "s + i",
+    "s > 'b'",
+    "b and i > 0",
+    "b or s",
+    "i > 100 and s > i",
+    "n == null or n + i",
+    "b and obj.k",
+    "not b or i / 0",
+    "not b",
+    "not i",
+    "not (i > 0 and j > 0)",
+    "b + b",
+    "n + i",
+    "n + n",
+    "obj.k * 2 + i",
+    "obj['k'] > arr / 10",
+    "arr * 2 + farr",
+    "farr > 2",
+    "[x * i for x in items]",
+    "i in items",
+    "s > i",
+    "missing.foo",
+]
+
+
+def row_contexts(columns):
+    size = len(next(iter(columns.values())))
+    values = {
+        name: column.tolist() if isinstance(column, np.ndarray) else column
+        for name, column in columns.items()
+    }
+    return [{name: values[name][row] for name in values} for row in range(size)]
+
+
+def evaluate_rows(node, columns, options):
+    evaluator = Evaluator(options)
+    return [evaluator.evaluate(node, row) for row in row_contexts(columns)]
+
+
+@pytest.mark.parametrize("should_eagerly_evaluate_logic", [False, True])
+@pytest.mark.parametrize("should_null_on_bad_access", [False, True])
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_columnar_matches_row_by_row(
+    expression, should_null_on_bad_access, should_eagerly_evaluate_logic
+):
+    node = parse(expression)
+    options = EvaluatorOptions(
+        should_null_on_bad_access=should_null_on_bad_access,
+        should_eagerly_evaluate_logic=should_eagerly_evaluate_logic,
+    )
+
+    expected = outcome(lambda: evaluate_rows(node, COLUMNS, options))
+    actual = outcome(lambda: evaluate_columns(node, COLUMNS, options))
+
+    # repr also checks result types (1 vs 1.0 vs True) and treats nan == nan
+    assert repr(actual) == repr(expected)
+
+
+def test_columnar_returns_python_values():
+    result = evaluate_columns("arr * 2 > 50", {"arr": np.arange(5) * 10})
+
+    assert result == [False, False, False, True, True]
+    assert all(type(x) is bool for x in result)
+
+
+def test_columnar_in_literal_list():
+    node = BinaryOpNode(
+        op=BinaryOpType.IN,
+        left=parse("i"),
+        right=LiteralNode((1, 3.0, True)),
+    )
+
+    assert evaluate_columns(node, {"i": np.array([0, 1, 2, 3])}) == [
+        False,
+        True,
+        False,
+        True,
+    ]
+
+
+def test_columnar_rejects_ragged_columns():
+    with pytest.raises(ValueError, match="same length"):
+        evaluate_columns("a + b", {"a": [1, 2], "b": [1]})
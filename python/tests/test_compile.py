@@ -0,0 +1,64 @@
+import pytest
+from evalis.evalis import compile, parse_ast
+from evalis.compiler import compile_ast
+from evalis.eval import Evaluator
+from evalis.types import EvaluatorOptions, ParseResultSuccess
+from oracle import TEST_CASES, describe_test_case
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES, ids=describe_test_case)
+def test_compiled_expression(test_case):
+    expr = test_case["expr"]
+    context = test_case.get("context", {})
+    expected = test_case.get("expected", None)
+    expected_error = test_case.get("expected_error", None)
+    options = EvaluatorOptions(
+        should_null_on_bad_access=test_case.get("should_null_on_bad_access", False)
+    )
+
+    def act():
+        return compile(expr, options)(context)
+
+    if expected_error:
+        with pytest.raises(Exception, match=expected_error):
+            act()
+
+    else:
+        result = act()
+
+        assert (
+            result == expected
+        ), f"Failed expr: {expr} with context: {context}, got {result}"
+
+
+def test_compiled_expression_is_reusable():
+    result = parse_ast("[x * factor for x in items]")
+    assert isinstance(result, ParseResultSuccess)
+
+    compiled = compile_ast(result.ast)
+    evaluator = Evaluator()
+
+    for context in (
+        {"items": [1, 2, 3], "factor": 2},
+        {"items": [], "factor": 2},
+        {"items": [4], "factor": 10},
+    ):
+        assert compiled(context) == evaluator.evaluate(result.ast, context)
+
+
+@pytest.mark.parametrize(
+    "expression,ready", [('ready and 5 > "a"', False), ('ready or 5 > "a"', True)]
+)
+def test_eager_logic_evaluates_right_side(expression, ready):
+    result = parse_ast(expression)
+    assert isinstance(result, ParseResultSuccess)
+    context = {"ready": ready}
+
+    assert compile_ast(result.ast)(context) is ready
+    assert Evaluator().evaluate(result.ast, context) is ready
+
+    options = EvaluatorOptions(should_eagerly_evaluate_logic=True)
+    with pytest.raises(Exception, match="Cannot use > operator"):
+        compile_ast(result.ast, options)(context)
+    with pytest.raises(Exception, match="Cannot use > operator"):
+        Evaluator(options).evaluate(result.ast, context)
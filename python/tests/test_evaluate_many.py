@@ -0,0 +1,75 @@
+import pytest
+from evalis.error import CODE_TYPE_ERROR, CODE_UNKNOWN, EvalisError
+from evalis.evalis import evaluate_expression, evaluate_many, parse_ast
+from evalis.types import ErrorPolicy, ParseResultSuccess
+
+CONTEXTS = [
+    {"a": 1, "b": 2},
+    {"a": "x", "b": [1]},
+    {"a": 3},
+    {"a": 10, "b": 5},
+]
+
+
+def test_evaluate_many_matches_evaluate_expression():
+    contexts = [{"a": i, "b": i * 2} for i in range(20)]
+
+    assert evaluate_many("a + b > 10", contexts) == [
+        evaluate_expression("a + b > 10", context) for context in contexts
+    ]
+
+
+def test_evaluate_many_accepts_ast():
+    result = parse_ast("a * 2")
+    assert isinstance(result, ParseResultSuccess)
+
+    assert evaluate_many(result.ast, [{"a": 1}, {"a": 2}]) == [2, 4]
+
+
+def test_evaluate_many_raises_by_default():
+    with pytest.raises(EvalisError, match="Cannot use \\+ operator"):
+        evaluate_many("a + b", CONTEXTS)
+
+
+def test_evaluate_many_collects_errors():
+    results = evaluate_many("a + b", CONTEXTS, on_error=ErrorPolicy.COLLECT)
+
+    assert isinstance(results, list)
+    assert results[0] == 3
+    assert isinstance(results[1], EvalisError)
+    assert results[1].code == CODE_TYPE_ERROR
+    assert isinstance(results[2], EvalisError)
+    assert results[2].code == CODE_UNKNOWN
+    assert isinstance(results[2].__cause__, KeyError)
+    assert results[3] == 15
+
+
+def test_evaluate_many_nulls_errors():
+    assert evaluate_many("a + b", CONTEXTS, on_error=ErrorPolicy.NULL) == [
+        3,
+        None,
+        None,
+        15,
+    ]
+
+
+def test_evaluate_many_is_lazy():
+    seen = []
+
+    def contexts():
+        for i in range(3):
+            seen.append(i)
+            yield {"a": i}
+
+    results = evaluate_many("a + 1", contexts(), lazy=True)
+    assert not isinstance(results, list)
+    assert seen == []
+
+    assert next(results) == 1
+    assert seen == [0]
+    assert list(results) == [2, 3]
+
+
+def test_evaluate_many_raises_syntax_errors():
+    with pytest.raises(EvalisError, match="Syntax errors"):
+        evaluate_many("1 +", CONTEXTS, on_error=ErrorPolicy.NULL)
@@ -0,0 +1,144 @@
+import pytest
+from evalis.compiler import compile_ast
+from evalis.eval import MAX_HOISTED_ELEMENTS, Evaluator
+from evalis.hoisting import HoistedNode, hoist_invariants
+from evalis.types import (
+    BinaryOpNode,
+    EvaluatorOptions,
+    ListComprehensionNode,
+    ReferenceNode,
+)
+from oracle import outcome, parse, parse_as
+
+
+class CountingDict(dict):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.lookups = {}
+
+    def __getitem__(self, key):
+        self.lookups[key] = self.lookups.get(key, 0) + 1
+        return super().__getitem__(key)
+
+
+class UnhoistedEvaluator(Evaluator):
+    _should_hoist_invariants = False
+
+
+CONTEXT = {
+    "xs": [1, 2, 3],
+    "empty": [],
+    "rows": [[1, 2], [3]],
+    "config": {"scale": 2, "offset": 1, "name": "c", "flags": [1, 3]},
+    "rates": {"eu": 1.5, "us": 1},
+    "region": "eu",
+    "keys": ["eu", "us"],
+    "items": [{"price": 2, "region": "us"}, {"price": 4, "region": "eu"}],
+}
+
+EXPRESSIONS = [
+    "[x * config.scale for x in xs]",
+    "[x * config.scale + config.offset for x in xs]",
+    "[item.price * rates[region] for item in items]",
+    "[item.price * rates[item.region] for item in items]",
+    "[rates[keys[0]] for k in keys]",
+    "[x in config.flags for x in xs]",
+    "[x in [f * config.scale for f in config.flags] for x in xs]",
+    "[[c * config.scale for c in row] for row in rows]",
+    "[[row[0] + c for c in row] for row in rows]",
+    "[[y for y in config.flags] for x in xs]",
+    "[config for x in xs]",
+    "[config.name + x for x in xs]",
+    "[x > 1 and config.scale for x in xs]",
+    "[x * config.scale for x in empty]",
+    # Errors: raised for the same item as without hoisting, or not at all
+    "[x > 5 and config.name > 1 for x in xs]",
+    "[x > 1 and config.name > 1 for x in xs]",
+    "[x * config.missing.value for x in xs]",
+    "[x * config.name for x in empty]",
+    "[x / (config.scale - 2) for x in xs]",
+    "[[c / (row[0] - 1) for c in row] for row in rows]",
+]
+
+OPTIONS = [
+    EvaluatorOptions(),
+    EvaluatorOptions(should_null_on_bad_access=True),
+    EvaluatorOptions(should_stream_comprehensions=True),
+]
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_hoisting_does_not_change_results_or_errors(expression, options):
+    ast = parse(expression)
+    expected = outcome(lambda: list(UnhoistedEvaluator(options).evaluate(ast, CONTEXT)))
+
+    assert outcome(lambda: list(Evaluator(options).evaluate(ast, CONTEXT))) == expected
+    assert outcome(lambda: list(compile_ast(ast, EvaluatorOptions())(CONTEXT))) == (
+        outcome(lambda: list(UnhoistedEvaluator().evaluate(ast, CONTEXT)))
+    )
+
+
+def test_hoist_invariants_wraps_invariant_subtrees():
+    node = parse_as("[x * config.scale for x in xs]", ListComprehensionNode)
+    element = hoist_invariants(node)
+
+    assert isinstance(element, BinaryOpNode)
+    assert element.left == ReferenceNode("x", ())
+    assert isinstance(element.right, HoistedNode)
+    assert element.right.expr is node.element_expr.right
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "[x + 1 for x in xs]",
+        "[x + n for x in xs]",
+        "[x.a[x.b] for x in xs]",
+        # Results must stay distinct objects
+        "[[y for y in ys] for x in xs]",
+        "[a + b for x in xs]",
+        # Inner elements are hoisted by the inner loop
+        "[[y * config.scale for y in x] for x in xs]",
+    ],
+)
+def test_hoist_invariants_leaves_element_alone(expression):
+    node = parse_as(expression, ListComprehensionNode)
+
+    assert hoist_invariants(node) is node.element_expr
+
+
+def test_results_are_not_shared_between_items():
+    ast = parse("[[y for y in ys] for x in xs]")
+    context = {"xs": [1, 2], "ys": [1]}
+
+    for result in (Evaluator().evaluate(ast, context), compile_ast(ast)(context)):
+        assert result == [[1], [1]]
+        assert result[0] is not result[1]
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_invariants_are_evaluated_once_per_loop(compiled):
+    ast = parse("[[c * config.scale for c in row] for row in rows]")
+    config = CountingDict({"scale": 2})
+    context = {"rows": [[1, 2, 3], [4, 5], []], "config": config}
+
+    if compiled:
+        result = compile_ast(ast)(context)
+    else:
+        result = Evaluator().evaluate(ast, context)
+
+    assert result == [[2, 4, 6], [8, 10], []]
+    # Once per run of the inner loop that has items
+    assert config.lookups == {"scale": 2}
+
+
+def test_hoisted_elements_are_bounded():
+    evaluator = Evaluator()
+    context = {"xs": [1], "config": {"scale": 2}}
+
+    for _ in range(MAX_HOISTED_ELEMENTS * 2):
+        ast = parse("[x * config.scale for x in xs]")
+        assert evaluator.evaluate(ast, context) == [2]
+
+    assert len(evaluator._elements) == MAX_HOISTED_ELEMENTS
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+import pytest
+
+import evalis
+
+
+def run_in_fresh_interpreter(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def test_import_does_not_load_parser_or_optional_modules():
+    loaded = run_in_fresh_interpreter(
+        "import sys\n"
+        "import evalis\n"
+        "from evalis.types import LiteralNode\n"
+        "evalis.evaluate_ast(LiteralNode(1))\n"
+        "heavy = ('antlr4', 'evalis.ast', 'evalis.__gen__.EvalisParser', 'asyncio',"
+        " 'multiprocessing', 'json')\n"
+        "print(sorted(name for name in heavy if name in sys.modules))"
+    )
+
+    assert loaded == "[]"
+
+
+def test_antlr_is_loaded_on_first_parse():
+    loaded = run_in_fresh_interpreter(
+        "import sys\n"
+        "import evalis\n"
+        "assert evalis.evaluate_expression('a + 1', {'a': 1}) == 2\n"
+        "print('antlr4' in sys.modules)"
+    )
+
+    assert loaded == "True"
+
+
+@pytest.mark.parametrize("name", evalis.__all__)
+def test_all_exports_resolve(name: str):
+    assert getattr(evalis, name) is not None
+    assert name in dir(evalis)
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        evalis.does_not_exist
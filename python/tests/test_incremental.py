@@ -0,0 +1,171 @@
+import copy
+import random
+
+import pytest
+from evalis.analysis import DYNAMIC, ReferencePath
+from evalis.evalis import evaluate_expression, evaluate_incremental
+from evalis.types import EvaluatorOptions
+from oracle import outcome
+
+CONDITIONS = [
+    "cart.total > 100",
+    "cart.total * 2 >= limits.max",
+    "user.tier == 'gold'",
+    "user.age >= 18",
+    "'vip' in user.tags",
+    "user.tags[j] == 'new'",
+    "cart.items[0].price < 5",
+    "cart.items[i].price > 1",
+    "3 in [x.price for x in cart.items]",
+    "cart",
+    "not user.banned",
+]
+
+UPDATES = [
+    ("cart.total", [0, 50, 150, None, "a"]),
+    ("limits.max", [0, 100, 300]),
+    ("user.tier", ["gold", "silver", None]),
+    ("user.age", [10, 18, 40]),
+    ("user.banned", [True, False]),
+    ("i", [0, 1, 5]),
+    ("j", [-1, 0, 2]),
+    (("user", "tags", 1), ["vip", "new", "x"]),
+    (("cart", "items", 0, "price"), [1, 3, 10]),
+    (("cart", "items"), [[], [{"price": 4}, {"price": 2}]]),
+    ("user", [{"tier": "gold", "age": 20, "tags": [], "banned": False}]),
+]
+
+
+def make_context():
+    return {
+        "cart": {"total": 120, "items": [{"price": 3}, {"price": 7}]},
+        "limits": {"max": 200},
+        "user": {"tier": "gold", "age": 30, "tags": ["vip", "new"], "banned": False},
+        "i": 1,
+        "j": -1,
+    }
+
+
+def set_path(context, path, value):
+    keys = path.split(".") if isinstance(path, str) else path
+    for key in keys[:-1]:
+        context = context[key]
+    context[keys[-1]] = value
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize(
+    "options",
+    [
+        EvaluatorOptions(),
+        EvaluatorOptions(should_null_on_bad_access=True),
+        EvaluatorOptions(should_eagerly_evaluate_logic=True),
+    ],
+)
+def test_updates_match_full_evaluation(seed, options):
+    rng = random.Random(seed)
+    expression = " or ".join(
+        " and ".join(rng.sample(CONDITIONS, rng.randint(1, 3))) for _ in range(3)
+    )
+    context = make_context()
+    evaluation = evaluate_incremental(expression, copy.deepcopy(context), options)
+
+    for _ in range(15):
+        path, values = rng.choice(UPDATES)
+        value = copy.deepcopy(rng.choice(values))
+        try:
+            set_path(context, path, value)
+        except (KeyError, IndexError, TypeError):
+            continue
+
+        expected = outcome(lambda: evaluate_expression(expression, context, options))
+        assert outcome(lambda: evaluation.update(path, value)) == expected
+        assert outcome(lambda: evaluation.result) == expected
+
+
+def test_update_only_evaluates_affected_nodes():
+    conditions = [f"fields.f{i} > {i}" for i in range(100)]
+    context = {"fields": {f"f{i}": 0 for i in range(100)}}
+    evaluation = evaluate_incremental(" or ".join(conditions), context)
+    initial_count = evaluation.evaluated_count
+
+    assert evaluation.result is False
+    assert evaluation.update("fields.f99", 1000) is True
+    # The changed reference, its comparison and the chain of `or`s above it
+    assert evaluation.evaluated_count - initial_count == 3
+
+    assert evaluation.update("fields.f0", 1) is True
+    assert evaluation.evaluated_count - initial_count < 3 + 2 * 100
+
+
+def test_update_does_not_modify_the_callers_context():
+    context = make_context()
+    original = copy.deepcopy(context)
+    evaluation = evaluate_incremental("cart.items[0].price + cart.total", context)
+
+    assert evaluation.update(("cart", "items", 0, "price"), 10) == 130
+    assert evaluation.update("cart.total", 0) == 10
+
+    assert context == original
+    assert evaluation.context["cart"]["items"][0]["price"] == 10
+
+
+def test_list_items_are_updated_for_every_index():
+    evaluation = evaluate_incremental("xs[i] + xs[1]", {"xs": [1, 2], "i": -1})
+
+    assert evaluation.result == 4
+    assert evaluation.update(("xs", 1), 5) == 10
+
+
+@pytest.mark.parametrize(
+    "expression,path",
+    [
+        ("items[1].price * 10", ("items", -1, "price")),
+        ("items[1].price * 10", ("items", True, "price")),
+        ("items[i].price * 10", ("items", 1, "price")),
+    ],
+)
+def test_updates_below_list_items_reach_every_index(expression, path):
+    context = {"items": [{"price": 1}, {"price": 2}], "i": -1}
+    evaluation = evaluate_incremental(expression, context)
+
+    assert evaluation.update(path, 7) == 70
+    assert evaluation.result == evaluate_expression(expression, evaluation.context)
+
+
+def test_errors_are_kept_until_an_update_fixes_them():
+    evaluation = evaluate_incremental("cart.total > 100", {"cart": {}})
+
+    with pytest.raises(Exception):
+        evaluation.result
+
+    assert evaluation.update("cart.total", 150) is True
+
+
+def test_streamed_membership_stops_at_the_first_match():
+    options = EvaluatorOptions(should_stream_comprehensions=True)
+    context = {"xs": [10, 0], "n": 10}
+    expression = "1 in [n / x for x in xs]"
+    evaluation = evaluate_incremental(expression, context, options)
+
+    assert evaluation.result is True
+
+    context["n"] = 20
+    expected = outcome(lambda: evaluate_expression(expression, context, options))
+    assert outcome(lambda: evaluation.update("n", 20)) == expected
+    assert expected[0] == "error"
+
+
+@pytest.mark.parametrize("path", [(), (1, "a"), ReferencePath("a", (DYNAMIC,))])
+def test_update_rejects_invalid_paths(path):
+    evaluation = evaluate_incremental("a", {"a": {}})
+
+    with pytest.raises(ValueError, match="path"):
+        evaluation.update(path, 1)
+
+
+def test_update_rejects_paths_through_other_values():
+    evaluation = evaluate_incremental("a.b", {"a": "text"})
+
+    with pytest.raises(ValueError, match="only through dicts and lists"):
+        evaluation.update("a.b", 1)
@@ -0,0 +1,71 @@
+import pickle
+
+import pytest
+from evalis.eval import Evaluator
+from evalis.intern import NodeInterner
+from evalis.parser import parse_expression
+from evalis.types import BinaryOpNode, BinaryOpType, LiteralNode
+from oracle import TEST_CASES, describe_test_case, parse, parse_as
+
+
+def test_interner_shares_equal_subtrees():
+    interner = NodeInterner()
+    first = interner.intern(parse('user.tier == "gold" and total > 100'))
+    second = interner.intern(parse('user.tier == "gold" or total > 100'))
+
+    assert isinstance(first, BinaryOpNode) and isinstance(second, BinaryOpNode)
+    assert first.left is second.left
+    assert first.right is second.right
+    assert interner.intern(parse('user.tier == "gold"')) is first.left
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        (1, 1.0, True),
+        (0.0, -0.0),
+        (0, False),
+        ((1,), (1.0,), (True,)),
+        ((0.0,), (-0.0,)),
+        ((1, ("a", 1)), (1, ("a", True)), (1, ("a", 1), None)),
+    ],
+)
+def test_interner_keeps_literals_of_different_types_apart(values):
+    interner = NodeInterner()
+    nodes = [interner.intern(LiteralNode(value)) for value in values]
+
+    assert len({id(node) for node in nodes}) == len(values)
+    assert interner.intern(LiteralNode(values[0])) is nodes[0]
+
+
+def test_nodes_are_slotted_and_picklable():
+    ast = parse("[x.a + 1 for x in xs]")
+
+    assert not hasattr(ast, "__dict__")
+    assert pickle.loads(pickle.dumps(ast)) == ast
+
+
+def test_parser_interns_identifiers():
+    first = parse_as("customer_name + 'x'", BinaryOpNode)
+    second = parse_as("customer_name + 'y'", BinaryOpNode)
+
+    assert first.left.root is second.left.root
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES, ids=describe_test_case)
+def test_interned_ast_evaluates_oracle(test_case):
+    ast, _ = parse_expression(test_case["expr"])
+    if ast is None:
+        return
+
+    interner = NodeInterner()
+    # Intern a bigger tree first, so ast is built from already shared nodes
+    interner.intern(BinaryOpNode(op=BinaryOpType.AND, left=ast, right=ast))
+    interned = interner.intern(ast)
+    context = test_case.get("context", {})
+
+    assert interned == ast
+    if not test_case.get("expected_error") and not test_case.get(
+        "should_null_on_bad_access"
+    ):
+        assert Evaluator().evaluate(interned, context) == test_case.get("expected")
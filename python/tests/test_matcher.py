@@ -0,0 +1,97 @@
+import random
+
+import pytest
+from evalis.evalis import compile_matcher, evaluate_expression, parse_ast
+from evalis.types import BinaryOpNode, BinaryOpType, EvaluatorOptions, LiteralNode
+
+NULL_ON_BAD_ACCESS = EvaluatorOptions(should_null_on_bad_access=True)
+
+TIERS = ['"gold"', '"silver"', '"bronze"', "null", "1", "true"]
+NUMBERS = ["0", "1", "2.5", "10", "100"]
+COMPARISONS = [">", ">=", "<", "<="]
+
+
+def random_condition(rng):
+    kind = rng.randrange(5)
+    if kind == 0:
+        return f"user.tier == {rng.choice(TIERS)}"
+    if kind == 1:
+        return f"{rng.choice(TIERS)} == order.tags[0]"
+    if kind == 2:
+        return f"order.total {rng.choice(COMPARISONS)} {rng.choice(NUMBERS)}"
+    if kind == 3:
+        return f"{rng.choice(NUMBERS)} {rng.choice(COMPARISONS)} order.count"
+    return f"user.age {rng.choice(COMPARISONS)} order.total"
+
+
+def random_rules(rng, count):
+    rules = {}
+    for index in range(count):
+        conditions = [random_condition(rng) for _ in range(rng.randint(1, 3))]
+        operator = " and " if rng.random() < 0.8 else " or "
+        rules[f"rule_{index}"] = operator.join(conditions)
+    return rules
+
+
+def random_context(rng):
+    values = [None, 0, 1, 1.0, True, False, 2.5, 10, 100, -3, float("nan")]
+    return {
+        "user": {
+            "tier": rng.choice(["gold", "silver", None, 1, True, 1.0]),
+            "age": rng.choice(values),
+        },
+        "order": {
+            "total": rng.choice(values),
+            "count": rng.choice(values),
+            "tags": rng.choice([["gold"], [1], [None], [], [[1]]]),
+        },
+    }
+
+
+def brute_force(rules, context, options):
+    return [
+        name
+        for name, expression in rules.items()
+        if evaluate_expression(expression, context, options)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matcher_matches_brute_force(seed):
+    rng = random.Random(seed)
+    rules = random_rules(rng, 300)
+    matcher = compile_matcher(rules, NULL_ON_BAD_ACCESS)
+
+    for _ in range(50):
+        context = random_context(rng)
+        assert matcher.match(context) == brute_force(rules, context, NULL_ON_BAD_ACCESS)
+
+
+def test_matcher_indexes_literal_lists():
+    ast = parse_ast("user.tier").ast
+    rule = BinaryOpNode(
+        op=BinaryOpType.IN, left=ast, right=LiteralNode(("gold", "platinum"))
+    )
+    matcher = compile_matcher({"premium": rule, "any": "true"})
+
+    assert matcher.match({"user": {"tier": "gold"}}) == ["premium", "any"]
+    assert matcher.match({"user": {"tier": "silver"}}) == ["any"]
+
+
+def test_matcher_only_evaluates_candidates():
+    rules = {"gold": 'user.age > "x" and user.tier == "gold"'}
+    context = {"user": {"age": 1, "tier": "silver"}}
+    matcher = compile_matcher(rules)
+
+    assert matcher.match(context) == []
+    with pytest.raises(Exception, match="Cannot use > operator"):
+        brute_force(rules, context, EvaluatorOptions())
+
+
+def test_matcher_raises_errors_of_candidates():
+    matcher = compile_matcher({"bad": 'user.tier == "gold" and user.age > "x"'})
+
+    with pytest.raises(Exception, match="Cannot use > operator"):
+        matcher.match({"user": {"age": 1, "tier": "gold"}})
+    with pytest.raises(KeyError):
+        matcher.match({})
@@ -0,0 +1,108 @@
+import random
+
+import pytest
+from evalis.compiler import compile_ast
+from evalis.evalis import evaluate_expression, evaluate_many
+from evalis.membership import (
+    MAX_CACHED_LISTS,
+    MIN_INDEXED_LENGTH,
+    MembershipCache,
+    MembershipIndex,
+    list_contains,
+)
+from evalis.types import BinaryOpNode, BinaryOpType, LiteralNode, ReferenceNode
+from oracle import parse
+
+NAN = float("nan")
+VALUES = [0, 1, 1.0, True, False, None, "1", "a", 2.5, NAN, (1,), [1], {"a": 1}, -0.0]
+
+
+class Key:
+    """A hashable value that counts how often it is compared."""
+
+    comparisons = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __eq__(self, other):
+        Key.comparisons += 1
+        return isinstance(other, Key) and other.value == self.value
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_index_matches_list_membership(seed):
+    rng = random.Random(seed)
+    items = [rng.choice(VALUES) for _ in range(rng.randint(0, 40))]
+    index = MembershipIndex(items)
+
+    for value in [*VALUES, float("nan"), [1.0], {"a": True}]:
+        assert (value in index) == (value in items), (value, items)
+
+
+def test_index_is_used_for_repeated_searches_in_a_cache():
+    items = [Key(i) for i in range(1000)]
+
+    with MembershipCache():
+        list_contains(Key(999), items)
+        Key.comparisons = 0
+
+        assert list_contains(Key(999), items)
+        assert not list_contains(Key(-1), items)
+
+    assert Key.comparisons <= 1
+
+    Key.comparisons = 0
+    assert list_contains(Key(999), items)
+    assert Key.comparisons == 1000
+
+
+def test_short_lists_are_scanned():
+    items = [Key(i) for i in range(MIN_INDEXED_LENGTH - 1)]
+    Key.comparisons = 0
+
+    with MembershipCache():
+        for _ in range(3):
+            assert list_contains(Key(len(items) - 1), items)
+
+    assert Key.comparisons == 3 * len(items)
+
+
+def test_cache_does_not_grow_without_bound():
+    cache = MembershipCache()
+    with cache:
+        for i in range(MAX_CACHED_LISTS * 3):
+            list_contains(i, list(range(i, i + MIN_INDEXED_LENGTH)))
+
+    assert len(cache._entries) <= MAX_CACHED_LISTS
+
+
+def test_evaluate_many_matches_evaluating_each_context():
+    blocklist = [*range(100), "x", 2.5, None, [1], {"id": 3}]
+    contexts = [{"user": {"id": value}, "blocklist": blocklist} for value in VALUES]
+    expression = "user.id in blocklist"
+
+    assert evaluate_many(expression, contexts) == [
+        evaluate_expression(expression, context) for context in contexts
+    ]
+
+
+@pytest.mark.parametrize("items", [tuple(range(50)), [*range(49), [1]]])
+@pytest.mark.parametrize("value", [*VALUES, 49, 48.0])
+def test_compiled_literal_lists_match_scanning(items, value):
+    node = BinaryOpNode(BinaryOpType.IN, ReferenceNode("x", ()), LiteralNode(items))
+    compiled = compile_ast(node)
+
+    assert compiled({"x": value}) == (value in items)
+
+
+def test_strings_keep_substring_membership():
+    ast = parse("'ab' in text")
+
+    assert evaluate_many(ast, [{"text": "xaby" * 10}, {"text": "a" * 20}]) == [
+        True,
+        False,
+    ]
@@ -0,0 +1,78 @@
+import pytest
+from evalis.error import EvalisError
+from evalis.eval import Evaluator
+from evalis.optimize import optimize_ast
+from evalis.parser import parse_expression
+from evalis.types import EvaluatorOptions, LiteralNode
+from oracle import TEST_CASES, describe_test_case, parse
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("(5 > 10) == false", "true"),
+        ('"prefix" + "x"', '"prefixx"'),
+        ("1 + 2 * 3", "7"),
+        ("not true and foo", "false"),
+        ("true and foo", "foo"),
+        ("false and foo", "false"),
+        ("true or foo.bar", "true"),
+        ("false or foo.bar", "foo.bar"),
+        ("a[1 + 1]", "a[2]"),
+        ("not not (a in b)", "a in b"),
+        ("not not not a", "not a"),
+        ("[x * (2 + 3) for x in xs]", "[x * 5 for x in xs]"),
+    ],
+)
+def test_optimize_ast(expression, expected):
+    assert optimize_ast(parse(expression)) == optimize_ast(parse(expected))
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "not not a",
+        "not not (a == b)",
+        "foo and true",
+    ],
+)
+def test_optimize_ast_keeps_semantics_it_cannot_prove(expression):
+    ast = parse(expression)
+    assert optimize_ast(ast) == ast
+
+
+@pytest.mark.parametrize("expression", ["false and foo", "true or foo"])
+def test_optimize_ast_keeps_right_side_when_eager(expression):
+    ast = parse(expression)
+    options = EvaluatorOptions(should_eagerly_evaluate_logic=True)
+
+    assert optimize_ast(ast, options) == ast
+
+
+@pytest.mark.parametrize("expression", ['5 > "a"', "1 / 0", '"a" < 1 and x'])
+def test_optimize_ast_keeps_errors_for_evaluation_time(expression):
+    optimized = optimize_ast(parse(expression))
+
+    assert not isinstance(optimized, LiteralNode)
+    with pytest.raises((EvalisError, ZeroDivisionError)):
+        Evaluator().evaluate(optimized, {"x": True})
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES, ids=describe_test_case)
+def test_optimized_ast_evaluates_oracle(test_case):
+    ast, _ = parse_expression(test_case["expr"])
+    if ast is None:
+        return
+
+    context = test_case.get("context", {})
+    options = EvaluatorOptions(
+        should_null_on_bad_access=test_case.get("should_null_on_bad_access", False)
+    )
+    evaluator = Evaluator(options)
+    optimized = optimize_ast(ast, options)
+
+    if test_case.get("expected_error"):
+        with pytest.raises(Exception, match=test_case["expected_error"]):
+            evaluator.evaluate(optimized, context)
+    else:
+        assert evaluator.evaluate(optimized, context) == test_case.get("expected")
@@ -0,0 +1,59 @@
+import pytest
+from evalis.error import EvalisError
+from evalis.evalis import evaluate_many
+from evalis.parallel import ParallelEvaluator
+from evalis.types import ErrorPolicy, EvaluatorOptions
+from oracle import parse
+
+CONTEXTS = [{"items": list(range(i % 5)), "factor": i} for i in range(200)]
+MODES = [pytest.param(True, id="threads"), pytest.param(False, id="processes")]
+
+
+def parallel(use_threads, **kwargs):
+    node = parse("[x * factor for x in items]")
+    return ParallelEvaluator(node, use_threads=use_threads, max_workers=2, **kwargs)
+
+
+@pytest.mark.parametrize("use_threads", MODES)
+@pytest.mark.parametrize("chunksize", [None, 1, 7, 1000])
+def test_parallel_matches_evaluate_many(use_threads, chunksize):
+    expected = evaluate_many("[x * factor for x in items]", CONTEXTS)
+
+    with parallel(use_threads, chunksize=chunksize) as evaluator:
+        assert evaluator.evaluate_many(CONTEXTS) == expected
+        assert list(evaluator.evaluate_many(iter(CONTEXTS), lazy=True)) == expected
+
+
+@pytest.mark.parametrize("use_threads", MODES)
+def test_parallel_error_policies(use_threads):
+    contexts = list(CONTEXTS)
+    contexts[3] = {"items": 5, "factor": 1}
+    contexts[7] = {"items": [1], "factor": None}
+    expected = evaluate_many(
+        "[x * factor for x in items]", contexts, on_error=ErrorPolicy.NULL
+    )
+
+    with parallel(use_threads, chunksize=4) as evaluator:
+        assert evaluator.evaluate_many(contexts, ErrorPolicy.NULL) == expected
+
+        collected = evaluator.evaluate_many(contexts, ErrorPolicy.COLLECT)
+        assert [i for i, r in enumerate(collected) if isinstance(r, EvalisError)] == [
+            3,
+            7,
+        ]
+
+        with pytest.raises(ValueError, match="requires iterable to be a list"):
+            evaluator.evaluate_many(contexts)
+
+
+def test_parallel_uses_options():
+    node = parse("a.b")
+    options = EvaluatorOptions(should_null_on_bad_access=True)
+
+    with ParallelEvaluator(node, options, max_workers=2, use_threads=False) as p:
+        assert p.evaluate_many([{"a": {"b": 1}}, {}]) == [1, None]
+
+
+def test_parallel_rejects_bad_chunksize():
+    with pytest.raises(ValueError, match="chunksize"):
+        parallel(True, chunksize=0)
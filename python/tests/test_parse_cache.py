@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+from evalis.cache import (
+    ParseCache,
+    configure_parse_cache,
+    get_parse_cache_stats,
+)
+from evalis.evalis import parse_ast
+from evalis.types import ParseResultError, ParseResultSuccess
+
+
+@pytest.fixture(autouse=True)
+def fresh_parse_cache():
+    configure_parse_cache()
+    yield
+    configure_parse_cache()
+
+
+def test_parse_ast_reuses_cached_result():
+    first = parse_ast("a.b + 1")
+    second = parse_ast("a.b + 1")
+
+    assert isinstance(first, ParseResultSuccess)
+    assert first is second
+
+    stats = get_parse_cache_stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_parse_ast_caches_syntax_errors():
+    first = parse_ast("1 +")
+    second = parse_ast("1 +")
+
+    assert isinstance(first, ParseResultError)
+    assert first is second
+    assert get_parse_cache_stats().hits == 1
+
+
+def test_parse_cache_evicts_least_recently_used():
+    configure_parse_cache(max_entries=2)
+
+    a = parse_ast("a")
+    parse_ast("b")
+    assert parse_ast("a") is a
+    parse_ast("c")
+
+    stats = get_parse_cache_stats()
+    assert (stats.entries, stats.evictions) == (2, 1)
+    assert parse_ast("a") is a
+
+
+def test_parse_cache_is_bounded_by_bytes():
+    cache = ParseCache(max_entries=100, max_bytes=2000)
+
+    for i in range(50):
+        expression = f"value_{i} + {i}"
+        cache.put(expression, expression, parse_ast(expression))
+
+    stats = cache.stats()
+    assert 0 < stats.size_bytes <= 2000
+    assert stats.entries < 50
+    assert stats.evictions == 50 - stats.entries
+
+
+def test_parse_cache_can_be_disabled():
+    configure_parse_cache(max_entries=0)
+
+    assert parse_ast("a + 1") is not parse_ast("a + 1")
+    assert get_parse_cache_stats().entries == 0
+
+
+def test_parse_cache_is_thread_safe():
+    configure_parse_cache(max_entries=8)
+    expressions = [f"x + {i}" for i in range(32)]
+    failures = []
+
+    def work():
+        for _ in range(20):
+            for expression in expressions:
+                if not isinstance(parse_ast(expression), ParseResultSuccess):
+                    failures.append(expression)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = get_parse_cache_stats()
+    assert failures == []
+    assert stats.entries <= 8
+    assert stats.hits + stats.misses == 4 * 20 * 32
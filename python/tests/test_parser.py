@@ -0,0 +1,123 @@
+import random
+
+import pytest
+from evalis.antlr4_adapter import parse_expression_tree
+from evalis.ast import AstBuilder
+from evalis.evalis import evaluate_expression
+from evalis.parser import parse_expression
+from evalis.types import EvaluatorOptions, ParserOptions, SyntaxMessage
+from oracle import TEST_CASES, describe_test_case
+
+FUZZ_SEED = 20240917
+FUZZ_CASES = 500
+
+ATOMS = ["a", "b.c", "x[0]", "a['k'].z", "1", "2.5", "'s'", '"q\\"x"', "true", "null"]
+OPS = ["+", "-", "*", "/", "<", "<=", ">", ">=", "==", "!=", "and", "or", "in"]
+TOKENS = ATOMS + OPS + ["not", "for", "(", ")", "[", "]", ".", "false", "foo"]
+
+
+def parse_with_antlr(expression):
+    tree, errors = parse_expression_tree(expression)
+    if errors:
+        return (None, errors[:1])
+    return (AstBuilder().visit(tree), ())
+
+
+def generate_expression(rng, depth=0):
+    roll = rng.random()
+
+    if depth > 4 or roll < 0.3:
+        return rng.choice(ATOMS)
+    if roll < 0.7:
+        left = generate_expression(rng, depth + 1)
+        right = generate_expression(rng, depth + 1)
+        return f"{left} {rng.choice(OPS)} {right}"
+    if roll < 0.8:
+        return f"not {generate_expression(rng, depth + 1)}"
+    if roll < 0.9:
+        return f"({generate_expression(rng, depth + 1)})"
+
+    element = generate_expression(rng, depth + 1)
+    iterable = generate_expression(rng, depth + 1)
+    return f"[{element} for x in {iterable}]"
+
+
+def mutate_expression(rng, expression):
+    tokens = expression.split(" ")
+
+    for _ in range(rng.randint(1, 2)):
+        index = rng.randrange(len(tokens))
+        roll = rng.random()
+        if roll < 0.4 and len(tokens) > 1:
+            tokens.pop(index)
+        elif roll < 0.8:
+            tokens.insert(index, rng.choice(TOKENS))
+        else:
+            tokens[index] = rng.choice(TOKENS)
+
+    return rng.choice([" ", "\n", "  "]).join(tokens)
+
+
+def fuzz_corpus():
+    rng = random.Random(FUZZ_SEED)
+    corpus = []
+
+    for _ in range(FUZZ_CASES):
+        expression = generate_expression(rng)
+        if rng.random() < 0.6:
+            expression = mutate_expression(rng, expression)
+        corpus.append(expression)
+
+    return corpus
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES, ids=describe_test_case)
+def test_native_parser_evaluates_oracle(test_case):
+    expr = test_case["expr"]
+    context = test_case.get("context", {})
+    expected = test_case.get("expected", None)
+    expected_error = test_case.get("expected_error", None)
+    options = EvaluatorOptions(
+        should_null_on_bad_access=test_case.get("should_null_on_bad_access", False)
+    )
+
+    def act():
+        return evaluate_expression(
+            expr, context, options, ParserOptions(should_use_native_parser=True)
+        )
+
+    if expected_error:
+        with pytest.raises(Exception, match=expected_error):
+            act()
+
+    else:
+        assert act() == expected
+
+
+@pytest.mark.parametrize(
+    "expression", [case["expr"] for case in TEST_CASES] + fuzz_corpus()
+)
+def test_native_parser_matches_antlr(expression):
+    assert parse_expression(expression) == parse_with_antlr(expression)
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("a + b * c", "BinaryOpNode(op=<BinaryOpType.ADD: '+'>"),
+        ("not a and b", "BinaryOpNode(op=<BinaryOpType.AND: 'and'>"),
+        ("a < b < c", "BinaryOpNode(op=<BinaryOpType.LT: '<'>"),
+    ],
+)
+def test_native_parser_precedence(expression, expected):
+    ast, errors = parse_expression(expression)
+
+    assert errors == ()
+    assert repr(ast).startswith(expected)
+
+
+def test_native_parser_reports_unrecognized_characters():
+    assert parse_expression("a $ b") == (
+        None,
+        (SyntaxMessage(line=1, column=2, message="token recognition error at: '$'"),),
+    )
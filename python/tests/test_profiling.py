@@ -0,0 +1,123 @@
+import pytest
+from evalis.eval import Evaluator
+from evalis.evalis import compile, evaluate_expression, evaluate_many
+from evalis.profiling import Profiler, ProfilingEvaluator, create_evaluator
+from evalis.types import BinaryOpNode, EvaluatorOptions
+from oracle import TEST_CASES, describe_test_case, parse_as
+
+EVALUATABLE_CASES = [case for case in TEST_CASES if "expected" in case]
+
+
+def by_source(report):
+    return {profile.source: profile for profile in report.nodes}
+
+
+@pytest.mark.parametrize(
+    "test_case",
+    EVALUATABLE_CASES,
+    ids=describe_test_case,
+)
+def test_profiling_does_not_change_results(test_case):
+    profiler = Profiler()
+    options = EvaluatorOptions(
+        should_null_on_bad_access=test_case.get("should_null_on_bad_access", False),
+        profiler=profiler,
+    )
+
+    result = evaluate_expression(
+        test_case["expr"], test_case.get("context", {}), options
+    )
+
+    assert result == test_case["expected"]
+    assert profiler.report().nodes[0].calls == 1
+
+
+def test_create_evaluator():
+    assert type(create_evaluator(EvaluatorOptions())) is Evaluator
+    assert isinstance(
+        create_evaluator(EvaluatorOptions(profiler=Profiler())), ProfilingEvaluator
+    )
+
+    with pytest.raises(ValueError):
+        ProfilingEvaluator(EvaluatorOptions())
+
+
+def test_report_counts_calls_and_result_types():
+    profiler = Profiler()
+    options = EvaluatorOptions(profiler=profiler)
+    context = {"xs": [1, 2, 3], "limit": 2}
+
+    evaluate_expression("[x > limit for x in xs]", context, options)
+    nodes = by_source(profiler.report())
+
+    assert nodes["[x > limit for x in xs]"].calls == 1
+    assert nodes["[x > limit for x in xs]"].result_types == {"list": 1}
+    assert nodes["xs"].calls == 1
+    assert nodes["x > limit"].calls == 3
+    assert nodes["x > limit"].result_types == {"bool": 3}
+    assert nodes["limit"].calls == 3
+    assert [profile.depth for profile in profiler.report().nodes] == [0, 1, 1, 2, 2]
+
+
+def test_report_includes_nodes_that_were_not_evaluated():
+    profiler = Profiler()
+    options = EvaluatorOptions(profiler=profiler)
+
+    evaluate_expression("ready and total > 10", {"ready": False}, options)
+    nodes = by_source(profiler.report())
+
+    assert nodes["ready"].calls == 1
+    assert nodes["total > 10"].calls == 0
+    assert nodes["total"].calls == 0
+
+
+def test_report_times():
+    profiler = Profiler()
+    options = EvaluatorOptions(profiler=profiler)
+
+    evaluate_expression("(a + b) * c", {"a": 1, "b": 2, "c": 3}, options)
+    report = profiler.report()
+    root = report.nodes[0]
+
+    assert root.total_time >= sum(p.total_time for p in report.nodes if p.depth == 1)
+    assert root.self_time <= root.total_time
+    assert sorted(report.slowest(2), key=lambda p: p.self_time, reverse=True) == (
+        report.slowest(2)
+    )
+    assert "(a + b) * c" in report.format()
+
+
+def test_report_counts_errors():
+    profiler = Profiler()
+    options = EvaluatorOptions(profiler=profiler)
+
+    with pytest.raises(Exception):
+        evaluate_expression("a > 'x'", {"a": 1}, options)
+
+    nodes = by_source(profiler.report())
+    assert nodes['a > "x"'].errors == 1
+    assert nodes["a"].errors == 0
+
+
+def test_profiles_compiled_and_batch_evaluations_per_node():
+    profiler = Profiler()
+    options = EvaluatorOptions(profiler=profiler)
+    ast = parse_as("a + 1", BinaryOpNode)
+
+    assert compile("a + 2", options)({"a": 1}) == 3
+    assert evaluate_many(ast, [{"a": 1}, {"a": 2}], options) == [2, 3]
+    report = profiler.report()
+
+    profile = report.for_node(ast)
+    assert profile is not None and profile.calls == 2
+    assert report.for_node(BinaryOpNode(ast.op, ast.left, ast.right)) is None
+    assert [p.source for p in report.nodes if p.depth == 0] == ["a + 2", "a + 1"]
+
+
+def test_reset():
+    profiler = Profiler()
+
+    evaluate_expression("a", {"a": 1}, EvaluatorOptions(profiler=profiler))
+    profiler.reset()
+
+    assert profiler.report().nodes == ()
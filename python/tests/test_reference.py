@@ -0,0 +1,79 @@
+from collections import UserDict, namedtuple
+from dataclasses import dataclass
+
+import pytest
+from evalis.evalis import compile, evaluate_expression
+from evalis.types import EvaluatorOptions
+
+ATTRIBUTES = EvaluatorOptions(should_allow_attribute_access=True)
+ATTRIBUTES_OR_NULL = EvaluatorOptions(
+    should_allow_attribute_access=True, should_null_on_bad_access=True
+)
+
+Point = namedtuple("Point", ["x", "y"])
+
+
+@dataclass
+class Customer:
+    name: str
+    address: dict
+
+
+@dataclass
+class Order:
+    customer: Customer
+    points: list
+
+
+ORDER = Order(Customer("Ann", {"zip": "10001"}), [Point(1, 2)])
+
+
+def evaluate(expression, context, options=EvaluatorOptions()):
+    result = evaluate_expression(expression, context, options)
+    assert compile(expression, options)(context) == result
+    return result
+
+
+@pytest.mark.parametrize(
+    "expression,context,expected",
+    [
+        ("order.customer.address.zip", {"order": ORDER}, "10001"),
+        ("order.points[0].y", {"order": ORDER}, 2),
+        ("order['customer'].name", {"order": ORDER}, "Ann"),
+        ("[p.x + p.y for p in points]", {"points": [Point(1, 2), Point(3, 4)]}, [3, 7]),
+        ("p[1]", {"p": Point(1, 2)}, 2),
+    ],
+)
+def test_attribute_access(expression, context, expected):
+    assert evaluate(expression, context, ATTRIBUTES) == expected
+
+
+def test_getitem_objects_are_indexable_without_attribute_access():
+    context = {"row": UserDict({"a": {"b": [1, 2]}}), "pair": (5, 6)}
+
+    assert evaluate("row.a.b[1] + pair[0]", context) == 7
+
+
+@pytest.mark.parametrize("expression", ["order.customer", "s.upper", "n.real"])
+def test_attributes_need_the_option(expression):
+    context = {"order": ORDER, "s": "abc", "n": 5}
+
+    with pytest.raises(Exception):
+        evaluate(expression, context)
+
+
+@pytest.mark.parametrize(
+    "expression", ["order.__class__", "order._secret", "order.customer.missing"]
+)
+def test_missing_and_private_attributes(expression):
+    context = {"order": ORDER}
+
+    with pytest.raises(AttributeError):
+        evaluate(expression, context, ATTRIBUTES)
+    assert evaluate(expression, context, ATTRIBUTES_OR_NULL) is None
+
+
+def test_mappings_are_not_read_as_attributes():
+    context = {"row": UserDict({"keys": 1})}
+
+    assert evaluate("row.keys", context, ATTRIBUTES) == 1
@@ -0,0 +1,99 @@
+import pytest
+from evalis.error import EvalisError
+from evalis.evalis import compile_rules, evaluate_expression
+from evalis.types import ErrorPolicy, EvaluatorOptions
+
+RULES = {
+    "gold": 'user.tier == "gold"',
+    "vip": 'user.tier == "gold" and order.total > 100',
+    "discount": 'not (user.tier == "gold") or order.total > 500',
+    "big": "order.total > 100",
+    "prices": "[item.price * 2 for item in order.items]",
+    "names": "[user.name + item.name for item in order.items]",
+    "shadowed": "[user.tier for user in users]",
+}
+
+CONTEXTS = [
+    {
+        "user": {"tier": "gold", "name": "ann"},
+        "order": {"total": 150, "items": [{"price": 1, "name": "a"}]},
+        "users": [{"tier": "silver"}],
+    },
+    {
+        "user": {"tier": "silver", "name": "bob"},
+        "order": {"total": 600, "items": []},
+        "users": [],
+    },
+]
+
+
+class CountingDict(dict):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.lookups = {}
+
+    def __getitem__(self, key):
+        self.lookups[key] = self.lookups.get(key, 0) + 1
+        return super().__getitem__(key)
+
+
+@pytest.mark.parametrize("context", CONTEXTS)
+def test_rule_set_matches_evaluating_each_rule(context):
+    expected = {
+        name: evaluate_expression(expression, context)
+        for name, expression in RULES.items()
+    }
+
+    assert compile_rules(RULES).evaluate(context) == expected
+
+
+def test_rule_set_evaluates_shared_subexpressions_once():
+    rules = compile_rules(RULES)
+    context = CountingDict(CONTEXTS[0])
+
+    rules.evaluate(context)
+
+    assert rules.shared_count >= 2
+    # user.tier, order.total and order.items once each, plus user.name once per
+    # item since comprehension elements aren't shared
+    assert context.lookups == {"user": 2, "order": 2, "users": 1}
+
+
+def test_rule_set_keeps_literals_of_different_types_apart():
+    rules = compile_rules({"int": '"x" + 1', "bool": '"x" + true', "float": "a / 1.0"})
+
+    assert rules.evaluate({"a": 3}) == {"int": "x1", "bool": "xtrue", "float": 3.0}
+
+
+@pytest.mark.parametrize(
+    "on_error,expected",
+    [
+        (ErrorPolicy.NULL, {"a": None, "b": None, "c": 1}),
+        (ErrorPolicy.COLLECT, {"a": EvalisError, "b": EvalisError, "c": 1}),
+    ],
+)
+def test_rule_set_error_policy(on_error, expected):
+    rules = compile_rules({"a": 'x > "s"', "b": 'x > "s" or true', "c": "x"})
+
+    results = rules.evaluate({"x": 1}, on_error)
+
+    assert {
+        name: type(result) if isinstance(result, Exception) else result
+        for name, result in results.items()
+    } == expected
+
+
+def test_rule_set_raises_by_default():
+    rules = compile_rules({"a": "x", "b": 'x > "s"'})
+
+    with pytest.raises(EvalisError, match="Cannot use > operator"):
+        rules.evaluate({"x": 1})
+
+
+def test_rule_set_uses_options():
+    rules = compile_rules(
+        {"a": "x.y.z", "b": "x.y.z == null"},
+        EvaluatorOptions(should_null_on_bad_access=True),
+    )
+
+    assert rules.evaluate({"x": {}}) == {"a": None, "b": True}
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from types import NoneType
+from typing import Annotated, Any, Literal, NotRequired, TypedDict, TypeVar
+
+import pytest
+from evalis.analysis import EACH, ReferencePath
+from evalis.schema import ContextSchema
+
+
+@dataclass
+class Address:
+    city: str
+    zip: str | None
+
+
+@dataclass
+class User:
+    name: str
+    age: Annotated[int, "years"]
+    address: Address | None
+    tier: Literal["gold", "silver", 3]
+    extra: Any
+
+
+class Item(TypedDict):
+    price: float
+    sku: NotRequired[str]
+
+
+class Context(TypedDict):
+    user: User
+    items: list[Item]
+    limit: int | float
+
+
+def test_dict_schema():
+    schema = ContextSchema(
+        {
+            "user.age": int,
+            "user.nickname": str | None,
+            ("items", EACH, "price"): float,
+            ReferencePath("tags"): list[str],
+        }
+    )
+
+    assert schema.get("user.age") == {int}
+    assert schema.get(("user", "nickname")) == {str, NoneType}
+    assert schema.get(("items", EACH, "price")) == {float}
+    assert schema.get("tags") == {list}
+    assert schema.get(("tags", EACH)) == {str}
+    assert schema.get("user") is None
+
+    assert schema.type_hints == {
+        ("user", "age"): int,
+        ("items", EACH, "price"): float,
+        ("tags",): list,
+        ("tags", EACH): str,
+    }
+
+
+def test_schema_from_type():
+    schema = ContextSchema.from_type(Context)
+
+    assert schema.get("user") == {User}
+    assert schema.get("user.name") == {str}
+    assert schema.get("user.age") == {int}
+    assert schema.get("user.tier") == {str, int}
+    assert schema.get("user.extra") is None
+    assert schema.get("items") == {list}
+    assert schema.get(("items", EACH)) == {dict}
+    assert schema.get(("items", EACH, "price")) == {float}
+    assert schema.get("limit") == {int, float}
+
+    # Optional values, and everything below them, may be null
+    assert schema.get(("items", EACH, "sku")) == {str, NoneType}
+    assert schema.get("user.address") == {Address, NoneType}
+    assert schema.get("user.address.city") == {str, NoneType}
+
+    hints = schema.type_hints
+    assert hints[("user", "age")] is int
+    assert hints[("items", EACH, "price")] is float
+    assert ("limit",) not in hints
+    assert ("user", "address", "city") not in hints
+    assert ("items", EACH, "sku") not in hints
+
+
+def test_paths_declared_twice_have_both_types():
+    schema = ContextSchema({"a": list[int] | list[str]})
+
+    assert schema.get(("a", EACH)) == {int, str}
+    assert ("a", EACH) not in schema.type_hints
+
+
+@pytest.mark.parametrize("context_type", [int, dict, list[User]])
+def test_from_type_requires_a_record_type(context_type):
+    with pytest.raises(ValueError):
+        ContextSchema.from_type(context_type)
+
+
+def test_unsupported_annotations_raise():
+    with pytest.raises(ValueError):
+        ContextSchema({"a": TypeVar("T")})
+
+
+def test_get_leaves_out_null_for_non_null_paths():
+    schema = ContextSchema.from_type(Context)
+    address = ("user", "address")
+
+    assert schema.get("user.address", [address]) == {Address}
+    assert schema.get("user.address.city", [address]) == {str}
+    assert schema.get("user.address.city", [(*address, "city")]) == {str}
+    # zip may be null on its own, and sku is optional in every item
+    assert schema.get("user.address.zip", [address]) == {str, NoneType}
+    assert schema.get(("items", EACH, "sku"), [("items",)]) == {str, NoneType}
@@ -0,0 +1,25 @@
+import pytest
+from evalis.eval import get_val_from_context
+from evalis.scope import Scope
+
+
+def test_scope_lookup_prefers_innermost_binding():
+    scope = Scope(Scope({"x": 1, "y": 2}, "x", 10), "x", 100)
+
+    assert get_val_from_context(scope, "x") == 100
+    assert get_val_from_context(scope, "y") == 2
+
+
+def test_scope_lookup_miss_fails_like_root_context():
+    scope = Scope({"x": 1}, "y", 2)
+
+    with pytest.raises(KeyError):
+        get_val_from_context(scope, "z")
+
+
+def test_scope_does_not_copy_or_modify_root_context():
+    context = {"x": 1}
+    scope = Scope(context, "x", 2)
+
+    assert get_val_from_context(scope, "x") == 2
+    assert context == {"x": 1}
@@ -0,0 +1,159 @@
+import math
+import mmap
+
+import pytest
+from evalis.constants import EXPRESSION_VERSION
+from evalis.evalis import evaluate_ast
+from evalis.intern import NodeInterner
+from evalis.parser import parse_expression
+from evalis.serialize import (
+    AstArchive,
+    dumps,
+    dumps_all,
+    dumps_json,
+    loads,
+    loads_all,
+    loads_json,
+)
+from evalis.types import (
+    BinaryOpNode,
+    BinaryOpType,
+    ListComprehensionNode,
+    LiteralNode,
+    ReferenceNode,
+)
+from oracle import TEST_CASES, parse
+
+ASTS = {
+    f"case_{i}": ast
+    for i, ast in enumerate(
+        parse_expression(test_case["expr"])[0] for test_case in TEST_CASES
+    )
+    if ast is not None
+}
+
+LITERALS = [None, True, False, 0, 1, -5, 2**70, -(2**63), 1.0, -0.0, 0.1, "", "é ☃"]
+
+
+def literal_repr(node):
+    return repr((type(node.value), node.value))
+
+
+def test_binary_round_trip():
+    assert loads_all(dumps_all(ASTS)) == ASTS
+
+
+def test_json_round_trip():
+    assert loads_json(dumps_json(ASTS)) == ASTS
+
+
+@pytest.mark.parametrize(
+    "value", LITERALS + [math.inf, [1, "a", [None, 2.5]], (1, [2, ()])]
+)
+def test_literals_keep_their_type(value):
+    node = LiteralNode(value)
+
+    assert literal_repr(loads(dumps(node))) == literal_repr(node)
+
+
+@pytest.mark.parametrize("value", LITERALS + [math.inf, [1, "a", [None, 2.5]]])
+def test_json_literals_keep_their_type(value):
+    node = LiteralNode(value)
+
+    assert literal_repr(loads_json(dumps_json({"": node}))[""]) == literal_repr(node)
+
+
+def test_json_reads_tuples_as_lists():
+    loaded = loads_json(dumps_json({"": LiteralNode((1, (2,)))}))[""]
+
+    assert literal_repr(loaded) == literal_repr(LiteralNode([1, [2]]))
+
+
+@pytest.mark.parametrize(
+    "ast,expected",
+    [
+        (
+            ListComprehensionNode(
+                element_expr=BinaryOpNode(
+                    BinaryOpType.MULTIPLY, ReferenceNode("x", ()), LiteralNode(2)
+                ),
+                variable_name="x",
+                iterable_expr=LiteralNode([1, 2]),
+            ),
+            [2, 4],
+        ),
+        (BinaryOpNode(BinaryOpType.ADD, LiteralNode([1]), LiteralNode([2])), [1, 2]),
+        (BinaryOpNode(BinaryOpType.IN, LiteralNode(2), LiteralNode((1, 2))), True),
+    ],
+)
+def test_round_tripped_literals_evaluate(ast, expected):
+    for loaded in (loads(dumps(ast)), loads_json(dumps_json({"": ast}))[""]):
+        assert evaluate_ast(loaded, {}) == expected
+
+
+def test_nan_round_trips():
+    loaded = loads(dumps(LiteralNode(math.nan)))
+
+    assert isinstance(loaded, LiteralNode)
+    assert math.isnan(loaded.value)
+
+
+def test_shared_nodes_stay_shared():
+    interner = NodeInterner()
+    ast = interner.intern(parse("(a.b + 1) * (a.b + 1) + a.b"))
+
+    loaded = loads(dumps(ast))
+
+    assert isinstance(loaded, BinaryOpNode)
+    assert loaded == ast
+    assert loaded.left.left is loaded.left.right
+    assert loaded.right is loaded.left.left.left
+    assert len(dumps(ast)) < len(dumps(parse("(a.b + 1) * (a.b + 1) + a.b")))
+
+
+def test_loads_all_can_intern_across_asts():
+    asts = {
+        "a": parse("x.y > 1"),
+        "b": parse("x.y > 1 or z"),
+    }
+
+    loaded = loads_all(dumps_all(asts), NodeInterner())
+
+    assert isinstance(loaded["b"], BinaryOpNode)
+    assert loaded["b"].left is loaded["a"]
+
+
+def test_archive_reads_from_mmap(tmp_path):
+    path = tmp_path / "rules.bin"
+    path.write_bytes(dumps_all(ASTS))
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        archive = AstArchive(m)
+        assert len(archive) == len(ASTS)
+        assert archive["case_3"] == ASTS["case_3"]
+        assert archive["case_3"] is archive["case_3"]
+        del archive
+
+
+def test_rejects_other_expression_versions():
+    data = dumps(ReferenceNode(root="a", children=()))
+    other = data.replace(EXPRESSION_VERSION.encode(), b"9.9.9")
+
+    with pytest.raises(ValueError, match="expression version 9.9.9"):
+        loads(other)
+    with pytest.raises(ValueError, match="expression version 9.9.9"):
+        loads_json(dumps_json({}).replace(EXPRESSION_VERSION, "9.9.9"))
+
+
+def test_rejects_other_data():
+    with pytest.raises(ValueError, match="Not a serialized Evalis AST"):
+        loads(b"hello world")
+
+
+def test_rejects_unknown_literals():
+    node = BinaryOpNode(
+        op=BinaryOpType.ADD, left=LiteralNode(object()), right=LiteralNode(1)
+    )
+
+    with pytest.raises(ValueError, match="Cannot serialize literal"):
+        dumps(node)
@@ -0,0 +1,169 @@
+import operator
+
+import pytest
+from evalis.analysis import EACH, ReferencePath
+from evalis.compiler import compile_ast
+from evalis.error import EvalisError
+from evalis.evalis import compile
+from evalis.ops import op_add, op_gt, op_lte
+from evalis.specialize import TypeInference
+from evalis.types import BinaryOpNode, EvaluatorOptions, ListComprehensionNode
+from oracle import TEST_CASES, describe_test_case, parse, parse_as
+
+HINTS = {
+    "user.age": int,
+    "user.name": str,
+    "score": float,
+    "flag": bool,
+    ("items", EACH, "price"): float,
+    ReferencePath("tags", (EACH,)): str,
+}
+
+
+def hints_for(value, path=()):
+    """Hints for every dict value in value with a primitive type."""
+    hints = {}
+    if isinstance(value, dict):
+        for key, item in value.items():
+            hints.update(hints_for(item, (*path, key)))
+    elif path and type(value) in (bool, int, float, str):
+        hints[path] = type(value)
+
+    return hints
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("user.age", int),
+        ("user.missing", None),
+        ("user.age + 1", int),
+        ("user.age + score", float),
+        ("user.age / 2", float),
+        ("flag + flag", int),
+        ("user.name + user.age", str),
+        ("user.name * 2", None),
+        ("user.age > 3", bool),
+        ("user.name == null", bool),
+        ("user == 3", None),
+        ("user > user.age", None),
+        ("user in tags", bool),
+        ("not user", bool),
+        ("user.age or 0", int),
+        ("user.age or score", None),
+        ("[p for p in tags]", list),
+        ("user[user.name]", None),
+    ],
+)
+def test_infer(expression, expected):
+    assert TypeInference(HINTS).infer(parse(expression)) is expected
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("user.age > 18", operator.gt),
+        ("user.age + score <= 3.5", operator.le),
+        ("user.name >= 'm'", operator.ge),
+        ("user.name + 'x'", operator.add),
+        ("user.name > 18", None),
+        ("user.name + 1", None),
+        ("user.age == 18", None),
+        ("user.other > 18", None),
+    ],
+)
+def test_get_specialized_op(expression, expected):
+    node = parse_as(expression, BinaryOpNode)
+
+    assert TypeInference(HINTS).get_specialized_op(node) is expected
+
+
+def test_comprehension_variables_are_typed_through_their_iterable():
+    inference = TypeInference(HINTS)
+    comprehension = parse_as("[i.price > 2 for i in items]", ListComprehensionNode)
+    scope = inference.bind(comprehension, ())
+
+    assert inference.get_specialized_op(comprehension.element_expr, scope) is (
+        operator.gt
+    )
+
+
+def test_comprehension_variables_shadow_context_hints():
+    inference = TypeInference({"user.age": int})
+    comprehension = parse_as("[user.age > 2 for user in users]", ListComprehensionNode)
+    scope = inference.bind(comprehension, ())
+
+    assert inference.get_specialized_op(comprehension.element_expr, scope) is None
+
+
+@pytest.mark.parametrize("expression", ["(x == y) + 1", "(x == y) > 0"])
+def test_comparisons_of_other_types_are_not_specialized(expression):
+    # NumPy scalars compare to NumPy bools, which evalis.ops doesn't add
+    np = pytest.importorskip("numpy")
+    context = {"x": np.int64(2), "y": np.int64(2), "z": 1}
+
+    with pytest.raises(EvalisError):
+        compile(expression)(context)
+    with pytest.raises(EvalisError):
+        compile(expression, type_hints={"z": int})(context)
+
+
+@pytest.mark.parametrize("hint", [None, "int", int | None])
+def test_invalid_hints_raise(hint):
+    with pytest.raises(ValueError):
+        TypeInference({"user.age": hint})
+
+
+@pytest.mark.parametrize("test_case", TEST_CASES, ids=describe_test_case)
+def test_compiled_with_hints(test_case):
+    expr = test_case["expr"]
+    context = test_case.get("context", {})
+    options = EvaluatorOptions(
+        should_null_on_bad_access=test_case.get("should_null_on_bad_access", False)
+    )
+
+    def act():
+        return compile(expr, options, type_hints=hints_for(context))(context)
+
+    if test_case.get("expected_error"):
+        with pytest.raises(Exception, match=test_case["expected_error"]):
+            act()
+    else:
+        assert act() == test_case.get("expected", None)
+
+
+def test_compiled_with_hints_matches_without():
+    ast = parse("[i.price * 2 + bonus > limit for i in items]")
+    compiled = compile_ast(ast)
+    hinted = compile_ast(
+        ast, type_hints={("items", EACH, "price"): float, "bonus": int, "limit": int}
+    )
+
+    for prices in ([1.5, 2.0, 9.25], [], [0.0]):
+        context = {"items": [{"price": p} for p in prices], "bonus": 1, "limit": 4}
+        assert hinted(context) == compiled(context)
+
+
+@pytest.mark.parametrize(
+    "op,left,right,expected",
+    [
+        (op_add, 1, 2.5, 3.5),
+        (op_add, "a", "b", "ab"),
+        (op_add, True, "x", "truex"),
+        (op_add, "n=", 1, "n=1"),
+        (op_add, None, None, None),
+        (op_add, [1], [2], [1, 2]),
+        (op_gt, None, -1, True),
+        (op_gt, True, 0, True),
+        (op_lte, 2.5, 2, False),
+        (op_lte, "a", "b", True),
+    ],
+)
+def test_ops_fall_back_to_coercion_rules(op, left, right, expected):
+    assert op(left, right) == expected
+
+
+@pytest.mark.parametrize("op", [op_add, op_gt, op_lte])
+def test_ops_still_raise_on_mismatched_types(op):
+    with pytest.raises(EvalisError):
+        op("a", [1]) if op is op_add else op("a", 1)
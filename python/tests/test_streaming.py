@@ -0,0 +1,70 @@
+import types
+
+import pytest
+from evalis.evalis import compile, evaluate_expression
+from evalis.types import EvaluatorOptions
+from oracle import TEST_CASES, describe_test_case
+
+STREAMING = EvaluatorOptions(should_stream_comprehensions=True)
+
+
+def evaluators(options):
+    return [
+        lambda expr, context: evaluate_expression(expr, context, options),
+        lambda expr, context: compile(expr, options)(context),
+    ]
+
+
+@pytest.mark.parametrize("index", [0, 1], ids=["evaluate", "compile"])
+@pytest.mark.parametrize("test_case", TEST_CASES, ids=describe_test_case)
+def test_streaming_evaluates_oracle(test_case, index):
+    context = test_case.get("context", {})
+    options = EvaluatorOptions(
+        should_null_on_bad_access=test_case.get("should_null_on_bad_access", False),
+        should_stream_comprehensions=True,
+    )
+    evaluate = evaluators(options)[index]
+
+    def act():
+        result = evaluate(test_case["expr"], context)
+        return list(result) if isinstance(result, types.GeneratorType) else result
+
+    if test_case.get("expected_error"):
+        with pytest.raises(Exception, match=test_case["expected_error"]):
+            act()
+    else:
+        assert act() == test_case.get("expected")
+
+
+@pytest.mark.parametrize("evaluate", evaluators(STREAMING))
+def test_streaming_comprehension_is_lazy(evaluate):
+    result = evaluate("[10 / x for x in xs]", {"xs": [5, 2, 0]})
+
+    assert next(result) == 2
+    assert next(result) == 5
+    with pytest.raises(ZeroDivisionError):
+        next(result)
+
+
+@pytest.mark.parametrize("evaluate", evaluators(STREAMING))
+def test_streaming_checks_iterable_eagerly(evaluate):
+    with pytest.raises(ValueError, match="requires iterable to be a list"):
+        evaluate("[x for x in xs]", {"xs": 5})
+
+
+@pytest.mark.parametrize("evaluate", evaluators(STREAMING))
+def test_streaming_in_stops_at_first_match(evaluate):
+    expression = "2 in [10 / x for x in xs]"
+    context = {"xs": [5, 0]}
+
+    assert evaluate(expression, context) is True
+    for eager in evaluators(EvaluatorOptions()):
+        with pytest.raises(ZeroDivisionError):
+            eager(expression, context)
+
+
+@pytest.mark.parametrize("evaluate", evaluators(STREAMING))
+def test_streaming_keeps_nested_comprehensions_as_lists(evaluate):
+    result = evaluate("[[x * y for y in ys] for x in xs]", {"xs": [1, 2], "ys": [3]})
+
+    assert list(result) == [[3], [6]]
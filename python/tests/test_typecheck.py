@@ -0,0 +1,229 @@
+from dataclasses import dataclass
+from typing import NotRequired, TypedDict
+
+import pytest
+from evalis.analysis import EACH
+from evalis.error import CODE_TYPE_ERROR, EvalisError
+from evalis.evalis import compile, evaluate_many
+from evalis.schema import ContextSchema
+from evalis.typecheck import check_ast, check_expression
+from evalis.types import EvaluatorOptions, TypeMessage
+from oracle import TEST_CASES, describe_test_case, parse
+
+
+@dataclass
+class Address:
+    city: str
+
+
+SCHEMA = ContextSchema(
+    {
+        "user.name": str,
+        "user.age": int,
+        "user.nickname": str | None,
+        "user.address": Address,
+        "user.tags": list[str],
+        ("items", EACH, "price"): float,
+        "limit": int,
+    }
+)
+
+
+def messages(expression, options=EvaluatorOptions()):
+    return [
+        (m.source, m.message) for m in check_expression(expression, SCHEMA, options)
+    ]
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "user.age + 1 > limit",
+        "user.name + user.age",
+        "user.name * 2",
+        "user.nickname == 'x'",
+        "'a' in user.tags",
+        "[i.price * 2 > limit for i in items]",
+        "user.tags[0] > 'm'",
+        "unknown > 5 and user.missing.x",
+        "not user.age",
+    ],
+)
+def test_well_typed_expressions(expression):
+    assert messages(expression) == []
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("user.name > 5", [("user.name > 5", "Cannot use > operator with types str and int")]),
+        ("user.age - 'a'", [('user.age - "a"', "Cannot use - operator with types int and str")]),
+        ("user.nickname + 1", [("user.nickname + 1", "Cannot use + operator with types NoneType and int")]),
+        ("1 in user.name", [("1 in user.name", "Cannot use in operator with types int and str")]),
+        ("user.age.x", [("user.age.x", "Cannot read 'x' from int")]),
+        ("user.tags.first", [("user.tags.first", "Cannot read 'first' from list")]),
+        ("user.address.city", [("user.address.city", "Cannot read 'city' from Address")]),
+        ("[x for x in user.age]", [("[x for x in user.age]", "List comprehension requires iterable to be a list, got int")]),
+        ("[i.price > 'a' for i in items]", [('i.price > "a"', "Cannot use > operator with types float and str")]),
+        # An error is reported once, not again for the operators around it
+        ("(user.name - 1) * 2 > 3", [("user.name - 1", "Cannot use - operator with types str and int")]),
+    ],
+)  # fmt: skip
+def test_type_errors(expression, expected):
+    assert messages(expression) == expected
+
+
+def test_errors_have_source_locations():
+    expression = "user.age > 18 and\n  (user.name > 5 or [x for x in limit])"
+
+    assert check_expression(expression, SCHEMA) == (
+        TypeMessage(
+            "user.name > 5", "Cannot use > operator with types str and int", 2, 3
+        ),
+        TypeMessage(
+            "[x for x in limit]",
+            "List comprehension requires iterable to be a list, got int",
+            2,
+            20,
+        ),
+    )
+
+
+def test_check_ast_has_no_locations():
+    (message,) = check_ast(parse("user.name > 5"), SCHEMA)
+
+    assert message.source == "user.name > 5"
+    assert message.line is None and message.column is None
+
+
+def test_options_allow_bad_reads():
+    options = EvaluatorOptions(
+        should_null_on_bad_access=True, should_allow_attribute_access=True
+    )
+
+    assert messages("user.address.city + user.age.x", options) == []
+    assert messages("user.address.city", EvaluatorOptions(should_allow_attribute_access=True)) == []  # fmt: skip
+
+
+class Owner(TypedDict):
+    age: int
+
+
+class Account(TypedDict):
+    owner: Owner | None
+
+
+GUARDED_SCHEMA = ContextSchema(
+    {"user": dict[str, int] | None, "account": Account | None}
+)
+
+
+@pytest.mark.parametrize(
+    "expression,options",
+    [
+        ("user and user.age > 1", EvaluatorOptions()),
+        ("user != null and user.age > 1", EvaluatorOptions()),
+        ("null != user and user.age > 1", EvaluatorOptions()),
+        ("user == null or user.age > 1", EvaluatorOptions()),
+        ("not user or user.age > 1", EvaluatorOptions()),
+        ("not (user == null) and user.age > 1", EvaluatorOptions()),
+        ("limit > 0 and user and [x for x in user.ids]", EvaluatorOptions()),
+        ("account and account.owner and account.owner.age > 1", EvaluatorOptions()),
+        # A value that isn't null was read from values that aren't either
+        (
+            "account.owner != null and account.owner.age > 1",
+            EvaluatorOptions(should_null_on_bad_access=True),
+        ),
+    ],
+)
+def test_short_circuits_guard_the_right_operand(expression, options):
+    assert check_expression(expression, GUARDED_SCHEMA, options) == ()
+    compile(expression, options, schema=GUARDED_SCHEMA)
+
+
+@pytest.mark.parametrize(
+    "expression,options",
+    [
+        ("user or user.age > 1", EvaluatorOptions()),
+        ("user.age > 1 and user", EvaluatorOptions()),
+        ("user == null and user.age > 1", EvaluatorOptions()),
+        ("account and account.owner.age > 1", EvaluatorOptions()),
+        ("account and (account.owner or account.owner.age)", EvaluatorOptions()),
+        ("user and user.age > 1", EvaluatorOptions(should_eagerly_evaluate_logic=True)),
+    ],
+)
+def test_unguarded_reads_are_still_errors(expression, options):
+    assert check_expression(expression, GUARDED_SCHEMA, options) != ()
+
+
+def test_syntax_errors_raise():
+    with pytest.raises(EvalisError, match="SYNTAX_ERROR"):
+        check_expression("1 +", SCHEMA)
+
+
+OPERATOR_ERROR_CASES = [
+    test_case
+    for test_case in TEST_CASES
+    if str(test_case.get("expected_error", "")).startswith("Cannot use")
+]
+
+
+@pytest.mark.parametrize("test_case", OPERATOR_ERROR_CASES, ids=describe_test_case)
+def test_oracle_operator_errors_are_found(test_case):
+    context = test_case.get("context", {})
+    schema = ContextSchema({name: type(value) for name, value in context.items()})
+
+    (message,) = check_expression(test_case["expr"], schema)
+    assert message.message.startswith("Cannot use")
+
+
+def test_compile_raises_before_evaluating():
+    with pytest.raises(EvalisError) as error:
+        compile("user.age > 18 and user.name > 5", schema=SCHEMA)
+
+    assert error.value.code == CODE_TYPE_ERROR
+    assert "1:18: user.name > 5: Cannot use > operator" in error.value.message
+
+
+def test_evaluate_many_raises_before_evaluating():
+    def contexts():
+        raise AssertionError("contexts were read")
+        yield {}
+
+    with pytest.raises(EvalisError, match=CODE_TYPE_ERROR):
+        evaluate_many("[i.price > 'a' for i in items]", contexts(), schema=SCHEMA)
+
+
+class Item(TypedDict):
+    price: float
+
+
+class Order(TypedDict):
+    items: NotRequired[list[Item]]
+
+
+def test_items_of_optional_lists_are_not_null():
+    schema = ContextSchema.from_type(Order)
+    options = EvaluatorOptions(should_null_on_bad_access=True)
+    expression = "[i.price * 2 for i in items]"
+    contexts = [{"items": [{"price": 1.5}]}, {}]
+
+    assert check_expression(expression, schema, options) == ()
+    assert evaluate_many(expression, contexts, options, schema=schema) == [[3.0], None]
+    assert compile(expression, options, schema=schema)(contexts[1]) is None
+
+
+def test_results_with_schema_match_without():
+    expression = "[i.price * 2 + user.age > limit for i in items]"
+    contexts = [
+        {
+            "user": {"age": age},
+            "items": [{"price": price} for price in (0.5, 3.25, 10.0)],
+            "limit": 20,
+        }
+        for age in (0, 7, 15)
+    ]
+
+    assert evaluate_many(expression, contexts, schema=SCHEMA) == evaluate_many(
+        expression, contexts
+    )
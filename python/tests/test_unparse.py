@@ -0,0 +1,44 @@
+import pytest
+from evalis.evalis import parse_ast
+from evalis.types import BinaryOpNode, BinaryOpType, LiteralNode, ReferenceNode
+from evalis.unparse import format_ast
+from oracle import TEST_CASES, describe_test_case
+
+PARSEABLE_CASES = [case for case in TEST_CASES if parse_ast(case["expr"]).ast]
+
+
+@pytest.mark.parametrize("test_case", PARSEABLE_CASES, ids=describe_test_case)
+def test_format_ast_round_trips(test_case):
+    ast = parse_ast(test_case["expr"]).ast
+
+    assert parse_ast(format_ast(ast)).ast == ast
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        ("(a - b) - c", "a - b - c"),
+        ("a - (b - c)", "a - (b - c)"),
+        ("(a + b) * c", "(a + b) * c"),
+        ("not (a and b)", "not (a and b)"),
+        ("(not a) == b", "not a == b"),
+        ("a['b']['x y'][0][c + 1]", 'a.b["x y"][0][c + 1]'),
+        ("[ x*2 for x in (a or b) ]", "[x * 2 for x in a or b]"),
+        ("'say \"hi\"'", '"say \\"hi\\""'),
+        ("null == false", "null == false"),
+    ],
+)
+def test_format_ast(expression, expected):
+    assert format_ast(parse_ast(expression).ast) == expected
+
+
+def test_format_ast_writes_floats_without_exponents():
+    node = BinaryOpNode(BinaryOpType.ADD, LiteralNode(1e-7), LiteralNode(1e20))
+
+    assert format_ast(node) == "0.0000001 + 100000000000000000000.0"
+
+
+def test_format_ast_brackets_keyword_keys():
+    node = ReferenceNode("a", (LiteralNode("in"), LiteralNode("ok")))
+
+    assert format_ast(node) == 'a["in"].ok'
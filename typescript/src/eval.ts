@@ -47,6 +47,17 @@ export class Evaluator {
     if (nodeType === 'binaryOp') {
       const binNode = node as BinaryOpNode;
       const left = this.evaluate(binNode.left, context);
+
+      // Skip the right side when the left side already decides the result
+      if (!this.options.shouldEagerlyEvaluateLogic) {
+        if (binNode.op === BinaryOpType.AND && !left) {
+          return left;
+        }
+        if (binNode.op === BinaryOpType.OR && left) {
+          return left;
+        }
+      }
+
       const right = this.evaluate(binNode.right, context);
 
       switch (binNode.op) {
@@ -42,6 +42,8 @@ export type EvalisNode =
 // region: other types -------------------------------------------------------
 export interface EvaluatorOptions {
   shouldNullOnBadAccess?: boolean;
+  // Evaluate both sides of and/or even when the left side decides the result
+  shouldEagerlyEvaluateLogic?: boolean;
 }
 
 export interface SyntaxMessage {